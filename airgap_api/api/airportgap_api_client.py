@@ -1,4 +1,60 @@
+import http
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Awaitable, Callable
+
 from airgap_api.api.api_client import BaseAPIClient
+from airgap_api.api.async_api_client import AsyncBaseAPIClient
+from airgap_api.api.cache import ResponseCache
+from airgap_api.api.cassette import Cassette
+from airgap_api.api.distance_cache import DistanceCache
+from airgap_api.api.favorites_sync import SyncReport, plan_sync, run_sync, run_sync_async
+from airgap_api.api.hedging import HedgePolicy
+from airgap_api.api.instrumentation import Instrumentation
+from airgap_api.api.rate_limiter import RateLimiter
+from airgap_api.api.single_flight import SingleFlight
+from airgap_api.api.token_manager import AuthenticationError, TokenManager
+from airgap_api.api.transport import TransportConfig
+
+if TYPE_CHECKING:
+    from airgap_api.api.distance_matrix import DistanceProgress
+    from airgap_api.data.models import ResponseParser
+
+AIRPORT_GAP_BASE_URL = "https://airportgap.com/api/"
+# Options of get_all_pages that control the crawl rather than the requests it sends.
+CRAWL_OPTIONS = frozenset({"max_workers", "ordered", "checkpoint", "progress", "concurrent", "headers"})
+
+
+def _models():
+    # The pydantic models are imported on first use so that loading the client does not build them.
+    from airgap_api.data import models
+
+    return models
+
+
+def parse_typed(response, *, parser: "ResponseParser"):
+    if inspect.isawaitable(response):
+        async def parse_awaited():
+            return parser.parse_response(await response)
+        return parse_awaited()
+    return parser.parse_response(response)
+
+
+def _then(result, call):
+    if inspect.isawaitable(result):
+        async def then_awaited():
+            return call(await result)
+        return then_awaited()
+    return call(result)
+
+
+def _unwrap(parsed):
+    return _then(parsed, lambda response: response.data)
+
+
+def _request_kwargs(kwargs: dict) -> dict:
+    return {name: value for name, value in kwargs.items() if name not in CRAWL_OPTIONS}
 
 
 class Airports:
@@ -25,6 +81,108 @@ class Airports:
         endpoint = "airports"
         return self.parent.get_all_pages(url=endpoint, **kwargs)
 
+    def get_typed(self, *, page: int | None = None, **kwargs):
+        return parse_typed(self.get(page=page, **kwargs), parser=_models().AirportPageResponse)
+
+    def get_collection(self, **kwargs):
+        # NumPy backed helpers are imported on use so that loading the client does not import numpy.
+        from airgap_api.data.collection import AirportCollection
+
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            async def collect_awaited():
+                return AirportCollection.from_pages([page_data async for page_data in self.get_all(**kwargs)])
+            return collect_awaited()
+        return AirportCollection.from_pages(self.get_all(**kwargs))
+
+    def get_by_id_typed(self, *, airport_id: str, **kwargs):
+        return _unwrap(parse_typed(self.get_by_id(airport_id=airport_id, **kwargs), parser=_models().AirportResponse))
+
+    @property
+    def origin(self) -> str:
+        return self.parent.make_url(url="")
+
+    def distance_typed(self, *, from_id: str, to_id: str, **kwargs):
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            return self._distance_typed_async(from_id=from_id, to_id=to_id, **kwargs)
+        distance_cache = getattr(self.parent, "distance_cache", None)
+        if distance_cache is not None and (cached := distance_cache.get(from_id=from_id, to_id=to_id, origin=self.origin)) is not None:
+            return cached
+        distance = _models().AirportDistanceResponse.parse_response(self.distance(from_id=from_id, to_id=to_id, **kwargs)).data
+        if distance_cache is not None:
+            distance_cache.put(from_id=from_id, to_id=to_id, result=distance, origin=self.origin)
+        return distance
+
+    async def _distance_typed_async(self, *, from_id: str, to_id: str, **kwargs):
+        distance_cache = getattr(self.parent, "distance_cache", None)
+        if distance_cache is not None and (cached := distance_cache.get(from_id=from_id, to_id=to_id, origin=self.origin)) is not None:
+            return cached
+        distance = _models().AirportDistanceResponse.parse_response(await self.distance(from_id=from_id, to_id=to_id, **kwargs)).data
+        if distance_cache is not None:
+            distance_cache.put(from_id=from_id, to_id=to_id, result=distance, origin=self.origin)
+        return distance
+
+    def distances_for_pairs(self, *, pairs, max_workers: int = 8, checkpoint: str | os.PathLike | None = None, progress: Callable[["DistanceProgress"], None] | None = None):
+        from airgap_api.api.distance_matrix import results_for_pairs, unique_pairs
+
+        pairs = list(pairs)
+        results = self._run_distances(pairs=unique_pairs(pairs), max_workers=max_workers, checkpoint=checkpoint, progress=progress)
+        return _then(results, lambda results: results_for_pairs(pairs, results))
+
+    def distance_matrix(self, *, airport_ids, max_workers: int = 8, checkpoint: str | os.PathLike | None = None, progress: Callable[["DistanceProgress"], None] | None = None):
+        from airgap_api.api.distance_matrix import matrix_from_results, matrix_pairs
+
+        airport_ids = list(airport_ids)
+        results = self._run_distances(pairs=matrix_pairs(airport_ids), max_workers=max_workers, checkpoint=checkpoint, progress=progress)
+        return _then(results, lambda results: matrix_from_results(airport_ids, results))
+
+    def _fetch_distance(self, pair: tuple[str, str]):
+        return _unwrap(parse_typed(self.distance(from_id=pair[0], to_id=pair[1]), parser=_models().AirportDistanceResponse))
+
+    def _run_distances(self, *, pairs: list[tuple[str, str]], max_workers: int, checkpoint: str | os.PathLike | None, progress):
+        from airgap_api.api.distance_matrix import run_distances, run_distances_async
+
+        # A checkpoint is a DistanceCache file, so rerunning with it only fetches the pairs it does not hold yet.
+        cache = DistanceCache(path=checkpoint) if checkpoint is not None else getattr(self.parent, "distance_cache", None)
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            async def run_awaited():
+                try:
+                    return await run_distances_async(fetch=self._fetch_distance, pairs=pairs, cache=cache, max_workers=max_workers, origin=self.origin, progress=progress)
+                finally:
+                    if checkpoint is not None:
+                        cache.close()
+            return run_awaited()
+        try:
+            return run_distances(fetch=self._fetch_distance, pairs=pairs, cache=cache, max_workers=max_workers, origin=self.origin, progress=progress)
+        finally:
+            if checkpoint is not None:
+                cache.close()
+
+    def iter_all_models(self, *, max_workers: int | None = None, **kwargs):
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            return self._aiter_all_models(**kwargs)
+        return self._iter_all_models(max_workers=max_workers, **kwargs)
+
+    def _iter_all_models(self, *, max_workers: int | None, **kwargs):
+        page = self.get_typed(page=1, **kwargs)
+        yield from page.data
+        last_page = page.links.last_page
+        if max_workers and last_page:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for page in executor.map(lambda number: self.get_typed(page=number, **kwargs), range(2, last_page + 1)):
+                    yield from page.data
+            return
+        while page.links.next_page:
+            page = self.get_typed(page=page.links.next_page, **kwargs)
+            yield from page.data
+
+    async def _aiter_all_models(self, **kwargs):
+        next_page = 1
+        while next_page:
+            page = await self.get_typed(page=next_page, **kwargs)
+            for airport in page.data:
+                yield airport
+            next_page = page.links.next_page
+
 
 class Tokens:
     def __init__(self, *, parent):
@@ -38,6 +196,14 @@ class Tokens:
         }
         return self.parent.post(url=endpoint, json=payload, **kwargs)
 
+    def get_token(self, *, email: str, password: str, **kwargs) -> str:
+        def token_from(response) -> str:
+            if response.status_code != http.HTTPStatus.OK:
+                raise AuthenticationError(f"Unable to get a token for {email}: {response.status_code}")
+            return response.json()["token"]
+
+        return _then(self.get(email=email, password=password, **kwargs), token_from)
+
 
 class Favorites:
     def __init__(self, *, parent):
@@ -45,49 +211,158 @@ class Favorites:
 
     @staticmethod
     def auth_headers(*, token: str):
-        return {
-            "Authorization": f"Bearer token={token}"
-        }
+        return TokenManager.auth_headers(token=token)
+
+    @property
+    def token_manager(self) -> TokenManager | None:
+        return getattr(self.parent, "token_manager", None)
+
+    def resolve_token(self, token: str | None) -> str:
+        if token is not None:
+            return token
+        if self.token_manager is None:
+            raise ValueError("A token is required when the client has no token manager")
+        return self.token_manager.token()
+
+    async def resolve_token_async(self, token: str | None) -> str:
+        if token is not None:
+            return token
+        if self.token_manager is None:
+            raise ValueError("A token is required when the client has no token manager")
+        return await self.token_manager.token_async()
 
-    def get(self, *, token: str, **kwargs):
+    def _headers(self, token: str) -> dict[str, str]:
+        return self.token_manager.headers(token=token) if self.token_manager is not None else self.auth_headers(token=token)
+
+    def _authorised(self, call, *, token: str | None):
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            return self._authorised_async(call, token=token)
+        token = self.resolve_token(token)
+        response = call(headers=self._headers(token))
+        if self.token_manager is not None and response.status_code == http.HTTPStatus.UNAUTHORIZED and (refreshed := self.token_manager.refresh(token=token)):
+            return call(headers=self._headers(refreshed))
+        return response
+
+    async def _authorised_async(self, call, *, token: str | None):
+        token = await self.resolve_token_async(token)
+        response = await call(headers=self._headers(token))
+        if self.token_manager is not None and response.status_code == http.HTTPStatus.UNAUTHORIZED and (refreshed := await self.token_manager.refresh_async(token=token)):
+            return await call(headers=self._headers(refreshed))
+        return response
+
+    def get(self, *, token: str | None = None, **kwargs):
         endpoint = "favorites"
-        return self.parent.get(url=endpoint, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.get(url=endpoint, headers=headers, **kwargs), token=token)
 
-    def get_by_id(self, *, fav_id: int, token: str, **kwargs):
+    def get_by_id(self, *, fav_id: int, token: str | None = None, **kwargs):
         endpoint = f"favorites/{fav_id}"
-        return self.parent.get(url=endpoint, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.get(url=endpoint, headers=headers, **kwargs), token=token)
+
+    def get_all(self, *, token: str | None = None, **kwargs):
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            return self._get_all_async(token=token, **kwargs)
+        return self._get_all(token=self.resolve_token(token), **kwargs)
 
-    def add(self, *, airport_id: str, note: str = "", token: str, **kwargs):
+    def _get_all(self, *, token: str, **kwargs):
+        endpoint = "favorites"
+        if self.token_manager is None:
+            yield from self.parent.get_all_pages(url=endpoint, headers=self._headers(token), **kwargs)
+            return
+        # Pages are fetched with one set of headers, so a rejected token is replaced on page 1, which the crawl then starts from.
+        request_kwargs = _request_kwargs(kwargs)
+        response = self.parent.get(url=endpoint, page=1, headers=self._headers(token), **request_kwargs)
+        if response.status_code == http.HTTPStatus.UNAUTHORIZED and (refreshed := self.token_manager.refresh(token=token)):
+            token = refreshed
+            response = self.parent.get(url=endpoint, page=1, headers=self._headers(token), **request_kwargs)
+        yield from self.parent.get_all_pages(url=endpoint, headers=self._headers(token), first_response=response.json(), **kwargs)
+
+    async def _get_all_async(self, *, token: str | None, **kwargs):
+        endpoint = "favorites"
+        token = await self.resolve_token_async(token)
+        first_response = None
+        if self.token_manager is not None:
+            request_kwargs = _request_kwargs(kwargs)
+            response = await self.parent.get(url=endpoint, page=1, headers=self._headers(token), **request_kwargs)
+            if response.status_code == http.HTTPStatus.UNAUTHORIZED and (refreshed := await self.token_manager.refresh_async(token=token)):
+                token = refreshed
+                response = await self.parent.get(url=endpoint, page=1, headers=self._headers(token), **request_kwargs)
+            first_response = response.json()
+        async for page_data in self.parent.get_all_pages(url=endpoint, headers=self._headers(token), first_response=first_response, **kwargs):
+            yield page_data
+
+    def get_typed(self, *, token: str | None = None, page: int | None = None, **kwargs):
+        return parse_typed(self.get(token=token, page=page, **kwargs), parser=_models().FavoritePageResponse)
+
+    def get_by_id_typed(self, *, fav_id: int, token: str | None = None, **kwargs):
+        return _unwrap(parse_typed(self.get_by_id(fav_id=fav_id, token=token, **kwargs), parser=_models().FavoriteResponse))
+
+    def add(self, *, airport_id: str, note: str = "", token: str | None = None, **kwargs):
         endpoint = "favorites"
         payload = {
             "airport_id": airport_id,
             "note": note
         }
-        return self.parent.post(url=endpoint, json=payload, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.post(url=endpoint, json=payload, headers=headers, **kwargs), token=token)
 
-    def update_note(self, *, fav_id: str, note: str = "", token: str, **kwargs):
+    def update_note(self, *, fav_id: str, note: str = "", token: str | None = None, **kwargs):
         endpoint = f"favorites/{fav_id}"
         payload = {
             "note": note
         }
-        return self.parent.patch(url=endpoint, json=payload, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.patch(url=endpoint, json=payload, headers=headers, **kwargs), token=token)
 
-    def remove(self, *, fav_id: str, token: str, **kwargs):
+    def remove(self, *, fav_id: str, token: str | None = None, **kwargs):
         endpoint = f"favorites/{fav_id}"
-        return self.parent.delete(url=endpoint, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.delete(url=endpoint, headers=headers, **kwargs), token=token)
 
-    def remove_all(self, *, token: str, **kwargs):
+    def remove_all(self, *, token: str | None = None, **kwargs):
         endpoint = "favorites/clear_all"
-        return self.parent.delete(url=endpoint, headers=self.auth_headers(token=token), **kwargs)
+        return self._authorised(lambda headers: self.parent.delete(url=endpoint, headers=headers, **kwargs), token=token)
+
+    def sync(self, *, desired: dict[str, str], token: str | None = None, max_workers: int = 8) -> SyncReport | Awaitable[SyncReport]:
+        """Returns the SyncReport, or with the async client an awaitable of it; max_workers bounds the concurrent calls of either."""
+        if isinstance(self.parent, AsyncBaseAPIClient):
+            return self._sync_async(desired=desired, token=token, max_workers=max_workers)
+        token = self.resolve_token(token)
+        current = [favorite for page_data in self.get_all(token=token, max_workers=max_workers) for favorite in _models().FavoriteAirportDataPageResponse.validate_python(page_data)]
+        return run_sync(favorites=self, operations=plan_sync(current=current, desired=desired), token=token, max_workers=max_workers)
+
+    async def _sync_async(self, *, desired: dict[str, str], token: str | None, max_workers: int) -> SyncReport:
+        token = await self.resolve_token_async(token)
+        current = [favorite async for page_data in self.get_all(token=token, concurrent=True) for favorite in _models().FavoriteAirportDataPageResponse.validate_python(page_data)]
+        return await run_sync_async(favorites=self, operations=plan_sync(current=current, desired=desired), token=token, max_workers=max_workers)
 
 
 class AirportGapAPIClient(BaseAPIClient):
-    def __init__(self):
-        base_url = "https://airportgap.com/api/"
+    def __init__(self, *, base_url: str = AIRPORT_GAP_BASE_URL, cache: ResponseCache | None = None, rate_limiter: RateLimiter | None = None, instrumentation: Instrumentation | None = None, cassette: Cassette | None = None, transport: TransportConfig | None = None, token_manager: TokenManager | None = None, single_flight: SingleFlight | None = None, distance_cache: DistanceCache | None = None, hedging: HedgePolicy | None = None):
+        headers = {
+            "Content-Type": "application/json"
+        }
+        super().__init__(base_url=base_url, headers=headers, cache=cache, rate_limiter=rate_limiter, instrumentation=instrumentation, cassette=cassette, transport=transport, single_flight=single_flight, hedging=hedging)
+        self.token_manager = token_manager
+        self.distance_cache = distance_cache
+
+    @property
+    def airports(self):
+        return Airports(parent=self)
+
+    @property
+    def tokens(self):
+        return Tokens(parent=self)
+
+    @property
+    def favorites(self):
+        return Favorites(parent=self)
+
+
+class AsyncAirportGapAPIClient(AsyncBaseAPIClient):
+    def __init__(self, *, base_url: str = AIRPORT_GAP_BASE_URL, max_concurrency: int = 10, rate_limiter: RateLimiter | None = None, instrumentation: Instrumentation | None = None, transport: TransportConfig | None = None, token_manager: TokenManager | None = None, single_flight: SingleFlight | None = None, distance_cache: DistanceCache | None = None, hedging: HedgePolicy | None = None):
         headers = {
             "Content-Type": "application/json"
         }
-        super().__init__(base_url=base_url, headers=headers)
+        super().__init__(base_url=base_url, headers=headers, max_concurrency=max_concurrency, rate_limiter=rate_limiter, instrumentation=instrumentation, transport=transport, single_flight=single_flight, hedging=hedging)
+        self.token_manager = token_manager
+        self.distance_cache = distance_cache
 
     @property
     def airports(self):
@@ -1,5 +1,13 @@
+import functools
 import http
+import inspect
 import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
 
 import requests
 import urllib.parse
@@ -8,35 +16,122 @@ from urllib.parse import parse_qs
 from loguru import logger
 from tenacity import after_log, before_log, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from airgap_api.api.cache import ResponseCache
+from airgap_api.api.cassette import Cassette
+from airgap_api.api.crawl import CrawlProgress, crawl_pages
+from airgap_api.api.hedging import HedgePolicy, HedgeTimers
+from airgap_api.api.instrumentation import Instrumentation, attempt_number
+from airgap_api.api.rate_limiter import RateLimiter, parse_retry_after
+from airgap_api.api.single_flight import SingleFlight
+from airgap_api.api.transport import TransportAdapter, TransportConfig, TransportStats, tracked_connections
 
-def log_summary(r, *args, **kwargs) -> None:
-    summary = f"[{r.request.method}]{r.url} = {r.status_code} in {r.elapsed}"
-    logger.debug(summary)
 
+class RateLimitReachedError(Exception):
+    """Raised when API rate limit reached."""
 
-def log_response_json(r, *args, **kwargs) -> None:
-    try:
-        response_json = r.json()
-        logger.debug(response_json)
-    except requests.exceptions.JSONDecodeError:
-        pass
+    def __init__(self, *args, retry_after: float | None = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
 
 
-class RateLimitReachedError(Exception):
-    """Raised when API rate limit reached."""
+_wait_backoff = wait_exponential(multiplier=1, min=5, max=20)
+_log_before_attempt = before_log(logger, logging.DEBUG)
+
+
+def before_attempt(retry_state) -> None:
+    attempt_number.set(retry_state.attempt_number)
+    _log_before_attempt(retry_state)
+
+
+def wait_rate_limit(retry_state) -> float:
+    exception = retry_state.outcome.exception()
+    retry_after = getattr(exception, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+    return _wait_backoff(retry_state)
+
+
+def _usable(response: requests.Response | None) -> bool:
+    return response is not None and response.status_code != http.HTTPStatus.TOO_MANY_REQUESTS
+
+
+_rate_limit_retry = retry(
+    stop=stop_after_attempt(10),
+    wait=wait_rate_limit,
+    retry=retry_if_exception_type(exception_types=RateLimitReachedError),
+    reraise=True,
+    before=before_attempt,
+    after=after_log(logger, logging.DEBUG)
+)
+
+
+def rate_limit_retry(function):
+    """Retries rate limited calls, restoring attempt_number afterwards so it does not leak into later requests in the context."""
+    retrying = _rate_limit_retry(function)
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            token = attempt_number.set(1)
+            try:
+                return await retrying(*args, **kwargs)
+            finally:
+                attempt_number.reset(token)
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            token = attempt_number.set(1)
+            try:
+                return retrying(*args, **kwargs)
+            finally:
+                attempt_number.reset(token)
+    return wrapper
 
 
 class BaseAPIClient:
-    def __init__(self, *, base_url: str, headers: dict[str, str] | None = None) -> None:
+    def __init__(self, *, base_url: str, headers: dict[str, str] | None = None, cache: ResponseCache | None = None, rate_limiter: RateLimiter | None = None, instrumentation: Instrumentation | None = None, cassette: Cassette | None = None, transport: TransportConfig | None = None, single_flight: SingleFlight | None = None, hedging: HedgePolicy | None = None) -> None:
         self._base_url = base_url
+        self.transport = transport if transport is not None else TransportConfig()
+        self._adapter = TransportAdapter(config=self.transport)
         self._session = requests.Session()
-        self._session.headers = headers
-        self._session.hooks['response'].extend([log_summary, log_response_json])
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        self._session.headers = {**self.transport.headers(), **(headers or {})}
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.cassette = cassette
+        self.single_flight = single_flight
+        self.hedging = hedging
+        self._hedge_executor = None
+        self._hedge_timers = None
+        if hedging is not None:
+            # Only hedges run on the pool; the request they race runs on the calling thread.
+            self._hedge_executor = ThreadPoolExecutor(max_workers=hedging.max_workers, thread_name_prefix="airgap-hedge")
+            self._hedge_timers = HedgeTimers()
+            if hedging.aggregator not in self.instrumentation.sinks:
+                self.instrumentation.add_sink(hedging.aggregator)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._hedge_timers is not None:
+            self._hedge_timers.close()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    @property
+    def transport_stats(self) -> TransportStats:
+        return self._adapter.stats
 
     @staticmethod
     def include_page_param(*, parameters: dict | None, page: int | None = None):
-        if parameters is None:
-            parameters = {}
+        # A copy, as concurrent page requests share the caller's params.
+        parameters = dict(parameters or {})
         if page:
             parameters["page"] = page
         return parameters
@@ -52,68 +147,189 @@ class BaseAPIClient:
     def make_url(self, *, url):
         return urllib.parse.urljoin(self._base_url, url)
 
-    @retry(
-        stop=stop_after_attempt(10),
-        wait=wait_exponential(multiplier=1, min=5, max=20),
-        retry=retry_if_exception_type(exception_types=RateLimitReachedError),
-        reraise=True,
-        before=before_log(logger, logging.DEBUG),
-        after=after_log(logger, logging.DEBUG)
-    )
-    def get(self, *, url: str, page: int | None = None, **kwargs):
-        params = self.include_page_param(parameters=kwargs.pop("params", None), page=page)
-        response = self._session.get(url=self.make_url(url=url), params=params, **kwargs)
-        if response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS:
-            raise RateLimitReachedError()
+    def endpoint_path(self, *, url: str) -> str:
+        path = urlparse(str(url)).path
+        base_path = urlparse(self._base_url).path
+        return path[len(base_path):] if path.startswith(base_path) else path
+
+    def _send(self, method: str, *, url: str, **kwargs) -> requests.Response:
+        if self.cassette is not None and self.cassette.replaying:
+            response, elapsed = self.cassette.play(request=Cassette.prepare(self._session, method, url=url, **kwargs))
+            self.instrumentation.record(method=method, path=self.endpoint_path(url=url), url=response.url, status_code=response.status_code, elapsed=elapsed, response=response)
+            return response
+        endpoint = self.endpoint_path(url=url)
+        kwargs.setdefault("timeout", self.transport.timeout_for(method=method, endpoint=endpoint))
+        # Recorded cassettes hold one exchange per request, so hedging is left out while recording.
+        if self.hedging is not None and self.cassette is None and self.hedging.applies(method=method, endpoint=endpoint):
+            return self._send_hedged(method, url=url, endpoint=endpoint, **kwargs)
+        return self._send_once(method, url=url, **kwargs)
+
+    def _send_once(self, method: str, *, url: str, acquire: bool = True, **kwargs) -> requests.Response:
+        if acquire and self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        response = self._session.request(method, url=url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(headers=response.headers)
+        if self.cassette is not None:
+            self.cassette.record(request=Cassette.prepare(self._session, method, url=url, **kwargs), response=response, elapsed=elapsed)
+        self.instrumentation.record(method=method, path=self.endpoint_path(url=url), url=response.url, status_code=response.status_code, elapsed=elapsed, response=response)
         return response
 
-    @retry(
-        stop=stop_after_attempt(10),
-        wait=wait_exponential(multiplier=1, min=5, max=20),
-        retry=retry_if_exception_type(exception_types=RateLimitReachedError),
-        reraise=True,
-        before=before_log(logger, logging.DEBUG),
-        after=after_log(logger, logging.DEBUG)
-    )
-    def post(self, *, url: str, **kwargs):
-        response = self._session.post(url=self.make_url(url=url), **kwargs)
-        if response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS:
-            raise RateLimitReachedError()
+    def _send_hedged(self, method: str, *, url: str, endpoint: str, **kwargs) -> requests.Response:
+        self.hedging.stats.add(requests=1)
+        lock = threading.Lock()
+        race = {"settled": False, "hedge": None, "response": None}
+
+        def send_hedge(tracker) -> requests.Response | None:
+            # A hedge spends a token of the rate budget like any other request, and is dropped rather than queued for one.
+            if self.rate_limiter is not None and self.rate_limiter.try_acquire() > 0:
+                self.hedging.stats.add(skipped=1)
+                return None
+            self.hedging.stats.add(fired=1)
+            response = self._send_once(method, url=url, acquire=False, **kwargs)
+            with lock:
+                if _usable(response) and not race["settled"]:
+                    race["settled"], race["response"] = True, response
+                    tracker.abort()
+            return response
+
+        def fire(tracker) -> None:
+            with lock:
+                if not race["settled"]:
+                    race["hedge"] = self._hedge_executor.submit(send_hedge, tracker)
+
+        with tracked_connections() as tracker:
+            timer = self._hedge_timers.call_later(self.hedging.delay(endpoint=endpoint), lambda: fire(tracker))
+            response, error = None, None
+            try:
+                response = self._send_once(method, url=url, **kwargs)
+            except requests.exceptions.RequestException as exception:
+                error = exception
+            finally:
+                timer.cancel()
+        with lock:
+            hedge_won = race["settled"]
+            race["settled"] = True
+            hedge = race["hedge"]
+        if hedge_won:
+            self.hedging.stats.add(won=1)
+            return race["response"]
+        if not _usable(response) and hedge is not None:
+            # The request failed on its own while a hedge was still in flight, so its answer is the better one.
+            try:
+                hedge_response = hedge.result()
+            except requests.exceptions.RequestException:
+                hedge_response = None
+            if _usable(hedge_response):
+                self.hedging.stats.add(won=1)
+                return hedge_response
+        if error is not None:
+            raise error
         return response
 
-    @retry(
-        stop=stop_after_attempt(10),
-        wait=wait_exponential(multiplier=1, min=5, max=20),
-        retry=retry_if_exception_type(exception_types=RateLimitReachedError),
-        reraise=True,
-        before=before_log(logger, logging.DEBUG),
-        after=after_log(logger, logging.DEBUG)
-    )
-    def patch(self, *, url: str, **kwargs):
-        response = self._session.patch(url=self.make_url(url=url), **kwargs)
+    def _request(self, method: str, *, url: str, **kwargs) -> requests.Response:
+        if self.cache is not None:
+            response = self.cache.request(send=self._send, method=method, endpoint=url, url=self.make_url(url=url), session_headers=self._session.headers, **kwargs)
+        else:
+            response = self._send(method, url=self.make_url(url=url), **kwargs)
         if response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS:
-            raise RateLimitReachedError()
+            raise RateLimitReachedError(retry_after=parse_retry_after(response.headers.get("Retry-After")))
         return response
 
-    @retry(
-        stop=stop_after_attempt(10),
-        wait=wait_exponential(multiplier=1, min=5, max=20),
-        retry=retry_if_exception_type(exception_types=RateLimitReachedError),
-        reraise=True,
-        before=before_log(logger, logging.DEBUG),
-        after=after_log(logger, logging.DEBUG)
-    )
+    def single_flight_key(self, *, url: str, page: int | None, params: dict | None, headers: dict | None) -> tuple:
+        params = dict(params or {})
+        if page:
+            params["page"] = page
+        return SingleFlight.key(method="GET", url=self.make_url(url=url), params=params, headers={**(self._session.headers or {}), **(headers or {})})
+
+    def get(self, *, url: str, page: int | None = None, **kwargs):
+        if self.single_flight is None:
+            return self._get(url=url, page=page, **kwargs)
+        key = self.single_flight_key(url=url, page=page, params=kwargs.get("params"), headers=kwargs.get("headers"))
+        return self.single_flight.do(key, lambda: self._get(url=url, page=page, **kwargs))
+
+    @rate_limit_retry
+    def _get(self, *, url: str, page: int | None = None, **kwargs):
+        params = self.include_page_param(parameters=kwargs.pop("params", None), page=page)
+        return self._request("GET", url=url, params=params, **kwargs)
+
+    @rate_limit_retry
+    def post(self, *, url: str, **kwargs):
+        return self._request("POST", url=url, **kwargs)
+
+    @rate_limit_retry
+    def patch(self, *, url: str, **kwargs):
+        return self._request("PATCH", url=url, **kwargs)
+
+    @rate_limit_retry
     def delete(self, *, url: str, **kwargs):
-        response = self._session.delete(url=self.make_url(url=url), **kwargs)
-        if response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS:
-            raise RateLimitReachedError()
-        return response
+        return self._request("DELETE", url=url, **kwargs)
+
+    @staticmethod
+    def page_count(*, response_json: dict) -> int | None:
+        last_url = response_json.get("links", {}).get("last")
+        last_page = BaseAPIClient.extract_parameter_value(url=last_url, parameter_name="page") if last_url else None
+        if last_page:
+            return int(last_page)
+        total = response_json.get("meta", {}).get("total")
+        page_size = len(response_json.get("data", []))
+        if total is not None and page_size:
+            return math.ceil(int(total) / page_size)
+        return None
+
+    def get_all_pages(self, *, url: str, max_workers: int | None = None, ordered: bool = True, checkpoint: str | os.PathLike | None = None, progress: Callable[[CrawlProgress], None] | None = None, first_response: dict | None = None, **kwargs):
+        """first_response is the JSON of page 1 when the caller already fetched it, so the crawl does not request it again."""
+        if checkpoint is not None:
+            if max_workers:
+                raise ValueError("A checkpointed crawl follows the page cursor and cannot use max_workers")
+            if first_response is not None:
+                raise ValueError("A checkpointed crawl fetches its own pages and cannot use first_response")
+            yield from crawl_pages(client=self, url=url, checkpoint=checkpoint, progress=progress, **kwargs)
+            return
+        if max_workers:
+            yield from self._get_all_pages_concurrently(url=url, max_workers=max_workers, ordered=ordered, first_response=first_response, **kwargs)
+            return
+        if first_response is None:
+            yield from self._get_pages_sequentially(url=url, first_page=1, **kwargs)
+            return
+        yield first_response.get("data", [])
+        next_page = self.extract_parameter_value(url=first_response.get("links", {}).get("next"), parameter_name="page")
+        if next_page:
+            yield from self._get_pages_sequentially(url=url, first_page=int(next_page), **kwargs)
 
-    def get_all_pages(self, *, url: str, **kwargs):
-        next_page = 1
+    def _get_pages_sequentially(self, *, url: str, first_page: int, **kwargs):
+        next_page = first_page
         while next_page:
             logger.info(f"Getting page: {next_page}")
             response = self.get(url=url, page=next_page, **kwargs).json()
             yield response.get("data", [])
             next_url = response.get("links", {}).get("next")
             next_page = self.extract_parameter_value(url=next_url, parameter_name="page")
+
+    def _get_page_data(self, *, url: str, page: int, **kwargs):
+        logger.info(f"Getting page: {page}")
+        return self.get(url=url, page=page, **kwargs).json().get("data", [])
+
+    def _get_all_pages_concurrently(self, *, url: str, max_workers: int, ordered: bool, first_response: dict | None = None, **kwargs):
+        if first_response is None:
+            logger.info("Getting page: 1")
+            first_response = self.get(url=url, page=1, **kwargs).json()
+        yield first_response.get("data", [])
+        last_page = self.page_count(response_json=first_response)
+        if last_page is None:
+            logger.warning("Unable to determine page count, falling back to sequential pagination")
+            next_url = first_response.get("links", {}).get("next")
+            next_page = self.extract_parameter_value(url=next_url, parameter_name="page")
+            if next_page:
+                yield from self._get_pages_sequentially(url=url, first_page=int(next_page), **kwargs)
+            return
+        pages = range(2, last_page + 1)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(self._get_page_data, url=url, page=page, **kwargs) for page in pages]
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
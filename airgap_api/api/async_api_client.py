@@ -0,0 +1,154 @@
+import asyncio
+import http
+import time
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from airgap_api.api.api_client import BaseAPIClient, RateLimitReachedError, rate_limit_retry
+from airgap_api.api.hedging import HedgePolicy
+from airgap_api.api.instrumentation import Instrumentation
+from airgap_api.api.rate_limiter import RateLimiter, parse_retry_after
+from airgap_api.api.single_flight import SingleFlight
+from airgap_api.api.transport import TransportConfig
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncBaseAPIClient:
+    def __init__(self, *, base_url: str, headers: dict[str, str] | None = None, max_concurrency: int = 10, rate_limiter: RateLimiter | None = None, instrumentation: Instrumentation | None = None, transport: TransportConfig | None = None, single_flight: SingleFlight | None = None, hedging: HedgePolicy | None = None) -> None:
+        # httpx is imported by the first async client rather than by every importer of the sync client.
+        import httpx
+
+        self._base_url = base_url
+        self.transport = transport if transport is not None else TransportConfig()
+        self._client = httpx.AsyncClient(headers={**self.transport.headers(), **(headers or {})}, limits=self.transport.httpx_limits(), timeout=self.transport.httpx_timeout())
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.single_flight = single_flight
+        self.hedging = hedging
+        if hedging is not None and hedging.aggregator not in self.instrumentation.sinks:
+            self.instrumentation.add_sink(hedging.aggregator)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    include_page_param = staticmethod(BaseAPIClient.include_page_param)
+    extract_parameter_value = staticmethod(BaseAPIClient.extract_parameter_value)
+    page_count = staticmethod(BaseAPIClient.page_count)
+    make_url = BaseAPIClient.make_url
+    endpoint_path = BaseAPIClient.endpoint_path
+
+    async def _request(self, method: str, *, url: str, **kwargs) -> "httpx.Response":
+        endpoint = self.endpoint_path(url=url)
+        kwargs.setdefault("timeout", self.transport.httpx_timeout(method=method, endpoint=endpoint))
+        if self.hedging is not None and self.hedging.applies(method=method, endpoint=endpoint):
+            return await self._request_hedged(method, url=url, endpoint=endpoint, **kwargs)
+        return await self._request_once(method, url=url, **kwargs)
+
+    async def _request_once(self, method: str, *, url: str, acquire: bool = True, **kwargs) -> "httpx.Response":
+        async with self._semaphore:
+            if acquire and self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            started = time.perf_counter()
+            response = await self._client.request(method, self.make_url(url=url), **kwargs)
+            elapsed = time.perf_counter() - started
+        self.instrumentation.record(method=method, path=self.endpoint_path(url=url), url=str(response.url), status_code=response.status_code, elapsed=elapsed, response=response)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.observe_async(headers=response.headers)
+        if response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS:
+            raise RateLimitReachedError(retry_after=parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    async def _request_hedged(self, method: str, *, url: str, endpoint: str, **kwargs) -> "httpx.Response":
+        self.hedging.stats.add(requests=1)
+        primary = asyncio.ensure_future(self._request_once(method, url=url, **kwargs))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedging.delay(endpoint=endpoint))
+            if done:
+                return primary.result()
+            if self.rate_limiter is not None and await self.rate_limiter.try_acquire_async() > 0:
+                self.hedging.stats.add(skipped=1)
+                return await primary
+            self.hedging.stats.add(fired=1)
+            hedge = asyncio.ensure_future(self._request_once(method, url=url, acquire=False, **kwargs))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda task: task is hedge):
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedging.stats.add(won=1)
+                        return task.result()
+            return primary.result()
+        finally:
+            # Unlike a thread, the slower request can be cancelled once the other has answered, or once the caller was cancelled.
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def single_flight_key(self, *, url: str, page: int | None, params: dict | None, headers: dict | None) -> tuple:
+        params = dict(params or {})
+        if page:
+            params["page"] = page
+        return SingleFlight.key(method="GET", url=self.make_url(url=url), params=params, headers={**self._client.headers, **(headers or {})})
+
+    async def get(self, *, url: str, page: int | None = None, **kwargs):
+        if self.single_flight is None:
+            return await self._get(url=url, page=page, **kwargs)
+        key = self.single_flight_key(url=url, page=page, params=kwargs.get("params"), headers=kwargs.get("headers"))
+        return await self.single_flight.do_async(key, lambda: self._get(url=url, page=page, **kwargs))
+
+    @rate_limit_retry
+    async def _get(self, *, url: str, page: int | None = None, **kwargs):
+        params = self.include_page_param(parameters=kwargs.pop("params", None), page=page)
+        return await self._request("GET", url=url, params=params, **kwargs)
+
+    @rate_limit_retry
+    async def post(self, *, url: str, **kwargs):
+        return await self._request("POST", url=url, **kwargs)
+
+    @rate_limit_retry
+    async def patch(self, *, url: str, **kwargs):
+        return await self._request("PATCH", url=url, **kwargs)
+
+    @rate_limit_retry
+    async def delete(self, *, url: str, **kwargs):
+        return await self._request("DELETE", url=url, **kwargs)
+
+    async def get_all_pages(self, *, url: str, concurrent: bool = False, ordered: bool = True, first_response: dict | None = None, **kwargs):
+        response = first_response
+        if response is None:
+            logger.info("Getting page: 1")
+            response = (await self.get(url=url, page=1, **kwargs)).json()
+        yield response.get("data", [])
+        last_page = self.page_count(response_json=response) if concurrent else None
+        if last_page is None:
+            next_page = self.extract_parameter_value(url=response.get("links", {}).get("next"), parameter_name="page")
+            while next_page:
+                logger.info(f"Getting page: {next_page}")
+                response = (await self.get(url=url, page=next_page, **kwargs)).json()
+                yield response.get("data", [])
+                next_url = response.get("links", {}).get("next")
+                next_page = self.extract_parameter_value(url=next_url, parameter_name="page")
+            return
+        tasks = [asyncio.create_task(self._get_page_data(url=url, page=page, **kwargs)) for page in range(2, last_page + 1)]
+        try:
+            for task in (tasks if ordered else asyncio.as_completed(tasks)):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _get_page_data(self, *, url: str, page: int, **kwargs):
+        logger.info(f"Getting page: {page}")
+        return (await self.get(url=url, page=page, **kwargs)).json().get("data", [])
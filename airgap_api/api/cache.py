@@ -0,0 +1,149 @@
+import copy
+import fnmatch
+import http
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+DEFAULT_TTLS = {
+    "airports": 3600.0,
+    "airports/*": 86400.0,
+}
+# Unsafe verbs on these endpoints compute a result without changing any resource.
+DEFAULT_READ_ONLY_ENDPOINTS = ("airports/distance",)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    bypasses: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    response: requests.Response
+    expires_at: float
+    path: str = field(default="")
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """Bounded LRU cache of GET responses with per endpoint TTLs and conditional revalidation."""
+
+    def __init__(self, *, max_entries: int = 1024, ttls: dict[str, float] | None = None, read_only_endpoints: tuple[str, ...] = DEFAULT_READ_ONLY_ENDPOINTS) -> None:
+        self.max_entries = max_entries
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.read_only_endpoints = read_only_endpoints
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, *, endpoint: str) -> float | None:
+        endpoint = endpoint.strip("/")
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return ttl
+        return None
+
+    def invalidates(self, *, endpoint: str, status_code: int) -> bool:
+        """Whether a write answered with status_code may have changed a cached resource."""
+        endpoint = endpoint.strip("/")
+        if not 200 <= status_code < 300 or any(fnmatch.fnmatchcase(endpoint, pattern) for pattern in self.read_only_endpoints):
+            return False
+        return self.ttl_for(endpoint=endpoint) is not None or self.ttl_for(endpoint=endpoint.rsplit("/", 1)[0]) is not None
+
+    @staticmethod
+    def key(*, url: str, params: dict | None) -> tuple:
+        return url, tuple(sorted((str(name), str(value)) for name, value in (params or {}).items()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, *, url: str) -> None:
+        path = urlparse(url).path.rstrip("/")
+        parent = path.rsplit("/", 1)[0]
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.path in (path, parent) or entry.path.startswith(f"{path}/")]:
+                del self._entries[key]
+                self.stats.invalidations += 1
+
+    def _lookup(self, key: tuple) -> _CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: tuple, response: requests.Response, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = _CacheEntry(response=response, expires_at=time.monotonic() + ttl, path=urlparse(key[0]).path.rstrip("/"))
+            self._entries.move_to_end(key)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    @staticmethod
+    def _copy(response: requests.Response) -> requests.Response:
+        # Callers may change the headers in place, so every copy gets headers of its own.
+        copied = copy.copy(response)
+        copied.headers = CaseInsensitiveDict(response.headers)
+        return copied
+
+    def request(self, *, send, method: str, endpoint: str, url: str, session_headers, **kwargs) -> requests.Response:
+        if method.upper() not in SAFE_METHODS:
+            response = send(method, url=url, **kwargs)
+            if self.invalidates(endpoint=endpoint, status_code=response.status_code):
+                self.invalidate(url=url)
+            return response
+        ttl = self.ttl_for(endpoint=endpoint)
+        headers = kwargs.pop("headers", None) or {}
+        if ttl is None or "Authorization" in CaseInsensitiveDict(headers) or "Authorization" in CaseInsensitiveDict(session_headers or {}):
+            self.stats.bypasses += 1
+            return send(method, url=url, headers=headers or None, **kwargs)
+
+        key = self.key(url=url, params=kwargs.get("params"))
+        entry = self._lookup(key)
+        if entry is not None and entry.fresh:
+            self.stats.hits += 1
+            return self._copy(entry.response)
+        if entry is not None:
+            headers = dict(headers)
+            if etag := entry.response.headers.get("ETag"):
+                headers["If-None-Match"] = etag
+            if last_modified := entry.response.headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        response = send(method, url=url, headers=headers or None, **kwargs)
+        if entry is not None and response.status_code == http.HTTPStatus.NOT_MODIFIED:
+            self.stats.revalidations += 1
+            # The cached response may be in use by other threads, so the refreshed headers go on a copy that replaces it.
+            revalidated = self._copy(entry.response)
+            for name in ("ETag", "Last-Modified", "Date", "Cache-Control"):
+                if name in response.headers:
+                    revalidated.headers[name] = response.headers[name]
+            self._store(key, revalidated, ttl)
+            return self._copy(revalidated)
+        self.stats.misses += 1
+        if response.status_code == http.HTTPStatus.OK:
+            # The caller owns the response it gets back, so the entry keeps a copy of its own.
+            self._store(key, self._copy(response), ttl)
+        return response
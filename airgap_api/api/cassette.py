@@ -0,0 +1,146 @@
+import base64
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from strenum import StrEnum
+
+_MAGIC = b"AGCAS001"
+# Every record is prefixed with the digest of its request key and the length of its compressed payload.
+_RECORD = struct.Struct("<16sI")
+_REQUEST_ARGUMENTS = ("headers", "files", "data", "params", "auth", "cookies", "json")
+
+
+class CassetteMode(StrEnum):
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request was never recorded."""
+
+
+class Cassette:
+    """Append-only, per record compressed store of request/response pairs indexed by method, URL and body hash."""
+
+    def __init__(self, *, path: str | os.PathLike, mode: CassetteMode | str = CassetteMode.REPLAY, replay_elapsed: bool = False) -> None:
+        self.path = Path(path)
+        self.mode = CassetteMode(mode)
+        self.replay_elapsed = replay_elapsed
+        self._lock = threading.Lock()
+        self._index: dict[bytes, list[tuple[int, int]]] = {}
+        self._cursors: dict[bytes, int] = {}
+        if self.mode == CassetteMode.RECORD:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        else:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        end = self._load_index()
+        if self.mode == CassetteMode.RECORD:
+            # Drop a partially written trailing record so new records are appended after the last complete one.
+            os.ftruncate(self._fd, end)
+            if end == 0:
+                os.write(self._fd, _MAGIC)
+            os.lseek(self._fd, 0, os.SEEK_END)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == CassetteMode.REPLAY
+
+    def _load_index(self) -> int:
+        # Only the record headers are read, payloads stay on disk until they are replayed.
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            return 0
+        if os.pread(self._fd, len(_MAGIC), 0) != _MAGIC:
+            raise ValueError(f"{self.path} is not a cassette")
+        offset = len(_MAGIC)
+        while offset + _RECORD.size <= size:
+            digest, length = _RECORD.unpack(os.pread(self._fd, _RECORD.size, offset))
+            if offset + _RECORD.size + length > size:
+                break
+            self._index.setdefault(digest, []).append((offset + _RECORD.size, length))
+            offset += _RECORD.size + length
+        return offset
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._index.values())
+
+    def __contains__(self, request: requests.PreparedRequest) -> bool:
+        return self.key(request=request) in self._index
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def prepare(session: requests.Session, method: str, *, url: str, **kwargs) -> requests.PreparedRequest:
+        arguments = {name: kwargs[name] for name in _REQUEST_ARGUMENTS if name in kwargs}
+        return session.prepare_request(requests.Request(method=method.upper(), url=url, **arguments))
+
+    @staticmethod
+    def key(*, request: requests.PreparedRequest) -> bytes:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        body_hash = hashlib.sha256(body).hexdigest()
+        return hashlib.blake2b(f"{request.method} {request.url} {body_hash}".encode("utf-8"), digest_size=16).digest()
+
+    def record(self, *, request: requests.PreparedRequest, response: requests.Response, elapsed: float) -> None:
+        if self.mode != CassetteMode.RECORD:
+            raise ValueError("Cassette was not opened for recording")
+        payload = zlib.compress(json.dumps({
+            "method": request.method,
+            "url": request.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "content": base64.b64encode(response.content or b"").decode("ascii"),
+            "elapsed": elapsed,
+        }, separators=(",", ":")).encode("utf-8"))
+        digest = self.key(request=request)
+        with self._lock:
+            offset = os.lseek(self._fd, 0, os.SEEK_END)
+            os.write(self._fd, _RECORD.pack(digest, len(payload)) + payload)
+            self._index.setdefault(digest, []).append((offset + _RECORD.size, len(payload)))
+
+    def play(self, *, request: requests.PreparedRequest) -> tuple[requests.Response, float]:
+        digest = self.key(request=request)
+        with self._lock:
+            records = self._index.get(digest)
+            if not records:
+                raise CassetteMissError(f"No recorded response for [{request.method}]{request.url}")
+            # Repeated requests replay their recordings in order, then keep repeating the last one.
+            position = self._cursors.get(digest, 0)
+            self._cursors[digest] = position + 1
+            offset, length = records[min(position, len(records) - 1)]
+        record = json.loads(zlib.decompress(os.pread(self._fd, length, offset)))
+        if self.replay_elapsed:
+            time.sleep(record["elapsed"])
+
+        response = requests.Response()
+        response.status_code = record["status_code"]
+        response.reason = record["reason"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(record["content"])
+        response.url = record["url"]
+        response.elapsed = timedelta(seconds=record["elapsed"])
+        response.request = request
+        return response, record["elapsed"]
@@ -0,0 +1,166 @@
+import http
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from airgap_api.utils.digest import page_digest
+
+
+class CheckpointMismatchError(Exception):
+    """Raised when a checkpoint belongs to a different crawl."""
+
+
+@dataclass(frozen=True)
+class CrawlProgress:
+    page: int
+    pages_done: int
+    last_page: int | None
+    pages_per_second: float
+
+    @property
+    def eta(self) -> float | None:
+        if self.last_page is None or not self.pages_per_second:
+            return None
+        return max(self.last_page - self.pages_done, 0) / self.pages_per_second
+
+
+@dataclass
+class CrawledPage:
+    page: int
+    data: list[dict]
+    next_page: int | None
+    last_page: int | None
+    sha256: str
+    etag: str | None = None
+
+    @classmethod
+    def from_response(cls, *, page: int, response_json: dict, next_page: int | None, last_page: int | None, etag: str | None = None) -> "CrawledPage":
+        data = response_json.get("data", [])
+        return cls(page=page, data=data, next_page=next_page, last_page=last_page, sha256=page_digest(records=data), etag=etag)
+
+
+class CrawlCheckpoint:
+    """Append-only JSON lines file holding the pages of a crawl, written and synced after every page."""
+
+    def __init__(self, *, path: str | os.PathLike, url: str) -> None:
+        self.path = Path(path)
+        self.url = url
+        self.pages: list[CrawledPage] = []
+        self.complete = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_bytes().split(b"\n")
+        except FileNotFoundError:
+            return
+        valid = 0
+        # The segment after the last newline is either empty or a record cut short by an interrupted write.
+        for line in lines[:-1]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not isinstance(record, dict):
+                break
+            if valid == 0:
+                if record.get("url") != self.url:
+                    raise CheckpointMismatchError(f"{self.path} is a checkpoint of {record.get('url')!r}, not {self.url!r}")
+            elif record.get("complete"):
+                self.complete = True
+            else:
+                try:
+                    page = CrawledPage(**record)
+                except TypeError:
+                    # Valid JSON with missing or unknown fields is no more usable than a torn record.
+                    break
+                if page.sha256 != page_digest(records=page.data):
+                    logger.warning(f"Checkpoint page {page.page} is corrupt, resuming before it")
+                    break
+                self.pages.append(page)
+            valid += len(line) + 1
+        with open(self.path, "r+b") as file:
+            file.truncate(valid)
+
+    @property
+    def next_page(self) -> int | None:
+        return self.pages[-1].next_page if self.pages else 1
+
+    def _append(self, record: dict) -> None:
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        with open(self.path, "ab") as file:
+            if new_file:
+                file.write(json.dumps({"url": self.url}).encode("utf-8") + b"\n")
+            file.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def append(self, page: CrawledPage) -> None:
+        self._append({"page": page.page, "data": page.data, "next_page": page.next_page, "last_page": page.last_page, "sha256": page.sha256, "etag": page.etag})
+        self.pages.append(page)
+
+    def finish(self) -> None:
+        self._append({"complete": True})
+        self.complete = True
+
+    def reset(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.pages = []
+        self.complete = False
+
+
+def crawl_pages(*, client, url: str, checkpoint: str | os.PathLike, progress: Callable[[CrawlProgress], None] | None = None, **kwargs):
+    state = CrawlCheckpoint(path=checkpoint, url=client.make_url(url=url))
+
+    def fetch(page: int, *, etag: str | None = None) -> CrawledPage | None:
+        request_kwargs = kwargs
+        if etag is not None:
+            request_kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), "If-None-Match": etag}}
+        response = client.get(url=url, page=page, **request_kwargs)
+        if response.status_code == http.HTTPStatus.NOT_MODIFIED:
+            return None
+        # An error body would otherwise be saved as an empty last page and the crawl marked complete.
+        response.raise_for_status()
+        response_json = response.json()
+        next_page = client.extract_parameter_value(url=response_json.get("links", {}).get("next"), parameter_name="page")
+        return CrawledPage.from_response(page=page, response_json=response_json, next_page=int(next_page) if next_page else None, last_page=client.page_count(response_json=response_json), etag=response.headers.get("ETag"))
+
+    def unchanged(saved: CrawledPage) -> bool:
+        # A conditional GET still spends a request, but no page body is sent for a page that did not change.
+        current = fetch(saved.page, etag=saved.etag)
+        return current is None or (current.sha256, current.next_page, current.last_page) == (saved.sha256, saved.next_page, saved.last_page)
+
+    if state.pages:
+        # Every saved page is revalidated, as a change to any of them means the checkpoint no longer matches the server.
+        changed = next((saved.page for saved in state.pages if not unchanged(saved)), None)
+        if changed is not None:
+            logger.warning(f"Page {changed} changed since it was checkpointed, restarting the crawl from page 1")
+            state.reset()
+        else:
+            logger.info(f"Resuming crawl after page {state.pages[-1].page} from {state.path}")
+    for page in state.pages:
+        yield page.data
+    if state.complete:
+        return
+
+    started = time.perf_counter()
+    fetched = 0
+    next_page = state.next_page
+    while next_page:
+        page = fetch(next_page)
+        state.append(page)
+        fetched += 1
+        elapsed = time.perf_counter() - started
+        report = CrawlProgress(page=page.page, pages_done=len(state.pages), last_page=page.last_page, pages_per_second=fetched / elapsed if elapsed else 0.0)
+        eta = f"{report.eta:.0f}s" if report.eta is not None else "unknown"
+        logger.info(f"Crawled page {page.page}/{page.last_page or '?'} ({report.pages_per_second:.1f} pages/s, ETA {eta})")
+        if progress is not None:
+            progress(report)
+        yield page.data
+        next_page = page.next_page
+    state.finish()
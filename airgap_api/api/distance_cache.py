@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from airgap_api.api.cache import CacheStats
+
+if TYPE_CHECKING:
+    from airgap_api.data.models import AirportDistanceResultModel
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS distances (
+    origin TEXT NOT NULL,
+    first_id TEXT NOT NULL,
+    second_id TEXT NOT NULL,
+    first_fingerprint TEXT NOT NULL,
+    second_fingerprint TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (origin, first_id, second_id)
+)
+"""
+
+
+def normalise_pair(*, from_id: str, to_id: str) -> tuple[str, str]:
+    return (from_id, to_id) if from_id <= to_id else (to_id, from_id)
+
+
+def reverse_result(result: "AirportDistanceResultModel", *, from_id: str, to_id: str) -> "AirportDistanceResultModel":
+    attributes = result.attributes.model_copy(update={"from_airport": result.attributes.to_airport, "to_airport": result.attributes.from_airport})
+    result_id = f"{to_id}-{from_id}" if result.id == f"{from_id}-{to_id}" else result.id
+    return result.model_copy(update={"id": result_id, "attributes": attributes})
+
+
+class DistanceCache:
+    """Distance results keyed on the API origin and the unordered airport pair, in a bounded LRU over an optional SQLite file."""
+
+    def __init__(self, *, path: str | os.PathLike | None = None, max_entries: int = 4096, catalog=None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.catalog = catalog
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple[str, str, str], tuple["AirportDistanceResultModel", tuple[str, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if self.path is not None:
+            # One connection per cache; the lock serialises it between threads and SQLite's own locking between processes.
+            self._db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(distances)")]
+            if columns and "origin" not in columns:
+                # Files written before results were keyed by origin cannot tell which API answered, so they are dropped.
+                self._db.execute("DROP TABLE distances")
+            self._db.execute(_SCHEMA)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def fingerprints(self, pair: tuple[str, str]) -> tuple[str, str]:
+        if self.catalog is None:
+            return "", ""
+        return tuple(self.catalog.fingerprint(airport_id=airport_id) or "" for airport_id in pair)
+
+    def get(self, *, from_id: str, to_id: str, origin: str = "") -> "AirportDistanceResultModel | None":
+        pair = normalise_pair(from_id=from_id, to_id=to_id)
+        key = (origin, *pair)
+        fingerprints = self.fingerprints(pair)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, first_fingerprint, second_fingerprint FROM distances WHERE origin = ? AND first_id = ? AND second_id = ?", key
+                ).fetchone()
+                if row is not None:
+                    # The pydantic models are imported on use so that loading the client does not build them.
+                    from airgap_api.data.models import AirportDistanceResultModel
+
+                    entry = AirportDistanceResultModel.model_validate_json(row[0]), (row[1], row[2])
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            result, stored = entry
+            if stored != fingerprints:
+                # The catalog snapshot of either airport changed since the result was stored.
+                self._remove(key)
+                self.stats.invalidations += 1
+                self.stats.misses += 1
+                return None
+            self._remember(key, entry)
+            self.stats.hits += 1
+        return result if pair == (from_id, to_id) else reverse_result(result, from_id=to_id, to_id=from_id)
+
+    def put(self, *, from_id: str, to_id: str, result: "AirportDistanceResultModel", origin: str = "") -> None:
+        pair = normalise_pair(from_id=from_id, to_id=to_id)
+        if pair != (from_id, to_id):
+            result = reverse_result(result, from_id=from_id, to_id=to_id)
+        key = (origin, *pair)
+        fingerprints = self.fingerprints(pair)
+        with self._lock:
+            self._remember(key, (result, fingerprints))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?, ?, ?)", (*key, *fingerprints, result.model_dump_json())
+                )
+            self.stats.stores += 1
+
+    def invalidate(self, *, airport_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if airport_id in key[1:]]:
+                del self._entries[key]
+            if self._db is not None:
+                self._db.execute("DELETE FROM distances WHERE first_id = ? OR second_id = ?", (airport_id, airport_id))
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM distances")
+
+    def _remember(self, key: tuple[str, str, str], entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _remove(self, key: tuple[str, str, str]) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM distances WHERE origin = ? AND first_id = ? AND second_id = ?", key)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from loguru import logger
+
+from airgap_api.api.distance_cache import DistanceCache, normalise_pair, reverse_result
+from airgap_api.data.distance import Distances
+from airgap_api.data.models import AirportDistanceResultModel
+
+
+@dataclass(frozen=True)
+class DistanceProgress:
+    completed: int
+    total: int
+    cached: int
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+
+class _Progress:
+    def __init__(self, *, total: int, callback: Callable[[DistanceProgress], None] | None) -> None:
+        self.total = total
+        self.completed = 0
+        self.cached = 0
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def advance(self, *, cached: bool = False) -> None:
+        with self._lock:
+            self.completed += 1
+            self.cached += cached
+            progress = DistanceProgress(completed=self.completed, total=self.total, cached=self.cached)
+        if self.callback is not None:
+            self.callback(progress)
+
+
+def unique_pairs(pairs) -> list[tuple[str, str]]:
+    return list(dict.fromkeys(normalise_pair(from_id=from_id, to_id=to_id) for from_id, to_id in pairs))
+
+
+def matrix_pairs(airport_ids: list[str]) -> list[tuple[str, str]]:
+    return unique_pairs((from_id, to_id) for index, from_id in enumerate(airport_ids) for to_id in airport_ids[index + 1:] if from_id != to_id)
+
+
+def _split_cached(pairs, *, cache: DistanceCache | None, origin: str, progress: _Progress) -> tuple[dict, list]:
+    results, missing = {}, []
+    for pair in pairs:
+        cached = cache.get(from_id=pair[0], to_id=pair[1], origin=origin) if cache is not None else None
+        if cached is None:
+            missing.append(pair)
+        else:
+            results[pair] = cached
+            progress.advance(cached=True)
+    return results, missing
+
+
+def run_distances(*, fetch, pairs: list[tuple[str, str]], cache: DistanceCache | None, max_workers: int, origin: str = "", progress: Callable[[DistanceProgress], None] | None = None) -> dict[tuple[str, str], AirportDistanceResultModel]:
+    tracker = _Progress(total=len(pairs), callback=progress)
+    results, missing = _split_cached(pairs, cache=cache, origin=origin, progress=tracker)
+
+    def fetch_pair(pair: tuple[str, str]) -> None:
+        result = fetch(pair)
+        # Each result is stored as soon as it arrives, so an interrupted run resumes from the cache.
+        if cache is not None:
+            cache.put(from_id=pair[0], to_id=pair[1], result=result, origin=origin)
+        results[pair] = result
+        tracker.advance()
+
+    if missing:
+        logger.info(f"Fetching {len(missing)} airport distances, {tracker.cached} already cached")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fetch_pair, missing))
+    return results
+
+
+async def run_distances_async(*, fetch, pairs: list[tuple[str, str]], cache: DistanceCache | None, max_workers: int, origin: str = "", progress: Callable[[DistanceProgress], None] | None = None) -> dict[tuple[str, str], AirportDistanceResultModel]:
+    tracker = _Progress(total=len(pairs), callback=progress)
+    results, missing = _split_cached(pairs, cache=cache, origin=origin, progress=tracker)
+    # Bounds the fetches like the thread pool of run_distances, below the client's own max_concurrency.
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_pair(pair: tuple[str, str]) -> None:
+        async with semaphore:
+            result = await fetch(pair)
+        # Each result is stored as soon as it arrives, so an interrupted run resumes from the cache.
+        if cache is not None:
+            cache.put(from_id=pair[0], to_id=pair[1], result=result, origin=origin)
+        results[pair] = result
+        tracker.advance()
+
+    if missing:
+        logger.info(f"Fetching {len(missing)} airport distances, {tracker.cached} already cached")
+        # The task group cancels the remaining fetches on the first failure, before the caller closes the cache.
+        try:
+            async with asyncio.TaskGroup() as group:
+                for pair in missing:
+                    group.create_task(fetch_pair(pair))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+    return results
+
+
+def results_for_pairs(pairs, results: dict[tuple[str, str], AirportDistanceResultModel]) -> list[AirportDistanceResultModel]:
+    ordered = []
+    for from_id, to_id in pairs:
+        pair = normalise_pair(from_id=from_id, to_id=to_id)
+        ordered.append(results[pair] if pair == (from_id, to_id) else reverse_result(results[pair], from_id=to_id, to_id=from_id))
+    return ordered
+
+
+def matrix_from_results(airport_ids: list[str], results: dict[tuple[str, str], AirportDistanceResultModel]) -> Distances:
+    matrices = Distances(*(np.zeros((len(airport_ids), len(airport_ids))) for _ in Distances._fields))
+    for i, from_id in enumerate(airport_ids):
+        for j in range(i + 1, len(airport_ids)):
+            to_id = airport_ids[j]
+            if from_id == to_id:
+                continue
+            attributes = results[normalise_pair(from_id=from_id, to_id=to_id)].attributes
+            for matrix, name in zip(matrices, Distances._fields):
+                matrix[i, j] = matrix[j, i] = getattr(attributes, name)
+    return matrices
@@ -0,0 +1,132 @@
+import asyncio
+import http
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from strenum import StrEnum
+
+if TYPE_CHECKING:
+    from airgap_api.data.models import FavoriteModel
+
+
+class SyncAction(StrEnum):
+    ADD = "add"
+    UPDATE_NOTE = "update_note"
+    REMOVE = "remove"
+    UNCHANGED = "unchanged"
+
+
+_EXPECTED_STATUS = {
+    SyncAction.ADD: http.HTTPStatus.CREATED,
+    SyncAction.UPDATE_NOTE: http.HTTPStatus.OK,
+    SyncAction.REMOVE: http.HTTPStatus.NO_CONTENT,
+}
+
+
+@dataclass
+class SyncOperation:
+    action: SyncAction
+    airport_id: str
+    note: str = ""
+    favorite_id: str | None = None
+
+
+@dataclass
+class SyncItemResult:
+    action: SyncAction
+    airport_id: str
+    favorite_id: str | None = None
+    status_code: int | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SyncReport:
+    results: list[SyncItemResult] = field(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        return sum(1 for result in self.results if result.action != SyncAction.UNCHANGED)
+
+    @property
+    def failed(self) -> list[SyncItemResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def count(self, action: SyncAction) -> int:
+        return sum(1 for result in self.results if result.action == action)
+
+
+def plan_sync(*, current: list["FavoriteModel"], desired: dict[str, str]) -> list[SyncOperation]:
+    operations = []
+    seen = set()
+    for favorite in current:
+        airport_id = favorite.attributes.airport.iata
+        note = favorite.attributes.note
+        if airport_id not in desired or airport_id in seen:
+            operations.append(SyncOperation(action=SyncAction.REMOVE, airport_id=airport_id, note=note, favorite_id=favorite.id))
+        elif desired[airport_id] != note:
+            operations.append(SyncOperation(action=SyncAction.UPDATE_NOTE, airport_id=airport_id, note=desired[airport_id], favorite_id=favorite.id))
+        else:
+            operations.append(SyncOperation(action=SyncAction.UNCHANGED, airport_id=airport_id, note=note, favorite_id=favorite.id))
+        seen.add(airport_id)
+    operations.extend(SyncOperation(action=SyncAction.ADD, airport_id=airport_id, note=note) for airport_id, note in desired.items() if airport_id not in seen)
+    return operations
+
+
+def _call(favorites, operation: SyncOperation, token: str):
+    if operation.action == SyncAction.ADD:
+        return favorites.add(airport_id=operation.airport_id, note=operation.note, token=token)
+    if operation.action == SyncAction.UPDATE_NOTE:
+        return favorites.update_note(fav_id=operation.favorite_id, note=operation.note, token=token)
+    return favorites.remove(fav_id=operation.favorite_id, token=token)
+
+
+def _result(operation: SyncOperation, response) -> SyncItemResult:
+    result = SyncItemResult(action=operation.action, airport_id=operation.airport_id, favorite_id=operation.favorite_id, status_code=response.status_code)
+    if response.status_code != _EXPECTED_STATUS[operation.action]:
+        result.error = response.text or http.HTTPStatus(response.status_code).phrase
+    elif operation.action == SyncAction.ADD:
+        result.favorite_id = response.json()["data"]["id"]
+    return result
+
+
+def _failure(operation: SyncOperation, error: Exception) -> SyncItemResult:
+    return SyncItemResult(action=operation.action, airport_id=operation.airport_id, favorite_id=operation.favorite_id, error=f"{type(error).__name__}: {error}")
+
+
+def run_sync(*, favorites, operations: list[SyncOperation], token: str, max_workers: int) -> SyncReport:
+    def apply(operation: SyncOperation) -> SyncItemResult:
+        if operation.action == SyncAction.UNCHANGED:
+            return SyncItemResult(action=operation.action, airport_id=operation.airport_id, favorite_id=operation.favorite_id)
+        try:
+            return _result(operation, _call(favorites, operation, token))
+        except Exception as error:
+            return _failure(operation, error)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return SyncReport(results=list(executor.map(apply, operations)))
+
+
+async def run_sync_async(*, favorites, operations: list[SyncOperation], token: str, max_workers: int) -> SyncReport:
+    # Bounds the sync like the thread pool of run_sync, below the client's own max_concurrency.
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def apply(operation: SyncOperation) -> SyncItemResult:
+        if operation.action == SyncAction.UNCHANGED:
+            return SyncItemResult(action=operation.action, airport_id=operation.airport_id, favorite_id=operation.favorite_id)
+        try:
+            async with semaphore:
+                return _result(operation, await _call(favorites, operation, token))
+        except Exception as error:
+            return _failure(operation, error)
+
+    return SyncReport(results=list(await asyncio.gather(*(apply(operation) for operation in operations))))
@@ -0,0 +1,122 @@
+import fnmatch
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+
+from airgap_api.api.instrumentation import HistogramAggregator, endpoint_template
+
+DEFAULT_HEDGED_ENDPOINTS = ("airports", "airports/*")
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    fired: int = 0
+    won: int = 0
+    skipped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **values) -> None:
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def fire_rate(self) -> float:
+        return self.fired / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.won / self.fired if self.fired else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "fired": self.fired,
+                "won": self.won,
+                "skipped": self.skipped,
+                "fire_rate": self.fire_rate,
+                "win_rate": self.win_rate,
+            }
+
+
+class HedgePolicy:
+    """Sends a second copy of a slow idempotent GET once it outlasts a latency percentile of its endpoint."""
+
+    def __init__(self, *, endpoints: tuple[str, ...] = DEFAULT_HEDGED_ENDPOINTS, percentile: float = 95.0, min_samples: int = 20, initial_delay: float = 0.5, min_delay: float = 0.01, max_delay: float = 5.0, max_workers: int = 32, aggregator: HistogramAggregator | None = None) -> None:
+        self.endpoints = endpoints
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        # Fed by the client's instrumentation, so the delay follows the latency the client actually sees.
+        self.aggregator = aggregator if aggregator is not None else HistogramAggregator()
+        self.stats = HedgeStats()
+
+    def applies(self, *, method: str, endpoint: str) -> bool:
+        endpoint = endpoint.strip("/")
+        return method.upper() == "GET" and any(fnmatch.fnmatchcase(endpoint, pattern) for pattern in self.endpoints)
+
+    def delay(self, *, endpoint: str) -> float:
+        observed = self.aggregator.percentile(method="GET", endpoint=endpoint_template(endpoint), percentile=self.percentile, min_samples=self.min_samples)
+        if observed is None:
+            return self.initial_delay
+        return min(max(observed, self.min_delay), self.max_delay)
+
+
+class _Timer:
+    def __init__(self, callback) -> None:
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class HedgeTimers:
+    """One thread firing due hedges, so a request waiting for its hedge delay does not hold a thread of its own."""
+
+    def __init__(self, *, name: str = "airgap-hedge-timer") -> None:
+        self.name = name
+        self._heap: list[tuple[float, int, _Timer]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def call_later(self, delay: float, callback) -> _Timer:
+        timer = _Timer(callback)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("HedgeTimers is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), timer))
+            self._condition.notify()
+        return timer
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                _, _, timer = heapq.heappop(self._heap)
+            if not timer.cancelled:
+                timer.callback()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._heap.clear()
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
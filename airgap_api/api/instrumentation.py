@@ -0,0 +1,176 @@
+import abc
+import math
+import random
+import re
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+_ID_SEGMENT = re.compile(r"^[a-z_]+$")
+
+attempt_number: ContextVar[int] = ContextVar("attempt_number", default=1)
+
+
+def endpoint_template(path: str) -> str:
+    segments = path.split("?", 1)[0].strip("/").split("/")
+    return "/".join(segment if index == 0 or _ID_SEGMENT.match(segment) else "{id}" for index, segment in enumerate(segments))
+
+
+@dataclass
+class RequestEvent:
+    method: str
+    endpoint: str
+    url: str
+    status_code: int
+    elapsed: float
+    bytes: int
+    retries: int
+    response: object = field(default=None, repr=False)
+
+    def body_text(self, limit: int | None = None) -> str:
+        content = getattr(self.response, "content", b"") or b""
+        if limit is not None and len(content) > limit:
+            return f"{content[:limit].decode('utf-8', 'replace')}... ({len(content)} bytes)"
+        return content.decode("utf-8", "replace")
+
+
+class EventSink(abc.ABC):
+    def __init__(self, *, sample_rate: float = 1.0) -> None:
+        self.sample_rate = sample_rate
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @abc.abstractmethod
+    def emit(self, event: RequestEvent) -> None:
+        ...
+
+
+class LoguruSink(EventSink):
+    def __init__(self, *, level: str = "DEBUG", body_level: str = "TRACE", body_limit: int | None = 2048, sample_rate: float = 1.0) -> None:
+        super().__init__(sample_rate=sample_rate)
+        self.level = level
+        self.body_level = body_level
+        self.body_limit = body_limit
+
+    def emit(self, event: RequestEvent) -> None:
+        # Formatted by loguru, and only when a handler is enabled at the level.
+        logger.log(self.level, "[{}]{} = {} in {:.6f}s ({} bytes, {} retries)", event.method, event.url, event.status_code, event.elapsed, event.bytes, event.retries)
+        # lazy=True only formats the body when a handler is enabled at body_level.
+        logger.opt(lazy=True).log(self.body_level, "{body}", body=lambda: event.body_text(limit=self.body_limit))
+
+
+class LatencyHistogram:
+    """Log-linear bucketed histogram of latencies in seconds with ~1% relative precision."""
+
+    _GROWTH = 1.02
+    _MIN_VALUE = 1e-6
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        return int(math.log(max(value, self._MIN_VALUE) / self._MIN_VALUE, self._GROWTH))
+
+    def record(self, value: float) -> None:
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = math.ceil(percentile / 100 * self.count)
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                # Report the bucket midpoint, capped at the largest value seen.
+                return min(self._MIN_VALUE * self._GROWTH ** (bucket + 0.5), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class HistogramAggregator(EventSink):
+    def __init__(self, *, sample_rate: float = 1.0) -> None:
+        super().__init__(sample_rate=sample_rate)
+        self._lock = threading.Lock()
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.status_codes: dict[str, dict[int, int]] = {}
+        self.bytes: dict[str, int] = {}
+        self.retries: dict[str, int] = {}
+
+    def emit(self, event: RequestEvent) -> None:
+        key = f"{event.method} {event.endpoint}"
+        with self._lock:
+            self.histograms.setdefault(key, LatencyHistogram()).record(event.elapsed)
+            status_codes = self.status_codes.setdefault(key, {})
+            status_codes[event.status_code] = status_codes.get(event.status_code, 0) + 1
+            self.bytes[key] = self.bytes.get(key, 0) + event.bytes
+            self.retries[key] = self.retries.get(key, 0) + event.retries
+
+    def histogram(self, *, method: str, endpoint: str) -> LatencyHistogram | None:
+        return self.histograms.get(f"{method} {endpoint}")
+
+    def percentile(self, *, method: str, endpoint: str, percentile: float, min_samples: int = 1) -> float | None:
+        with self._lock:
+            histogram = self.histograms.get(f"{method} {endpoint}")
+            if histogram is None or histogram.count < min_samples:
+                return None
+            return histogram.percentile(percentile)
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {key: histogram.summary() for key, histogram in self.histograms.items()}
+
+
+class Instrumentation:
+    def __init__(self, *, sinks: list[EventSink] | None = None) -> None:
+        self.sinks = [LoguruSink()] if sinks is None else list(sinks)
+
+    def add_sink(self, sink: EventSink) -> None:
+        self.sinks.append(sink)
+
+    def record(self, *, method: str, path: str, url: str, status_code: int, elapsed: float, response) -> None:
+        sinks = [sink for sink in self.sinks if sink.sampled()]
+        if not sinks:
+            return
+        event = RequestEvent(
+            method=method.upper(),
+            endpoint=endpoint_template(path),
+            url=url,
+            status_code=status_code,
+            elapsed=elapsed,
+            bytes=len(getattr(response, "content", b"") or b""),
+            retries=attempt_number.get() - 1,
+            response=response,
+        )
+        for sink in sinks:
+            sink.emit(event)
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from airgap_api.utils.file_lock import FileLock
+
+_STATE = struct.Struct("<ddd")
+# Reset values larger than this are epoch timestamps rather than a number of seconds.
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > _EPOCH_THRESHOLD:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+def _header(headers, *names: str) -> str | None:
+    for name in names:
+        if (value := headers.get(name)) is not None:
+            return value
+    return None
+
+
+@dataclass
+class _BucketState:
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """Token bucket limiting request rate, optionally shared between processes through a state file."""
+
+    def __init__(self, *, rate: float, capacity: float | None = None, state_path: str | os.PathLike | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.state_path = Path(state_path) if state_path is not None else None
+        self._thread_lock = threading.Lock()
+        self._state = _BucketState(tokens=self.capacity, updated_at=time.time())
+        self.total_wait = 0.0
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, *, burst: float | None = None, state_path: str | os.PathLike | None = None) -> "RateLimiter":
+        return cls(rate=requests_per_minute / 60, capacity=burst, state_path=state_path)
+
+    def _read_state(self) -> _BucketState:
+        try:
+            data = self.state_path.read_bytes()
+            return _BucketState(*_STATE.unpack(data[:_STATE.size]))
+        except (FileNotFoundError, struct.error):
+            return _BucketState(tokens=self.capacity, updated_at=time.time())
+
+    def _write_state(self, state: _BucketState) -> None:
+        self.state_path.write_bytes(_STATE.pack(state.tokens, state.updated_at, state.blocked_until))
+
+    def _update(self, update):
+        with self._thread_lock:
+            if self.state_path is None:
+                return update(self._state)
+            with FileLock(path=self.state_path.with_name(f"{self.state_path.name}.lock")):
+                state = self._read_state()
+                result = update(state)
+                self._write_state(state)
+                return result
+
+    def _take(self, state: _BucketState) -> float:
+        now = time.time()
+        state.tokens = min(self.capacity, state.tokens + (now - state.updated_at) * self.rate)
+        state.updated_at = now
+        if now < state.blocked_until:
+            return state.blocked_until - now
+        if state.tokens >= 1:
+            state.tokens -= 1
+            return 0.0
+        return (1 - state.tokens) / self.rate
+
+    def try_acquire(self) -> float:
+        return self._update(self._take)
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while (wait := self.try_acquire()) > 0:
+            time.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return waited
+
+    async def try_acquire_async(self) -> float:
+        # An in-process bucket only takes a thread lock; the flock and state file of a shared one are kept off the event loop.
+        if self.state_path is None:
+            return self.try_acquire()
+        return await asyncio.to_thread(self.try_acquire)
+
+    async def acquire_async(self) -> float:
+        waited = 0.0
+        while (wait := await self.try_acquire_async()) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        self.total_wait += waited
+        return waited
+
+    def observe(self, *, headers) -> None:
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        remaining = _header(headers, "RateLimit-Remaining", "X-RateLimit-Remaining")
+        reset = parse_rate_limit_reset(_header(headers, "RateLimit-Reset", "X-RateLimit-Reset"))
+        if retry_after is None and remaining is None:
+            return
+
+        def apply(state: _BucketState) -> None:
+            now = time.time()
+            if retry_after is not None:
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+            if remaining is not None:
+                try:
+                    state.tokens = min(state.tokens, float(remaining))
+                except ValueError:
+                    return
+                if state.tokens < 1 and reset is not None:
+                    state.blocked_until = max(state.blocked_until, now + reset)
+
+        self._update(apply)
+
+    async def observe_async(self, *, headers) -> None:
+        if self.state_path is None:
+            self.observe(headers=headers)
+        else:
+            await asyncio.to_thread(self.observe, headers=headers)
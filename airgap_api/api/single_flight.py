@@ -0,0 +1,102 @@
+import asyncio
+import copy
+import threading
+from dataclasses import dataclass, field
+
+# Headers that change what a request returns, so requests differing in them are never shared.
+# Conditional headers are among them, as a 304 answers only the caller that sent them.
+KEY_HEADERS = ("authorization", "accept", "accept-encoding", "accept-language", "cookie", "if-none-match", "if-modified-since")
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: object = None
+    error: BaseException | None = None
+
+
+@dataclass
+class _AsyncCall:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Shares one in-flight response between concurrent identical requests, from threads or asyncio tasks."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[tuple, _Call] = {}
+        self._tasks: dict[tuple, _AsyncCall] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(*, method: str, url: str, params: dict | None = None, headers: dict | None = None) -> tuple:
+        relevant = tuple(sorted((str(name).lower(), str(value)) for name, value in (headers or {}).items() if str(name).lower() in KEY_HEADERS))
+        return method.upper(), url, tuple(sorted((str(name), str(value)) for name, value in (params or {}).items())), relevant
+
+    def do(self, key: tuple, call):
+        with self._lock:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                in_flight = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return self._copy(in_flight.result)
+        try:
+            in_flight.result = call()
+            return self._copy(in_flight.result)
+        except BaseException as error:
+            in_flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            in_flight.done.set()
+
+    async def do_async(self, key: tuple, call):
+        loop = asyncio.get_running_loop()
+        # Tasks belong to one event loop, so the loop is part of the key.
+        key = (id(loop), *key)
+        with self._lock:
+            in_flight = self._tasks.get(key)
+            if in_flight is None or in_flight.task.done():
+                in_flight = self._tasks[key] = _AsyncCall(task=loop.create_task(call()))
+                in_flight.task.add_done_callback(lambda _: self._forget(key, in_flight))
+                self.calls += 1
+            else:
+                self.coalesced += 1
+            in_flight.waiters += 1
+        try:
+            # The call runs as its own task, so a cancelled caller, leader or not, leaves it running for the others.
+            result = await asyncio.shield(in_flight.task)
+        finally:
+            with self._lock:
+                in_flight.waiters -= 1
+                abandoned = in_flight.waiters == 0
+            if abandoned and not in_flight.task.done():
+                in_flight.task.cancel()
+        return self._copy(result)
+
+    @staticmethod
+    def _copy(response):
+        # Every caller, the leader too, gets its own response object over the shared body.
+        # Callers may change the headers in place, so each copy gets headers of its own:
+        # a CaseInsensitiveDict for requests, httpx.Headers for httpx.
+        copied = copy.copy(response)
+        if hasattr(response, "headers"):
+            copied.headers = type(response.headers)(response.headers)
+        return copied
+
+    def _forget(self, key: tuple, in_flight: _AsyncCall) -> None:
+        with self._lock:
+            if self._tasks.get(key) is in_flight:
+                del self._tasks[key]
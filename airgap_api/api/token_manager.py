@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from airgap_api.utils.file_lock import FileLock
+
+
+class AuthenticationError(Exception):
+    """Raised when a token cannot be obtained for an account."""
+
+
+@dataclass(frozen=True)
+class Credentials:
+    email: str
+    password: str
+
+    @property
+    def key(self) -> str:
+        # Cache entries are keyed by a digest so the password is never written to disk.
+        return hashlib.sha256(f"{self.email}\0{self.password}".encode("utf-8")).hexdigest()[:24]
+
+
+@dataclass(frozen=True)
+class TokenLease:
+    credentials: Credentials
+    token: str
+    headers: dict[str, str]
+
+
+def parse_accounts(value: str | None) -> list[Credentials]:
+    accounts = []
+    for account in (value or "").split(","):
+        email, separator, password = account.strip().partition(":")
+        if separator:
+            accounts.append(Credentials(email=email, password=password))
+    return accounts
+
+
+class TokenManager:
+    """Fetches a bearer token once per account and shares it through memory and an optional on-disk cache."""
+
+    def __init__(self, *, accounts: list[Credentials], cache_path: str | os.PathLike | None = None, authenticate: Callable[[Credentials], str] | None = None) -> None:
+        if not accounts:
+            raise ValueError("At least one account is required")
+        self.accounts = list(accounts)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.authenticate = authenticate
+        self.authentications = 0
+        self._tokens: dict[str, str] = {}
+        self._headers: dict[str, dict[str, str]] = {}
+        self._lock = threading.RLock()
+        self._next_account = 0
+        self._leased: set[Credentials] = set()
+        self._released = threading.Condition(self._lock)
+
+    @classmethod
+    def from_env(cls, *, cache_path: str | os.PathLike | None = None, authenticate: Callable[[Credentials], str] | None = None) -> "TokenManager":
+        accounts = parse_accounts(os.environ.get("AIRGAP_ACCOUNTS"))
+        if not accounts:
+            accounts = [Credentials(email=os.environ["AIRGAP_EMAIL"], password=os.environ["AIRGAP_PASSWORD"])]
+        return cls(accounts=accounts, cache_path=cache_path, authenticate=authenticate)
+
+    @staticmethod
+    def auth_headers(*, token: str) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer token={token}"
+        }
+
+    def headers(self, *, token: str) -> dict[str, str]:
+        headers = self._headers.get(token)
+        if headers is None:
+            headers = self._headers[token] = self.auth_headers(token=token)
+        return headers
+
+    def _read_cache(self) -> dict[str, str]:
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_cache(self, tokens: dict[str, str]) -> None:
+        temporary = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(tokens, file)
+        os.replace(temporary, self.cache_path)
+
+    @contextmanager
+    def _cache_lock(self):
+        if self.cache_path is None:
+            yield
+            return
+        with FileLock(path=self.cache_path.with_name(f"{self.cache_path.name}.lock")):
+            yield
+
+    def bind(self, client) -> "TokenManager":
+        """Authenticates accounts through the tokens endpoint of client, replacing any previous authenticate callable."""
+        from airgap_api.api.async_api_client import AsyncBaseAPIClient
+
+        if isinstance(client, AsyncBaseAPIClient):
+            async def authenticate(credentials: Credentials) -> str:
+                return await client.tokens.get_token(email=credentials.email, password=credentials.password)
+        else:
+            def authenticate(credentials: Credentials) -> str:
+                return client.tokens.get_token(email=credentials.email, password=credentials.password)
+        self.authenticate = authenticate
+        return self
+
+    def _authenticate(self, credentials: Credentials) -> str:
+        if self.authenticate is None:
+            raise AuthenticationError("TokenManager has no authenticate callable, pass it to the constructor or bind a client")
+        if inspect.iscoroutinefunction(self.authenticate):
+            raise AuthenticationError("TokenManager is bound to an async client, use token_async() and refresh_async()")
+        logger.debug(f"Authenticating {credentials.email}")
+        self.authentications += 1
+        return self.authenticate(credentials)
+
+    def token_for(self, credentials: Credentials, *, rejected: str | None = None) -> str:
+        key = credentials.key
+        token = self._tokens.get(key)
+        if token is not None and token != rejected:
+            return token
+        with self._lock, self._cache_lock():
+            token = self._tokens.get(key)
+            if token is not None and token != rejected:
+                return token
+            cached = self._read_cache() if self.cache_path is not None else {}
+            token = cached.get(key)
+            # A token another worker already replaced after a 401 is used as is.
+            if token is None or token == rejected:
+                token = self._authenticate(credentials)
+                if self.cache_path is not None:
+                    cached[key] = token
+                    self._write_cache(cached)
+            self._tokens[key] = token
+            return token
+
+    def _cached_token(self, credentials: Credentials, *, rejected: str | None) -> str | None:
+        with self._lock, self._cache_lock():
+            token = self._tokens.get(credentials.key)
+            if token is None or token == rejected:
+                token = (self._read_cache() if self.cache_path is not None else {}).get(credentials.key)
+            if token is None or token == rejected:
+                return None
+            self._tokens[credentials.key] = token
+            return token
+
+    def _store(self, credentials: Credentials, *, token: str) -> None:
+        with self._lock, self._cache_lock():
+            if self.cache_path is not None:
+                cached = self._read_cache()
+                cached[credentials.key] = token
+                self._write_cache(cached)
+            self._tokens[credentials.key] = token
+
+    async def token_for_async(self, credentials: Credentials, *, rejected: str | None = None) -> str:
+        token = self._tokens.get(credentials.key)
+        if token is not None and token != rejected:
+            return token
+        # The file lock and cache file are handled off the event loop; unlike token_for the lock is not held while authenticating.
+        token = await asyncio.to_thread(self._cached_token, credentials, rejected=rejected)
+        if token is not None:
+            return token
+        if self.authenticate is None:
+            raise AuthenticationError("TokenManager has no authenticate callable, pass it to the constructor or bind a client")
+        logger.debug(f"Authenticating {credentials.email}")
+        self.authentications += 1
+        if inspect.iscoroutinefunction(self.authenticate):
+            token = await self.authenticate(credentials)
+        else:
+            token = await asyncio.to_thread(self.authenticate, credentials)
+        await asyncio.to_thread(self._store, credentials, token=token)
+        return token
+
+    def remember(self, credentials: Credentials, *, token: str) -> None:
+        with self._lock:
+            self._tokens[credentials.key] = token
+
+    def _next_credentials(self) -> Credentials:
+        with self._lock:
+            credentials = self.accounts[self._next_account % len(self.accounts)]
+            self._next_account += 1
+        return credentials
+
+    def token(self) -> str:
+        return self.token_for(self._next_credentials())
+
+    async def token_async(self) -> str:
+        return await self.token_for_async(self._next_credentials())
+
+    def credentials_for(self, *, token: str) -> Credentials | None:
+        keys = {key for key, cached in self._tokens.items() if cached == token}
+        return next((credentials for credentials in self.accounts if credentials.key in keys), None)
+
+    def refresh(self, *, token: str) -> str | None:
+        credentials = self.credentials_for(token=token)
+        if credentials is None:
+            return None
+        logger.debug(f"Token for {credentials.email} was rejected, re-authenticating")
+        return self.token_for(credentials, rejected=token)
+
+    async def refresh_async(self, *, token: str) -> str | None:
+        credentials = self.credentials_for(token=token)
+        if credentials is None:
+            return None
+        logger.debug(f"Token for {credentials.email} was rejected, re-authenticating")
+        return await self.token_for_async(credentials, rejected=token)
+
+    def _try_lease(self, credentials: Credentials) -> FileLock | None | bool:
+        if credentials in self._leased:
+            return False
+        if self.cache_path is None:
+            return None
+        lock = FileLock(path=self.cache_path.with_name(f"{self.cache_path.name}.{credentials.key}.lease"))
+        return lock if lock.acquire(blocking=False) else False
+
+    @contextmanager
+    def lease(self, *, account: int | None = None, poll_interval: float = 0.1):
+        """Exclusively holds one account, or the account at index account, across processes when a cache_path is set, until the block exits."""
+        candidates = self.accounts if account is None else [self.accounts[account % len(self.accounts)]]
+        while True:
+            with self._lock:
+                for credentials in candidates:
+                    lock = self._try_lease(credentials)
+                    if lock is not False:
+                        self._leased.add(credentials)
+                        break
+                else:
+                    credentials = None
+                if credentials is None and self.cache_path is None:
+                    self._released.wait()
+                    continue
+            if credentials is not None:
+                break
+            time.sleep(poll_interval)
+        try:
+            token = self.token_for(credentials)
+            yield TokenLease(credentials=credentials, token=token, headers=self.headers(token=token))
+        finally:
+            with self._lock:
+                if lock is not None:
+                    lock.release()
+                self._leased.discard(credentials)
+                self._released.notify()
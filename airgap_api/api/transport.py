@@ -0,0 +1,243 @@
+import fnmatch
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ProtocolError
+from urllib3.util.request import ACCEPT_ENCODING
+
+if TYPE_CHECKING:
+    import httpx
+
+_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"})
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    connect_timeout: float | None = 10.0
+    read_timeout: float | None = 60.0
+    keep_alive: bool = True
+    compression: bool = True
+    # (connect, read) timeouts keyed by "METHOD pattern", "pattern" or "METHOD", e.g. {"GET airports/*": (3.0, 5.0)}.
+    timeouts: dict[str, tuple[float | None, float | None]] = field(default_factory=dict)
+
+    @property
+    def timeout(self) -> tuple[float | None, float | None]:
+        return self.connect_timeout, self.read_timeout
+
+    def timeout_for(self, *, method: str, endpoint: str) -> tuple[float | None, float | None]:
+        """The most specific of "METHOD pattern", "pattern" and "METHOD" timeouts matching the request, else the defaults."""
+        method, endpoint = method.upper(), endpoint.strip("/")
+        verb_patterns, patterns = [], []
+        for key, timeout in self.timeouts.items():
+            key_method, _, pattern = key.rpartition(" ")
+            if key_method:
+                verb_patterns.append((key_method.upper(), pattern, timeout))
+            elif key.upper() not in _METHODS:
+                patterns.append((method, key, timeout))
+        for key_method, pattern, timeout in verb_patterns + patterns:
+            if key_method == method and fnmatch.fnmatchcase(endpoint, pattern):
+                return timeout
+        return next((timeout for key, timeout in self.timeouts.items() if key.upper() == method), self.timeout)
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "Accept-Encoding": ACCEPT_ENCODING if self.compression else "identity",
+            "Connection": "keep-alive" if self.keep_alive else "close",
+        }
+
+    def httpx_limits(self) -> "httpx.Limits":
+        import httpx
+
+        return httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0)
+
+    def httpx_timeout(self, *, method: str | None = None, endpoint: str | None = None) -> "httpx.Timeout":
+        import httpx
+
+        connect, read = self.timeout_for(method=method, endpoint=endpoint) if method is not None else self.timeout
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=None)
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    connect_time: float = 0.0
+    tls_handshakes: int = 0
+    tls_handshake_time: float = 0.0
+    pool_wait_time: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **values) -> None:
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def reuse_ratio(self) -> float:
+        checkouts = self.connections_created + self.connections_reused
+        return self.connections_reused / checkouts if checkouts else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_created": self.connections_created,
+                "connections_reused": self.connections_reused,
+                "connect_time": self.connect_time,
+                "tls_handshakes": self.tls_handshakes,
+                "tls_handshake_time": self.tls_handshake_time,
+                "pool_wait_time": self.pool_wait_time,
+            }
+
+
+class ConnectionTracker:
+    """The pooled connections a thread has checked out, so another thread can abort the request blocked on them."""
+
+    def __init__(self) -> None:
+        self._connections = set()
+        self._lock = threading.Lock()
+        self.aborted = False
+
+    def add(self, conn) -> None:
+        with self._lock:
+            self._connections.add(conn)
+
+    def discard(self, conn) -> None:
+        with self._lock:
+            self._connections.discard(conn)
+
+    def abort(self) -> None:
+        # Connections already returned to the pool were discarded on release, so a connection reused by another request is never touched.
+        with self._lock:
+            self.aborted = True
+            for conn in self._connections:
+                sock = getattr(conn, "sock", None)
+                if sock is None:
+                    continue
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+_tracking = threading.local()
+
+
+@contextmanager
+def tracked_connections():
+    tracker = ConnectionTracker()
+    _tracking.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        _tracking.tracker = None
+
+
+class _InstrumentedConnection:
+    stats: TransportStats | None = None
+    _socket_time = 0.0
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        self._socket_time = time.perf_counter() - started
+        return sock
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        if (tracker := getattr(_tracking, "tracker", None)) is not None and tracker.aborted:
+            raise ProtocolError("Request aborted")
+        if self.stats is None:
+            return
+        # HTTPS connect() opens the socket with _new_conn and then performs the TLS handshake on it.
+        handshake = time.perf_counter() - started - self._socket_time
+        if isinstance(self, HTTPSConnection):
+            self.stats.add(connections_created=1, connect_time=self._socket_time, tls_handshakes=1, tls_handshake_time=handshake)
+        else:
+            self.stats.add(connections_created=1, connect_time=self._socket_time)
+
+
+class _InstrumentedHTTPConnection(_InstrumentedConnection, HTTPConnection):
+    pass
+
+
+class _InstrumentedHTTPSConnection(_InstrumentedConnection, HTTPSConnection):
+    pass
+
+
+class _InstrumentedPool:
+    stats: TransportStats | None = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.stats = self.stats
+        return conn
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout=timeout)
+        if self.stats is not None:
+            self.stats.add(requests=1, pool_wait_time=time.perf_counter() - started, connections_reused=1 if conn.is_connected else 0)
+        if (tracker := getattr(_tracking, "tracker", None)) is not None:
+            # A request aborted before it checked out a connection fails here instead of being sent.
+            if tracker.aborted:
+                super()._put_conn(conn)
+                raise ProtocolError("Request aborted")
+            tracker.add(conn)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if conn is not None and (tracker := getattr(_tracking, "tracker", None)) is not None:
+            tracker.discard(conn)
+        super()._put_conn(conn)
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPool, HTTPConnectionPool):
+    ConnectionCls = _InstrumentedHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPool, HTTPSConnectionPool):
+    ConnectionCls = _InstrumentedHTTPSConnection
+
+
+class _InstrumentedPoolManager(PoolManager):
+    def __init__(self, *args, stats: TransportStats, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {"http": _InstrumentedHTTPConnectionPool, "https": _InstrumentedHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class TransportAdapter(HTTPAdapter):
+    """HTTPAdapter applying a TransportConfig and collecting connection pool statistics."""
+
+    def __init__(self, *, config: TransportConfig | None = None, stats: TransportStats | None = None) -> None:
+        # HTTPAdapter already uses the name config for its own settings dict.
+        self.transport = config if config is not None else TransportConfig()
+        self.stats = stats if stats is not None else TransportStats()
+        super().__init__(pool_connections=self.transport.pool_connections, pool_maxsize=self.transport.pool_maxsize, pool_block=self.transport.pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _InstrumentedPoolManager(num_pools=connections, maxsize=maxsize, block=block, stats=self.stats, **pool_kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.transport.timeout if timeout is None else timeout, **kwargs)
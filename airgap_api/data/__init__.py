@@ -1,6 +1,34 @@
-from airgap_api.data.models import AirportAttributesModel, AirportDataModel, ErrorResponseModel, ErrorListResponseModel, AirportDistanceResultModel, AirportDataPageResponse, FavoriteModel, FavoriteAirportDataPageResponse
-from airgap_api.data.enums import AirportIATACodes, AirportDataType, AirportICAOCodes
-from airgap_api.data.airports import Airports
+import importlib
 
+# Submodules are imported on first attribute access, so importing the package does not build any pydantic models.
+_EXPORTS = {
+    "AirportAttributesModel": "airgap_api.data.models",
+    "AirportDataModel": "airgap_api.data.models",
+    "ErrorResponseModel": "airgap_api.data.models",
+    "ErrorListResponseModel": "airgap_api.data.models",
+    "AirportDistanceResultModel": "airgap_api.data.models",
+    "AirportDataPageResponse": "airgap_api.data.models",
+    "FavoriteModel": "airgap_api.data.models",
+    "FavoriteAirportDataPageResponse": "airgap_api.data.models",
+    "AirportIATACodes": "airgap_api.data.enums",
+    "AirportDataType": "airgap_api.data.enums",
+    "AirportICAOCodes": "airgap_api.data.enums",
+    "Airports": "airgap_api.data.airports",
+    "CodeRegistry": "airgap_api.data.codes",
+    "Codes": "airgap_api.data.codes",
+}
 
-__all__ = ["AirportAttributesModel", "AirportDataModel", "ErrorResponseModel", "ErrorListResponseModel", "AirportIATACodes", "AirportDistanceResultModel", "AirportDataType", "AirportICAOCodes", "Airports", "AirportDataPageResponse", "FavoriteModel", "FavoriteAirportDataPageResponse"]
+
+__all__ = ["AirportAttributesModel", "AirportDataModel", "ErrorResponseModel", "ErrorListResponseModel", "AirportIATACodes", "AirportDistanceResultModel", "AirportDataType", "AirportICAOCodes", "Airports", "AirportDataPageResponse", "FavoriteModel", "FavoriteAirportDataPageResponse", "CodeRegistry", "Codes"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
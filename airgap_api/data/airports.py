@@ -37,4 +37,9 @@ class AirportsModel(AirGapBaseModel):
     )
 
 
-Airports = AirportsModel()
+def __getattr__(name: str) -> AirportsModel:
+    # The fixture instance is only built when a test or caller first uses it.
+    if name != "Airports":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    airports = globals()["Airports"] = AirportsModel()
+    return airports
@@ -0,0 +1,346 @@
+import hashlib
+import http
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from airgap_api.data.models import AirportDataModel
+from airgap_api.utils.digest import page_digest
+from airgap_api.utils.file_lock import FileLock
+
+CATALOG_MAGIC = b"AGCAT\x00\x00\x01"
+CATALOG_VERSION = 1
+NO_STRING = -1
+
+ROW_DTYPE = np.dtype([
+    ("id", "S4"),
+    ("iata", "S4"),
+    ("icao", "S4"),
+    ("latitude", "<f8"),
+    ("longitude", "<f8"),
+    ("altitude", "<i4"),
+    ("type", "<i4"),
+    ("name", "<i4"),
+    ("city", "<i4"),
+    ("country", "<i4"),
+    ("timezone", "<i4"),
+    ("latitude_text", "<i4"),
+    ("longitude_text", "<i4"),
+])
+
+_HEADER = struct.Struct("<8sQQ")
+_ALIGNMENT = 8
+
+
+@dataclass
+class CatalogPage:
+    page: int
+    records: list[dict]
+    etag: str | None = None
+    next_page: int | None = None
+    sha256: str = field(default="")
+
+    def __post_init__(self):
+        if not self.sha256:
+            self.sha256 = page_digest(records=self.records)
+
+
+def _fixed_width_code(value: str | None, *, column: str) -> bytes:
+    encoded = (value or "").encode("ascii")
+    if len(encoded) > ROW_DTYPE[column].itemsize:
+        raise ValueError(f"{column} value {value!r} does not fit the catalog column width")
+    return encoded
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self._values: list[bytes] = []
+
+    def add(self, value: str | None) -> int:
+        if value is None:
+            return NO_STRING
+        if value not in self._index:
+            self._index[value] = len(self._values)
+            self._values.append(value.encode("utf-8"))
+        return self._index[value]
+
+    def to_arrays(self) -> tuple[np.ndarray, bytes]:
+        offsets = np.zeros(len(self._values) + 1, dtype="<i8")
+        np.cumsum([len(value) for value in self._values], out=offsets[1:])
+        return offsets, b"".join(self._values)
+
+
+class AirportCatalog:
+    def __init__(self, *, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, meta_offset, meta_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != CATALOG_MAGIC:
+            raise ValueError(f"{self.path} is not an airport catalog snapshot")
+        self.header = json.loads(self._mm[meta_offset:meta_offset + meta_length])
+        sections = self.header["sections"]
+        self.rows = self._section(sections["rows"], dtype=ROW_DTYPE)
+        self._order = self._section(sections["order"], dtype="<i4")
+        self._string_offsets = self._section(sections["string_offsets"], dtype="<i8")
+        self._strings_start = sections["strings"][0]
+        self._fingerprints: dict[int, str] = {}
+
+    def _section(self, section: list[int], *, dtype) -> np.ndarray:
+        offset, count = section
+        return np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset)
+
+    def close(self) -> None:
+        self.rows = self._order = self._string_offsets = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Column views handed out to callers still reference the map; it is released once they are.
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, airport_id: str) -> bool:
+        return self.row_index(airport_id=airport_id) is not None
+
+    @property
+    def pages(self) -> list[dict]:
+        return self.header["pages"]
+
+    @property
+    def latitude(self) -> np.ndarray:
+        return self.rows["latitude"]
+
+    @property
+    def longitude(self) -> np.ndarray:
+        return self.rows["longitude"]
+
+    @property
+    def altitude(self) -> np.ndarray:
+        return self.rows["altitude"]
+
+    def string(self, index: int) -> str | None:
+        if index == NO_STRING:
+            return None
+        start = self._strings_start + int(self._string_offsets[index])
+        end = self._strings_start + int(self._string_offsets[index + 1])
+        return self._mm[start:end].decode("utf-8")
+
+    def row_index(self, *, airport_id: str) -> int | None:
+        try:
+            key = _fixed_width_code(airport_id, column="id")
+        except (ValueError, UnicodeEncodeError):
+            return None
+        ids = self.rows["id"]
+        position = int(np.searchsorted(ids, key, sorter=self._order))
+        if position < len(ids) and ids[self._order[position]] == key:
+            return int(self._order[position])
+        return None
+
+    def row_indexes(self, *, airport_ids) -> np.ndarray:
+        keys = np.asarray(airport_ids, dtype=ROW_DTYPE["id"])
+        ids = self.rows["id"]
+        positions = np.minimum(np.searchsorted(ids, keys, sorter=self._order), len(ids) - 1)
+        rows = self._order[positions]
+        missing = ids[rows] != keys
+        if missing.any():
+            raise KeyError(f"Airports not in catalog: {sorted({key.decode() for key in keys[missing].tolist()})}")
+        return rows
+
+    def record(self, *, row: int) -> dict:
+        values = self.rows[row]
+        return {
+            "id": values["id"].decode("ascii"),
+            "type": self.string(int(values["type"])),
+            "attributes": {
+                "name": self.string(int(values["name"])),
+                "city": self.string(int(values["city"])),
+                "country": self.string(int(values["country"])),
+                "iata": values["iata"].decode("ascii"),
+                "icao": values["icao"].decode("ascii"),
+                "latitude": self.string(int(values["latitude_text"])),
+                "longitude": self.string(int(values["longitude_text"])),
+                "altitude": int(values["altitude"]),
+                "timezone": self.string(int(values["timezone"])),
+            }
+        }
+
+    def fingerprint(self, *, airport_id: str) -> str | None:
+        row = self.row_index(airport_id=airport_id)
+        if row is None:
+            return None
+        fingerprint = self._fingerprints.get(row)
+        if fingerprint is None:
+            record = json.dumps(self.record(row=row), sort_keys=True, separators=(",", ":"))
+            fingerprint = self._fingerprints[row] = hashlib.blake2b(record.encode("utf-8"), digest_size=16).hexdigest()
+        return fingerprint
+
+    def get_by_id(self, *, airport_id: str) -> AirportDataModel | None:
+        row = self.row_index(airport_id=airport_id)
+        if row is None:
+            return None
+        return AirportDataModel(**self.record(row=row))
+
+    def catalog_pages(self) -> list[CatalogPage]:
+        return [
+            CatalogPage(
+                page=page["page"],
+                records=[self.record(row=row) for row in range(page["start"], page["start"] + page["count"])],
+                etag=page["etag"],
+                next_page=page["next_page"],
+                sha256=page["sha256"],
+            )
+            for page in self.pages
+        ]
+
+    @staticmethod
+    def write(*, path: str | os.PathLike, pages: list[CatalogPage]) -> None:
+        path = Path(path)
+        strings = _StringTable()
+        records = [record for page in pages for record in page.records]
+        rows = np.zeros(len(records), dtype=ROW_DTYPE)
+        for row, record in enumerate(records):
+            attributes = record["attributes"]
+            rows[row] = (
+                _fixed_width_code(record["id"], column="id"),
+                _fixed_width_code(attributes["iata"], column="iata"),
+                _fixed_width_code(attributes["icao"], column="icao"),
+                float(attributes["latitude"]),
+                float(attributes["longitude"]),
+                attributes["altitude"],
+                strings.add(record["type"]),
+                strings.add(attributes["name"]),
+                strings.add(attributes["city"]),
+                strings.add(attributes["country"]),
+                strings.add(attributes["timezone"]),
+                strings.add(attributes["latitude"]),
+                strings.add(attributes["longitude"]),
+            )
+        order = np.argsort(rows["id"], kind="stable").astype("<i4")
+        string_offsets, string_blob = strings.to_arrays()
+
+        manifest, start = [], 0
+        for page in pages:
+            manifest.append({"page": page.page, "start": start, "count": len(page.records), "sha256": page.sha256, "etag": page.etag, "next_page": page.next_page})
+            start += len(page.records)
+
+        blobs = {"rows": (rows.tobytes(), len(rows)), "order": (order.tobytes(), len(order)), "string_offsets": (string_offsets.tobytes(), len(string_offsets)), "strings": (string_blob, len(string_blob))}
+        header = {"version": CATALOG_VERSION, "rows": len(rows), "pages": manifest, "sections": {}}
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"\x00" * _HEADER.size)
+            for name, (blob, count) in blobs.items():
+                f.write(b"\x00" * (_align(f.tell()) - f.tell()))
+                header["sections"][name] = [f.tell(), count]
+                f.write(blob)
+            meta_offset = f.tell()
+            meta = json.dumps(header, separators=(",", ":")).encode()
+            f.write(meta)
+            f.seek(0)
+            f.write(_HEADER.pack(CATALOG_MAGIC, meta_offset, len(meta)))
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote airport catalog snapshot with {len(rows)} airports to {path}")
+
+    @classmethod
+    def build(cls, *, client, path: str | os.PathLike, max_workers: int | None = None) -> "AirportCatalog":
+        first_page = _fetch_page(client=client, page=1)
+        page_count = client.page_count(response_json=first_page.response_json) if max_workers else None
+        pages = [first_page.catalog_page]
+        if page_count is None:
+            next_page = first_page.catalog_page.next_page
+            while next_page:
+                fetched = _fetch_page(client=client, page=next_page)
+                pages.append(fetched.catalog_page)
+                next_page = fetched.catalog_page.next_page
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pages.extend(fetched.catalog_page for fetched in executor.map(lambda page: _fetch_page(client=client, page=page), range(2, page_count + 1)))
+        cls.write(path=path, pages=[page for page in pages if page.records])
+        return cls(path=path)
+
+    @classmethod
+    def open_or_build(cls, *, client, path: str | os.PathLike, max_workers: int | None = None) -> "AirportCatalog":
+        path = Path(path)
+        with _snapshot_lock(path=path):
+            if not path.exists():
+                cls.build(client=client, path=path, max_workers=max_workers).close()
+        return cls(path=path)
+
+    def refresh(self, *, client) -> list[int]:
+        with _snapshot_lock(path=self.path):
+            # Another process may have replaced the snapshot since it was mapped; diff against the current one.
+            self.close()
+            self._open()
+            changed_pages = []
+            pages = self.catalog_pages()
+            refreshed = []
+            for page in pages:
+                fetched = _fetch_page(client=client, page=page.page, etag=page.etag)
+                if fetched.not_modified or fetched.catalog_page.sha256 == page.sha256:
+                    refreshed.append(page)
+                else:
+                    changed_pages.append(page.page)
+                    refreshed.append(fetched.catalog_page)
+            next_page = refreshed[-1].next_page if refreshed else 1
+            while next_page:
+                fetched = _fetch_page(client=client, page=next_page)
+                changed_pages.append(next_page)
+                refreshed.append(fetched.catalog_page)
+                next_page = fetched.catalog_page.next_page
+            if changed_pages:
+                logger.info(f"Airport catalog pages changed: {changed_pages}")
+                self.write(path=self.path, pages=[page for page in refreshed if page.records])
+                self.close()
+                self._open()
+        return changed_pages
+
+
+@dataclass
+class _FetchedPage:
+    catalog_page: CatalogPage | None = None
+    response_json: dict | None = None
+    not_modified: bool = False
+
+
+def _fetch_page(*, client, page: int, etag: str | None = None) -> _FetchedPage:
+    headers = {"If-None-Match": etag} if etag else None
+    response = client.airports.get(page=page, headers=headers)
+    if response.status_code == http.HTTPStatus.NOT_MODIFIED:
+        return _FetchedPage(not_modified=True)
+    response.raise_for_status()
+    response_json = response.json()
+    next_url = response_json.get("links", {}).get("next")
+    next_page = client.extract_parameter_value(url=next_url, parameter_name="page") if next_url else None
+    catalog_page = CatalogPage(
+        page=page,
+        records=response_json.get("data", []),
+        etag=response.headers.get("ETag"),
+        next_page=int(next_page) if next_page else None,
+    )
+    return _FetchedPage(catalog_page=catalog_page, response_json=response_json)
+
+
+def _snapshot_lock(*, path: Path) -> FileLock:
+    return FileLock(path=path.with_name(f"{path.name}.lock"))
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+DEFAULT_CODES_PATH = Path(__file__).with_name("codes.txt")
+
+
+class CodeRegistry:
+    """IATA/ICAO code pairs read from a generated file on first use, with O(1) lookups in both directions."""
+
+    def __init__(self, *, path: str | os.PathLike | None = None) -> None:
+        self._path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._icao_by_iata: dict[str, str] | None = None
+        self._iata_by_icao: dict[str, str] = {}
+
+    @property
+    def path(self) -> Path:
+        return self._path or Path(os.environ.get("AIRGAP_CODES_PATH") or DEFAULT_CODES_PATH)
+
+    @property
+    def loaded(self) -> bool:
+        return self._icao_by_iata is not None
+
+    def _codes(self) -> dict[str, str]:
+        if self._icao_by_iata is None:
+            with self._lock:
+                if self._icao_by_iata is None:
+                    self._load()
+        return self._icao_by_iata
+
+    def _load(self) -> None:
+        icao_by_iata, iata_by_icao = {}, {}
+        for line in self.path.read_text(encoding="ascii").splitlines():
+            if not line or line.startswith("#"):
+                continue
+            iata, _, icao = line.partition(" ")
+            iata = sys.intern(iata)
+            icao_by_iata[iata] = icao = sys.intern(icao) if icao else ""
+            if icao:
+                iata_by_icao[icao] = iata
+        self._iata_by_icao = iata_by_icao
+        self._icao_by_iata = icao_by_iata
+
+    def __len__(self) -> int:
+        return len(self._codes())
+
+    def __iter__(self):
+        return iter(self._codes())
+
+    def __contains__(self, code: str) -> bool:
+        return self.is_iata(code) or self.is_icao(code)
+
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        codes = self._codes()
+        if name in codes:
+            return sys.intern(name)
+        if name in self._iata_by_icao:
+            return self._icao_by_iata[self._iata_by_icao[name]]
+        raise AttributeError(f"Unknown airport code {name!r}")
+
+    def __dir__(self):
+        return [*super().__dir__(), *self._codes(), *self._iata_by_icao]
+
+    def is_iata(self, code: str) -> bool:
+        return code in self._codes()
+
+    def is_icao(self, code: str) -> bool:
+        self._codes()
+        return code in self._iata_by_icao
+
+    def validate_iata(self, code: str) -> str:
+        code = code.upper()
+        if not self.is_iata(code):
+            raise ValueError(f"Unknown IATA code {code!r}")
+        return sys.intern(code)
+
+    def validate_icao(self, code: str) -> str:
+        code = code.upper()
+        if not self.is_icao(code):
+            raise ValueError(f"Unknown ICAO code {code!r}")
+        return sys.intern(code)
+
+    def icao_for(self, iata: str) -> str | None:
+        return self._codes().get(iata) or None
+
+    def iata_for(self, icao: str) -> str | None:
+        self._codes()
+        return self._iata_by_icao.get(icao)
+
+    @staticmethod
+    def write(*, path: str | os.PathLike, pairs) -> int:
+        lines = sorted({f"{iata} {icao or ''}".rstrip() for iata, icao in pairs if iata})
+        Path(path).write_text("# Generated by python -m airgap_api.data.codes\n" + "".join(f"{line}\n" for line in lines), encoding="ascii")
+        return len(lines)
+
+    @classmethod
+    def generate(cls, *, catalog, path: str | os.PathLike = DEFAULT_CODES_PATH) -> int:
+        rows = catalog.rows
+        return cls.write(path=path, pairs=((iata.decode("ascii"), icao.decode("ascii")) for iata, icao in zip(rows["iata"].tolist(), rows["icao"].tolist())))
+
+
+Codes = CodeRegistry()
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from loguru import logger
+
+    from airgap_api.api.airportgap_api_client import AIRPORT_GAP_BASE_URL, AirportGapAPIClient
+    from airgap_api.data.catalog import AirportCatalog
+
+    parser = argparse.ArgumentParser(description="Generate the airport code registry from a crawl of the airports endpoint.")
+    parser.add_argument("--base-url", default=AIRPORT_GAP_BASE_URL)
+    parser.add_argument("--catalog", type=Path, default=Path("airport_catalog.bin"), help="Catalog snapshot to read, built first if missing.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_CODES_PATH)
+    args = parser.parse_args(argv)
+
+    with AirportCatalog.open_or_build(client=AirportGapAPIClient(base_url=args.base_url), path=args.catalog, max_workers=4) as catalog:
+        count = CodeRegistry.generate(catalog=catalog, path=args.output)
+    logger.info(f"Wrote {count} airport codes to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
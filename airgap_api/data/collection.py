@@ -0,0 +1,176 @@
+import sys
+from collections.abc import Iterable
+
+import numpy as np
+from pydantic import BaseModel
+
+from airgap_api.data.models import AirportDataModel
+
+_TEXT_COLUMNS = ("type", "name", "city", "country", "timezone", "latitude_text", "longitude_text")
+# Kept verbatim so records round-trip exactly, but nearly every value is distinct, so they gain nothing from being categorical.
+_COORDINATE_TEXT_COLUMNS = ("latitude_text", "longitude_text")
+
+
+class StringColumn:
+    """Categorical text column: one interned copy of every distinct value and an int32 code per row."""
+
+    def __init__(self, *, codes: np.ndarray, categories: list[str | None], index: dict[str | None, int]) -> None:
+        self.codes = codes
+        self.categories = categories
+        self.index = index
+
+    @classmethod
+    def from_values(cls, values: Iterable[str | None]) -> "StringColumn":
+        seen: dict[str | None, int] = {}
+        codes = np.fromiter((seen.setdefault(value, len(seen)) for value in values), dtype="<i4")
+        categories = [sys.intern(value) if value is not None else None for value in seen]
+        # Keyed by the interned categories themselves, so the index holds no second copy of any string.
+        return cls(codes=codes, categories=categories, index={value: code for code, value in enumerate(categories)})
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str | None:
+        return self.categories[self.codes[row]]
+
+    def equals(self, value: str | None) -> np.ndarray:
+        code = self.index.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def take(self, rows: np.ndarray) -> "StringColumn":
+        # Subsets share the category table, only the codes are copied.
+        return StringColumn(codes=self.codes[rows], categories=self.categories, index=self.index)
+
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sys.getsizeof(self.categories) + sys.getsizeof(self.index) + sum(sys.getsizeof(value) for value in self.categories if value is not None)
+
+
+class AirportCollection:
+    """Airports held column-wise in typed arrays, with AirportDataModel objects built only for the rows that are accessed."""
+
+    def __init__(self, *, ids: list[str], iata: np.ndarray, icao: np.ndarray, latitude: np.ndarray, longitude: np.ndarray, altitude: np.ndarray, text: dict[str, StringColumn]) -> None:
+        self.ids = ids
+        self.iata = iata
+        self.icao = icao
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.text = text
+        self._rows = {airport_id: row for row, airport_id in enumerate(ids)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "AirportCollection":
+        records = list(records)
+        attributes = [record["attributes"] for record in records]
+        text_values = {
+            "type": [record["type"] for record in records],
+            "latitude_text": [values["latitude"] for values in attributes],
+            "longitude_text": [values["longitude"] for values in attributes],
+        }
+        for name in ("name", "city", "country", "timezone"):
+            text_values[name] = [values.get(name) for values in attributes]
+        return cls(
+            ids=[sys.intern(record["id"]) for record in records],
+            iata=np.array([values["iata"] for values in attributes], dtype="S4"),
+            icao=np.array([values["icao"] or "" for values in attributes], dtype="S4"),
+            latitude=np.array([float(values["latitude"]) for values in attributes], dtype="f8"),
+            longitude=np.array([float(values["longitude"]) for values in attributes], dtype="f8"),
+            altitude=np.array([values["altitude"] for values in attributes], dtype="<i4"),
+            text={name: StringColumn.from_values(text_values[name]) for name in _TEXT_COLUMNS},
+        )
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[list[dict]]) -> "AirportCollection":
+        return cls.from_records(record for page in pages for record in page)
+
+    @classmethod
+    def from_models(cls, airports: Iterable[AirportDataModel]) -> "AirportCollection":
+        return cls.from_records(airport.model_dump() for airport in airports)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, airport_id: str) -> bool:
+        return airport_id in self._rows
+
+    def __getitem__(self, row: int) -> AirportDataModel:
+        return AirportDataModel(**self.record(row=row))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def row_index(self, *, airport_id: str) -> int | None:
+        return self._rows.get(airport_id)
+
+    def record(self, *, row: int) -> dict:
+        text = {name: column[row] for name, column in self.text.items()}
+        return {
+            "id": self.ids[row],
+            "type": text["type"],
+            "attributes": {
+                "name": text["name"],
+                "city": text["city"],
+                "country": text["country"],
+                "iata": self.iata[row].decode("ascii"),
+                "icao": self.icao[row].decode("ascii"),
+                "latitude": text["latitude_text"],
+                "longitude": text["longitude_text"],
+                "altitude": int(self.altitude[row]),
+                "timezone": text["timezone"],
+            }
+        }
+
+    def get_by_id(self, *, airport_id: str) -> AirportDataModel | None:
+        row = self.row_index(airport_id=airport_id)
+        return self[row] if row is not None else None
+
+    def take(self, rows) -> "AirportCollection":
+        rows = np.asarray(rows, dtype=np.intp)
+        return AirportCollection(
+            ids=[self.ids[row] for row in rows.tolist()],
+            iata=self.iata[rows],
+            icao=self.icao[rows],
+            latitude=self.latitude[rows],
+            longitude=self.longitude[rows],
+            altitude=self.altitude[rows],
+            text={name: column.take(rows) for name, column in self.text.items()},
+        )
+
+    def mask(self, *, country: str | None = None, timezone: str | None = None, type: str | None = None) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in (("country", country), ("timezone", timezone), ("type", type)):
+            if value is not None:
+                mask &= self.text[name].equals(value)
+        return mask
+
+    def filter(self, *, country: str | None = None, timezone: str | None = None, type: str | None = None) -> "AirportCollection":
+        return self.take(np.flatnonzero(self.mask(country=country, timezone=timezone, type=type)))
+
+    def memory_footprint(self) -> dict[str, int]:
+        footprint = {
+            "arrays": sum(array.nbytes for array in (self.iata, self.icao, self.latitude, self.longitude, self.altitude)),
+            "strings": sum(column.nbytes() for name, column in self.text.items() if name not in _COORDINATE_TEXT_COLUMNS),
+            "coordinate_text": sum(self.text[name].nbytes() for name in _COORDINATE_TEXT_COLUMNS),
+            "index": sys.getsizeof(self.ids) + sys.getsizeof(self._rows) + sum(sys.getsizeof(airport_id) for airport_id in self.ids),
+        }
+        footprint["total"] = sum(footprint.values())
+        return footprint
+
+
+def deep_sizeof(value, *, seen: set[int] | None = None) -> int:
+    """Approximate bytes held by a value and everything it references, each object counted once."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        size += sum(deep_sizeof(getattr(value, name, None), seen=seen) for name in ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__"))
+    elif isinstance(value, dict):
+        size += sum(deep_sizeof(key, seen=seen) + deep_sizeof(item, seen=seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen=seen) for item in value)
+    return size
@@ -0,0 +1,57 @@
+from typing import NamedTuple
+
+import numpy as np
+
+EARTH_RADIUS_KILOMETERS = 6371.0
+EARTH_RADIUS_MILES = 3956.0
+MILES_PER_NAUTICAL_MILE = 1.15078
+
+
+class Distances(NamedTuple):
+    kilometers: np.ndarray | float
+    miles: np.ndarray | float
+    nautical_miles: np.ndarray | float
+
+
+def central_angle(*, from_latitude, from_longitude, to_latitude, to_longitude) -> np.ndarray:
+    from_latitude, to_latitude = np.radians(from_latitude), np.radians(to_latitude)
+    delta_latitude = to_latitude - from_latitude
+    delta_longitude = np.radians(np.subtract(to_longitude, from_longitude))
+    a = np.sin(delta_latitude / 2) ** 2 + np.cos(from_latitude) * np.cos(to_latitude) * np.sin(delta_longitude / 2) ** 2
+    return 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def distances_from_angle(angle) -> Distances:
+    miles = EARTH_RADIUS_MILES * angle
+    return Distances(kilometers=EARTH_RADIUS_KILOMETERS * angle, miles=miles, nautical_miles=miles / MILES_PER_NAUTICAL_MILE)
+
+
+class DistanceEngine:
+    """Offline great-circle distances using the same formula and radii as the airports/distance endpoint."""
+
+    def __init__(self, *, catalog) -> None:
+        self._catalog = catalog
+
+    def _coordinates(self, airport_ids) -> tuple[np.ndarray, np.ndarray]:
+        rows = self._catalog.row_indexes(airport_ids=np.atleast_1d(airport_ids))
+        return self._catalog.latitude[rows], self._catalog.longitude[rows]
+
+    def pairs(self, *, from_ids, to_ids) -> Distances:
+        from_latitude, from_longitude = self._coordinates(from_ids)
+        to_latitude, to_longitude = self._coordinates(to_ids)
+        if from_latitude.shape != to_latitude.shape:
+            raise ValueError("from_ids and to_ids must be the same length")
+        return distances_from_angle(central_angle(from_latitude=from_latitude, from_longitude=from_longitude, to_latitude=to_latitude, to_longitude=to_longitude))
+
+    def matrix(self, *, airport_ids) -> Distances:
+        latitude, longitude = self._coordinates(airport_ids)
+        angle = central_angle(
+            from_latitude=latitude[:, np.newaxis],
+            from_longitude=longitude[:, np.newaxis],
+            to_latitude=latitude[np.newaxis, :],
+            to_longitude=longitude[np.newaxis, :],
+        )
+        return distances_from_angle(angle)
+
+    def distance(self, *, from_id: str, to_id: str) -> Distances:
+        return Distances(*(float(values[0]) for values in self.pairs(from_ids=[from_id], to_ids=[to_id])))
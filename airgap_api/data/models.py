@@ -1,5 +1,11 @@
+from functools import cached_property
+from typing import Generic, TypeVar
+from urllib.parse import parse_qs, urlparse
+
 from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 class AirGapBaseModel(BaseModel):
     model_config = ConfigDict(extra='ignore', use_enum_values=True)
@@ -66,5 +72,82 @@ class FavoriteModel(AirGapBaseModel):
     attributes: FavoriteAirportModel
 
 
-AirportDataPageResponse = TypeAdapter(list[AirportDataModel])
-FavoriteAirportDataPageResponse = TypeAdapter(list[FavoriteModel])
+# Built on first use by the module __getattr__ below.
+_PAGE_ADAPTER_TYPES = {
+    "AirportDataPageResponse": list[AirportDataModel],
+    "FavoriteAirportDataPageResponse": list[FavoriteModel],
+}
+
+
+def _page_number(url: str | None) -> int | None:
+    pages = parse_qs(urlparse(url).query).get("page") if url else None
+    return int(pages[0]) if pages else None
+
+
+class PageLinksModel(AirGapBaseModel):
+    first: str | None = None
+    last: str | None = None
+    prev: str | None = None
+    next: str | None = None
+
+    @property
+    def next_page(self) -> int | None:
+        return _page_number(self.next)
+
+    @property
+    def last_page(self) -> int | None:
+        return _page_number(self.last)
+
+
+class AirportResponseModel(AirGapBaseModel):
+    data: AirportDataModel
+
+
+class AirportPageResponseModel(AirGapBaseModel):
+    data: list[AirportDataModel]
+    links: PageLinksModel = PageLinksModel()
+
+
+class AirportDistanceResponseModel(AirGapBaseModel):
+    data: AirportDistanceResultModel
+
+
+class FavoriteResponseModel(AirGapBaseModel):
+    data: FavoriteModel
+
+
+class FavoritePageResponseModel(AirGapBaseModel):
+    data: list[FavoriteModel]
+    links: PageLinksModel = PageLinksModel()
+
+
+class ResponseParser(Generic[ModelT]):
+    """Validates a response model straight from the response bytes."""
+
+    def __init__(self, model: type[ModelT]) -> None:
+        self.model = model
+
+    @cached_property
+    def adapter(self) -> TypeAdapter[ModelT]:
+        return TypeAdapter(self.model)
+
+    def parse(self, content: bytes | str) -> ModelT:
+        return self.adapter.validate_json(content)
+
+    def parse_response(self, response) -> ModelT:
+        response.raise_for_status()
+        return self.parse(response.content)
+
+
+AirportResponse = ResponseParser(AirportResponseModel)
+AirportPageResponse = ResponseParser(AirportPageResponseModel)
+AirportDistanceResponse = ResponseParser(AirportDistanceResponseModel)
+FavoriteResponse = ResponseParser(FavoriteResponseModel)
+FavoritePageResponse = ResponseParser(FavoritePageResponseModel)
+
+
+def __getattr__(name: str) -> TypeAdapter:
+    if name not in _PAGE_ADAPTER_TYPES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    adapter = globals()[name] = TypeAdapter(_PAGE_ADAPTER_TYPES[name])
+    return adapter
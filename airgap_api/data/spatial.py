@@ -0,0 +1,201 @@
+import math
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from airgap_api.data.distance import EARTH_RADIUS_KILOMETERS, central_angle
+from airgap_api.data.models import AirportDataModel
+
+HALF_CIRCUMFERENCE_KILOMETERS = math.pi * EARTH_RADIUS_KILOMETERS
+# Number of query points, taken in latitude order, that the *_many queries match against one band of airports at a time.
+MANY_BLOCK_QUERIES = 256
+
+
+class SpatialMatches(NamedTuple):
+    airport_ids: list[str]
+    kilometers: np.ndarray
+
+
+class AirportSpatialIndex:
+    """Latitude/longitude grid over airport coordinates answering radius and k-nearest queries."""
+
+    def __init__(self, *, airport_ids, latitude, longitude, lookup: Callable[[str], AirportDataModel | None] | None = None, cell_degrees: float = 1.0) -> None:
+        self._airport_ids = np.asarray(airport_ids, dtype=object)
+        self._lookup = lookup
+        self._cell_degrees = cell_degrees
+        self._lat_cells = math.ceil(180 / cell_degrees)
+        self._lon_cells = math.ceil(360 / cell_degrees)
+        cells = self._cell_ids(np.asarray(latitude, dtype="f8"), np.asarray(longitude, dtype="f8"))
+        order = np.argsort(cells, kind="stable")
+        self._latitude = np.asarray(latitude, dtype="f8")[order]
+        self._longitude = np.asarray(longitude, dtype="f8")[order]
+        self._airport_ids = self._airport_ids[order]
+        self._cell_starts = np.searchsorted(cells[order], np.arange(self._lat_cells * self._lon_cells + 1))
+        self._unit_vectors = _unit_vectors(self._latitude, self._longitude)
+        self._by_latitude = np.argsort(self._latitude, kind="stable")
+        self._sorted_latitude = self._latitude[self._by_latitude]
+
+    @classmethod
+    def from_catalog(cls, *, catalog, cell_degrees: float = 1.0) -> "AirportSpatialIndex":
+        airport_ids = [airport_id.decode("ascii") for airport_id in catalog.rows["id"].tolist()]
+        return cls(
+            airport_ids=airport_ids,
+            latitude=catalog.latitude,
+            longitude=catalog.longitude,
+            lookup=lambda airport_id: catalog.get_by_id(airport_id=airport_id),
+            cell_degrees=cell_degrees,
+        )
+
+    @classmethod
+    def from_collection(cls, *, collection, cell_degrees: float = 1.0) -> "AirportSpatialIndex":
+        return cls(
+            airport_ids=collection.ids,
+            latitude=collection.latitude,
+            longitude=collection.longitude,
+            lookup=lambda airport_id: collection.get_by_id(airport_id=airport_id),
+            cell_degrees=cell_degrees,
+        )
+
+    @classmethod
+    def from_models(cls, *, airports: list[AirportDataModel], cell_degrees: float = 1.0) -> "AirportSpatialIndex":
+        by_id = {airport.id: airport for airport in airports}
+        return cls(
+            airport_ids=list(by_id),
+            latitude=[float(airport.attributes.latitude) for airport in by_id.values()],
+            longitude=[float(airport.attributes.longitude) for airport in by_id.values()],
+            lookup=by_id.get,
+            cell_degrees=cell_degrees,
+        )
+
+    def __len__(self) -> int:
+        return len(self._airport_ids)
+
+    def _lat_cell(self, latitude):
+        return np.clip(((np.asarray(latitude) + 90) // self._cell_degrees).astype(int), 0, self._lat_cells - 1)
+
+    def _lon_cell(self, longitude):
+        return (((np.asarray(longitude) + 180) % 360) // self._cell_degrees).astype(int) % self._lon_cells
+
+    def _cell_ids(self, latitude, longitude):
+        return self._lat_cell(latitude) * self._lon_cells + self._lon_cell(longitude)
+
+    def _candidate_rows(self, *, latitude: float, longitude: float, angle: float) -> np.ndarray:
+        angle_degrees = math.degrees(angle)
+        min_latitude, max_latitude = latitude - angle_degrees, latitude + angle_degrees
+        slices = []
+        if min_latitude <= -90 or max_latitude >= 90 or math.sin(angle) >= math.cos(math.radians(latitude)):
+            lon_ranges = [(0, self._lon_cells - 1)]
+        else:
+            half_width = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(latitude))))
+            if 2 * half_width >= 360 - self._cell_degrees:
+                lon_ranges = [(0, self._lon_cells - 1)]
+            else:
+                first, last = int(self._lon_cell(longitude - half_width)), int(self._lon_cell(longitude + half_width))
+                lon_ranges = [(first, last)] if first <= last else [(first, self._lon_cells - 1), (0, last)]
+        for lat_cell in range(int(self._lat_cell(max(min_latitude, -90))), int(self._lat_cell(min(max_latitude, 90))) + 1):
+            for first, last in lon_ranges:
+                start = self._cell_starts[lat_cell * self._lon_cells + first]
+                end = self._cell_starts[lat_cell * self._lon_cells + last + 1]
+                if end > start:
+                    slices.append(np.arange(start, end))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=int)
+
+    def _distances(self, *, rows: np.ndarray, latitude: float, longitude: float) -> np.ndarray:
+        angle = central_angle(from_latitude=latitude, from_longitude=longitude, to_latitude=self._latitude[rows], to_longitude=self._longitude[rows])
+        return EARTH_RADIUS_KILOMETERS * angle
+
+    def _matches(self, rows: np.ndarray, kilometers: np.ndarray) -> SpatialMatches:
+        order = np.argsort(kilometers, kind="stable")
+        return SpatialMatches(airport_ids=self._airport_ids[rows[order]].tolist(), kilometers=kilometers[order])
+
+    def within(self, *, latitude: float, longitude: float, radius_km: float) -> SpatialMatches:
+        angle = min(radius_km, HALF_CIRCUMFERENCE_KILOMETERS) / EARTH_RADIUS_KILOMETERS
+        rows = self._candidate_rows(latitude=latitude, longitude=longitude, angle=angle)
+        kilometers = self._distances(rows=rows, latitude=latitude, longitude=longitude)
+        inside = kilometers <= radius_km
+        return self._matches(rows[inside], kilometers[inside])
+
+    def nearest(self, *, latitude: float, longitude: float, k: int = 1) -> SpatialMatches:
+        k = min(k, len(self))
+        radius_km = 2 * self._cell_degrees * 111.2
+        while True:
+            angle = min(radius_km, HALF_CIRCUMFERENCE_KILOMETERS) / EARTH_RADIUS_KILOMETERS
+            rows = self._candidate_rows(latitude=latitude, longitude=longitude, angle=angle)
+            kilometers = self._distances(rows=rows, latitude=latitude, longitude=longitude)
+            # Every airport within the radius is a candidate, so once k fall inside it they are the k nearest overall.
+            if np.count_nonzero(kilometers <= radius_km) >= k or radius_km >= HALF_CIRCUMFERENCE_KILOMETERS:
+                break
+            radius_km *= 2
+        nearest = np.argpartition(kilometers, k - 1)[:k] if k else np.empty(0, dtype=int)
+        return self._matches(rows[nearest], kilometers[nearest])
+
+    def _query_blocks(self, *, latitudes: np.ndarray, longitudes: np.ndarray):
+        order = np.argsort(latitudes, kind="stable")
+        for start in range(0, len(order), MANY_BLOCK_QUERIES):
+            queries = order[start:start + MANY_BLOCK_QUERIES]
+            yield queries, latitudes[queries], longitudes[queries]
+
+    def _latitude_band(self, *, min_latitude: float, max_latitude: float) -> tuple[np.ndarray, float, float]:
+        start = int(np.searchsorted(self._sorted_latitude, min_latitude, side="left"))
+        end = int(np.searchsorted(self._sorted_latitude, max_latitude, side="right"))
+        # The bounds returned are the latitudes every airport outside the band lies beyond.
+        return self._by_latitude[start:end], -math.inf if start == 0 else min_latitude, math.inf if end == len(self) else max_latitude
+
+    def _similarity(self, *, latitude: np.ndarray, longitude: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        # Cosine of the central angle between every query point and every candidate airport, in one matrix product.
+        return _unit_vectors(latitude, longitude) @ self._unit_vectors[rows].T
+
+    def _grouped_matches(self, *, latitudes: np.ndarray, longitudes: np.ndarray, queries: list[np.ndarray], rows: list[np.ndarray], radius_km: float | None = None) -> list[SpatialMatches]:
+        queries, rows = np.concatenate([np.empty(0, dtype=int), *queries]), np.concatenate([np.empty(0, dtype=int), *rows])
+        kilometers = EARTH_RADIUS_KILOMETERS * central_angle(from_latitude=latitudes[queries], from_longitude=longitudes[queries], to_latitude=self._latitude[rows], to_longitude=self._longitude[rows])
+        if radius_km is not None:
+            inside = kilometers <= radius_km
+            queries, rows, kilometers = queries[inside], rows[inside], kilometers[inside]
+        order = np.lexsort((kilometers, queries))
+        queries, airport_ids, kilometers = queries[order], self._airport_ids[rows[order]], kilometers[order]
+        bounds = np.searchsorted(queries, np.arange(len(latitudes) + 1))
+        return [SpatialMatches(airport_ids=airport_ids[start:end].tolist(), kilometers=kilometers[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def within_many(self, *, latitudes, longitudes, radius_km: float) -> list[SpatialMatches]:
+        latitudes, longitudes = np.asarray(latitudes, dtype="f8"), np.asarray(longitudes, dtype="f8")
+        angle = min(radius_km, HALF_CIRCUMFERENCE_KILOMETERS) / EARTH_RADIUS_KILOMETERS
+        # The slack keeps airports on the radius as candidates; the haversine distance decides whether they are inside.
+        min_similarity = math.cos(angle) - 1e-9
+        found_queries, found_rows = [], []
+        for queries, latitude, longitude in self._query_blocks(latitudes=latitudes, longitudes=longitudes):
+            rows, _, _ = self._latitude_band(min_latitude=latitude[0] - math.degrees(angle), max_latitude=latitude[-1] + math.degrees(angle))
+            block_queries, block_rows = np.nonzero(self._similarity(latitude=latitude, longitude=longitude, rows=rows) >= min_similarity)
+            found_queries.append(queries[block_queries])
+            found_rows.append(rows[block_rows])
+        return self._grouped_matches(latitudes=latitudes, longitudes=longitudes, queries=found_queries, rows=found_rows, radius_km=radius_km)
+
+    def nearest_many(self, *, latitudes, longitudes, k: int = 1) -> list[SpatialMatches]:
+        latitudes, longitudes = np.asarray(latitudes, dtype="f8"), np.asarray(longitudes, dtype="f8")
+        k = min(k, len(self))
+        found_queries, found_rows = [], []
+        for queries, latitude, longitude in self._query_blocks(latitudes=latitudes, longitudes=longitudes) if k else ():
+            margin = 2 * self._cell_degrees
+            while len(queries):
+                rows, lower, upper = self._latitude_band(min_latitude=latitude[0] - margin, max_latitude=latitude[-1] + margin)
+                margin *= 2
+                if len(rows) < k:
+                    continue
+                nearest = rows[np.argpartition(-self._similarity(latitude=latitude, longitude=longitude, rows=rows), k - 1, axis=1)[:, :k]]
+                furthest = np.degrees(central_angle(from_latitude=latitude[:, None], from_longitude=longitude[:, None], to_latitude=self._latitude[nearest], to_longitude=self._longitude[nearest])).max(axis=1)
+                # Airports outside the band are further away than its edge in latitude alone, so nearer matches are final.
+                settled = (furthest <= latitude - lower) & (furthest <= upper - latitude)
+                found_queries.append(np.repeat(queries[settled], k))
+                found_rows.append(nearest[settled].ravel())
+                queries, latitude, longitude = queries[~settled], latitude[~settled], longitude[~settled]
+        return self._grouped_matches(latitudes=latitudes, longitudes=longitudes, queries=found_queries, rows=found_rows)
+
+    def to_models(self, matches: SpatialMatches) -> list[AirportDataModel]:
+        if self._lookup is None:
+            raise ValueError("Spatial index was built without an airport lookup")
+        return [self._lookup(airport_id) for airport_id in matches.airport_ids]
+
+
+def _unit_vectors(latitude, longitude) -> np.ndarray:
+    latitude, longitude = np.radians(latitude), np.radians(longitude)
+    cos_latitude = np.cos(latitude)
+    return np.column_stack((cos_latitude * np.cos(longitude), cos_latitude * np.sin(longitude), np.sin(latitude)))
@@ -0,0 +1,279 @@
+import http
+import itertools
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from airgap_api.api.api_client import RateLimitReachedError
+from airgap_api.api.instrumentation import HistogramAggregator, Instrumentation, LatencyHistogram
+
+DEFAULT_MIX = {"get_by_id": 70.0, "get_page": 20.0, "favorites": 10.0}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for entry in value.split(","):
+        name, separator, weight = entry.strip().partition("=")
+        if not separator:
+            raise ValueError(f"Workload mix entries are name=weight, got {entry!r}")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {sorted(OPERATIONS)}")
+        mix[name] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The workload mix needs at least one operation with a positive weight")
+    return mix
+
+
+class Workload:
+    """The operations of the load test, each returning the responses of the requests it sent."""
+
+    def __init__(self, *, client, airport_ids: list[str], page_count: int, seed: int | None = None) -> None:
+        self.client = client
+        self.airport_ids = airport_ids
+        self.page_count = page_count
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Concurrent favorites cycles each take an airport of their own, as an account cannot favorite one twice.
+        self._favorite_airports = queue.SimpleQueue()
+        for airport_id in airport_ids:
+            self._favorite_airports.put(airport_id)
+
+    def _choice(self, values):
+        with self._lock:
+            return self._random.choice(values)
+
+    def get_by_id(self) -> list:
+        return [self.client.airports.get_by_id(airport_id=self._choice(self.airport_ids))]
+
+    def get_page(self) -> list:
+        return [self.client.airports.get(page=self._choice(range(1, self.page_count + 1)))]
+
+    def distance(self) -> list:
+        return [self.client.airports.distance(from_id=self._choice(self.airport_ids), to_id=self._choice(self.airport_ids))]
+
+    def favorites(self) -> list:
+        airport_id = self._favorite_airports.get()
+        try:
+            responses = [self.client.favorites.add(airport_id=airport_id, note="load test")]
+            if responses[0].status_code != http.HTTPStatus.CREATED:
+                return responses
+            favorite_id = responses[0].json()["data"]["id"]
+            responses.append(self.client.favorites.update_note(fav_id=favorite_id, note="load test updated"))
+            responses.append(self.client.favorites.get_by_id(fav_id=favorite_id))
+            responses.append(self.client.favorites.remove(fav_id=favorite_id))
+            return responses
+        finally:
+            self._favorite_airports.put(airport_id)
+
+
+OPERATIONS: dict[str, Callable[[Workload], list]] = {
+    "get_by_id": Workload.get_by_id,
+    "get_page": Workload.get_page,
+    "distance": Workload.distance,
+    "favorites": Workload.favorites,
+}
+
+
+@dataclass
+class OperationStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    corrected_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    rate_limited: int = 0
+
+    def summary(self, *, elapsed: float) -> dict:
+        count = self.latency.count
+        return {
+            "count": count,
+            "throughput": count / elapsed if elapsed else 0.0,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "rate_limited": self.rate_limited,
+            "rate_limited_rate": self.rate_limited / count if count else 0.0,
+            "latency": self.latency.summary(),
+            "corrected_latency": self.corrected_latency.summary(),
+        }
+
+
+class LoadRun:
+    def __init__(self, *, workload: Workload, mix: dict[str, float], aggregator: HistogramAggregator, seed: int | None = None) -> None:
+        self.workload = workload
+        self.mix = mix
+        self.aggregator = aggregator
+        self.stats = {name: OperationStats() for name in mix}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_operation(self) -> str:
+        with self._lock:
+            return self._random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+
+    def execute(self, name: str, *, intended: float | None = None) -> None:
+        started = time.perf_counter()
+        intended = started if intended is None else intended
+        error = rate_limited = False
+        try:
+            responses = OPERATIONS[name](self.workload)
+            error = any(response.status_code >= 400 for response in responses)
+            rate_limited = any(response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS for response in responses)
+        except RateLimitReachedError:
+            error = rate_limited = True
+        except Exception as exception:
+            logger.debug(f"{name} failed: {type(exception).__name__}: {exception}")
+            error = True
+        finished = time.perf_counter()
+        stats = self.stats[name]
+        with self._lock:
+            stats.latency.record(finished - started)
+            # Measured from when the operation was due, so time spent queued behind slow requests is not hidden.
+            stats.corrected_latency.record(finished - intended)
+            stats.errors += error
+            stats.rate_limited += rate_limited
+
+    def run_closed(self, *, concurrency: int, duration: float) -> float:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        def worker():
+            while time.perf_counter() < deadline:
+                self.execute(self.next_operation())
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        return time.perf_counter() - started
+
+    def run_open(self, *, rps: float, concurrency: int, duration: float) -> float:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for number in itertools.count():
+                intended = started + number / rps
+                if intended >= started + duration:
+                    break
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self.execute, self.next_operation(), intended=intended)
+        return time.perf_counter() - started
+
+    def results(self, *, elapsed: float) -> dict:
+        operations = {name: stats.summary(elapsed=elapsed) for name, stats in self.stats.items()}
+        endpoints = {}
+        for key, summary in self.aggregator.percentiles().items():
+            status_codes = self.aggregator.status_codes[key]
+            count = sum(status_codes.values())
+            errors = sum(number for status_code, number in status_codes.items() if status_code >= 400)
+            endpoints[key] = {
+                "count": count,
+                "throughput": count / elapsed if elapsed else 0.0,
+                "status_codes": {str(status_code): number for status_code, number in sorted(status_codes.items())},
+                "error_rate": errors / count if count else 0.0,
+                "rate_limited_rate": status_codes.get(http.HTTPStatus.TOO_MANY_REQUESTS, 0) / count if count else 0.0,
+                "latency": summary,
+            }
+        completed = sum(operation["count"] for operation in operations.values())
+        return {
+            "elapsed": elapsed,
+            "operations_completed": completed,
+            "throughput": completed / elapsed if elapsed else 0.0,
+            "operations": operations,
+            "endpoints": endpoints,
+        }
+
+
+def run_load(*, client, mix: dict[str, float], duration: float, rps: float | None = None, concurrency: int = 10, seed: int | None = None) -> dict:
+    """Drives the workload mix for duration seconds, at a fixed arrival rate when rps is set, otherwise with concurrency back-to-back workers."""
+    first_page = client.airports.get(page=1)
+    first_page.raise_for_status()
+    airport_ids = [airport["id"] for airport in first_page.json()["data"]]
+    page_count = client.page_count(response_json=first_page.json()) or 1
+    # Added after the setup request, so only the measured run is aggregated.
+    aggregator = HistogramAggregator()
+    client.instrumentation.add_sink(aggregator)
+    run = LoadRun(workload=Workload(client=client, airport_ids=airport_ids, page_count=page_count, seed=seed), mix=mix, aggregator=aggregator, seed=seed)
+    if rps:
+        elapsed = run.run_open(rps=rps, concurrency=concurrency, duration=duration)
+    else:
+        elapsed = run.run_closed(concurrency=concurrency, duration=duration)
+    results = run.results(elapsed=elapsed)
+    if client.hedging is not None:
+        results["hedging"] = client.hedging.stats.snapshot()
+    results["config"] = {"mix": mix, "duration": duration, "rps": rps, "concurrency": concurrency, "seed": seed}
+    return results
+
+
+def _log_results(results: dict) -> None:
+    logger.info(f"{results['operations_completed']} operations in {results['elapsed']:.1f}s ({results['throughput']:.1f} ops/s)")
+    for name, operation in results["operations"].items():
+        latency, corrected = operation["latency"], operation["corrected_latency"]
+        logger.info(
+            f"{name:<12} {operation['throughput']:>8.1f} ops/s  errors {operation['error_rate']:>6.1%}  429 {operation['rate_limited_rate']:>6.1%}"
+            f"  p50 {latency['p50'] * 1e3:>8.1f}ms  p99 {latency['p99'] * 1e3:>8.1f}ms  corrected p99 {corrected['p99'] * 1e3:>8.1f}ms"
+        )
+    for key, endpoint in results["endpoints"].items():
+        latency = endpoint["latency"]
+        logger.info(f"{key:<28} {endpoint['throughput']:>8.1f} req/s  errors {endpoint['error_rate']:>6.1%}  429 {endpoint['rate_limited_rate']:>6.1%}  p50 {latency['p50'] * 1e3:>8.1f}ms  p99 {latency['p99'] * 1e3:>8.1f}ms")
+    if hedging := results.get("hedging"):
+        logger.info(f"hedges fired for {hedging['fire_rate']:.1%} of {hedging['requests']} requests and won {hedging['win_rate']:.1%} of the time, {hedging['skipped']} skipped for rate budget")
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from airgap_api.api.airportgap_api_client import AIRPORT_GAP_BASE_URL, AirportGapAPIClient
+    from airgap_api.api.hedging import HedgePolicy
+    from airgap_api.api.token_manager import Credentials, TokenManager
+    from airgap_api.api.transport import TransportConfig
+    from airgap_api.stand_in import StandInServer
+    from airgap_api.stand_in.server import DEFAULT_EMAIL, DEFAULT_PASSWORD
+
+    parser = argparse.ArgumentParser(description="Drive a workload mix against the Airport Gap API and report throughput and latency.")
+    parser.add_argument("--base-url", default=AIRPORT_GAP_BASE_URL)
+    parser.add_argument("--stand-in", action="store_true", help="Run against a local stand-in server instead of --base-url.")
+    parser.add_argument("--stand-in-latency", type=float, default=0.0, help="Seconds the stand-in waits before answering.")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Operation weights, e.g. get_by_id=70,get_page=20,favorites=10.")
+    parser.add_argument("--rps", type=float, help="Target operations per second; without it every worker runs operations back to back.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Number of worker threads.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for.")
+    parser.add_argument("--hedge-percentile", type=float, help="Hedge airport GETs that outlast this latency percentile of their endpoint.")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    # A pool per worker thread, so connections are not the bottleneck being measured.
+    transport = TransportConfig(pool_maxsize=args.concurrency)
+    server = StandInServer(latency=args.stand_in_latency).start() if args.stand_in else None
+    try:
+        if server is not None:
+            server.register(email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD)
+            token_manager = TokenManager(accounts=[Credentials(email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD)])
+        else:
+            token_manager = TokenManager.from_env() if "favorites" in args.mix else None
+        client = AirportGapAPIClient(base_url=server.base_url if server is not None else args.base_url, instrumentation=Instrumentation(sinks=[]), transport=transport, token_manager=token_manager, hedging=HedgePolicy(percentile=args.hedge_percentile) if args.hedge_percentile else None)
+        with client:
+            if token_manager is not None:
+                token_manager.bind(client)
+            results = run_load(client=client, mix=args.mix, duration=args.duration, rps=args.rps, concurrency=args.concurrency, seed=args.seed)
+    finally:
+        if server is not None:
+            server.stop()
+    _log_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        logger.info(f"Wrote results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from airgap_api.stand_in.server import StandInServer
+
+
+__all__ = ["StandInServer"]
@@ -0,0 +1,77 @@
+import itertools
+import math
+import random
+import string
+
+from airgap_api.data import Airports
+
+TIMEZONES = ["Europe/London", "America/New_York", "Asia/Tokyo", "Australia/Sydney", "Pacific/Port_Moresby", None]
+COUNTRIES = ["United Kingdom", "United States", "Japan", "Australia", "Papua New Guinea", "Canada"]
+
+# Distances recorded from the live airports/distance endpoint, served as they are for the fixture airports.
+REFERENCE_DISTANCES = {
+    frozenset({str(Airports.MAG.id), str(Airports.CYG.id)}): {"kilometers": 3451.0132605573453, "miles": 2142.86743976846, "nautical_miles": 1862.1000015367488},
+}
+# The live endpoint's radii, deliberately not imported from airgap_api.data.distance, so the stand-in checks the engine
+# against a calculation of its own rather than against itself.
+EARTH_RADIUS_KILOMETERS = 6371.0
+EARTH_RADIUS_MILES = 3956.0
+MILES_PER_NAUTICAL_MILE = 1.15078
+
+
+def fixture_airports() -> list[dict]:
+    return [Airports.MAG.model_dump(), Airports.CYG.model_dump()]
+
+
+def generate_airports(*, count: int, seed: int = 0) -> list[dict]:
+    """Deterministic airport records, starting with the fixture airports used by the tests."""
+    rng = random.Random(seed)
+    airports = fixture_airports()[:count]
+    taken = {airport["id"] for airport in airports}
+    codes = ("".join(letters) for letters in itertools.product(string.ascii_uppercase, repeat=3))
+    for code in codes:
+        if len(airports) >= count:
+            break
+        if code in taken:
+            continue
+        airports.append({
+            "id": code,
+            "type": "airport",
+            "attributes": {
+                "name": f"{code.title()} Airport",
+                "city": rng.choice([f"{code.title()} City", None]),
+                "country": rng.choice(COUNTRIES),
+                "iata": code,
+                "icao": f"Z{code}",
+                "latitude": f"{rng.uniform(-89, 89):.6f}",
+                "longitude": f"{rng.uniform(-180, 180):.6f}",
+                "altitude": rng.randint(-100, 9000),
+                "timezone": rng.choice(TIMEZONES),
+            }
+        })
+    return airports
+
+
+def great_circle_angle(*, from_latitude: float, from_longitude: float, to_latitude: float, to_longitude: float) -> float:
+    from_latitude, to_latitude = math.radians(from_latitude), math.radians(to_latitude)
+    haversine = math.sin((to_latitude - from_latitude) / 2) ** 2 + math.cos(from_latitude) * math.cos(to_latitude) * math.sin(math.radians(to_longitude - from_longitude) / 2) ** 2
+    return 2 * math.asin(min(1.0, math.sqrt(haversine)))
+
+
+def distance_attributes(*, from_airport: dict, from_number: int, to_airport: dict, to_number: int) -> dict:
+    from_attributes, to_attributes = from_airport["attributes"], to_airport["attributes"]
+    distances = REFERENCE_DISTANCES.get(frozenset({str(from_airport["id"]), str(to_airport["id"])}))
+    if distances is None:
+        angle = great_circle_angle(
+            from_latitude=float(from_attributes["latitude"]),
+            from_longitude=float(from_attributes["longitude"]),
+            to_latitude=float(to_attributes["latitude"]),
+            to_longitude=float(to_attributes["longitude"]),
+        )
+        miles = EARTH_RADIUS_MILES * angle
+        distances = {"kilometers": EARTH_RADIUS_KILOMETERS * angle, "miles": miles, "nautical_miles": miles / MILES_PER_NAUTICAL_MILE}
+    return {
+        "from_airport": dict(from_attributes, id=from_number),
+        "to_airport": dict(to_attributes, id=to_number),
+        **distances,
+    }
@@ -0,0 +1,299 @@
+import hashlib
+import http
+import json
+import itertools
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from airgap_api.stand_in.data import distance_attributes, generate_airports
+
+API_PREFIX = "/api/"
+DEFAULT_EMAIL = "stand-in@airportgap.test"
+DEFAULT_PASSWORD = "stand-in-password"
+NOT_FOUND = {"status": "404", "title": "Not Found", "detail": "The page you requested could not be found"}
+UNAUTHORISED = {"status": "401", "title": "Unauthorised", "detail": "You are not authorized to perform the requested action."}
+TOO_MANY_REQUESTS = {"status": "429", "title": "Too Many Requests", "detail": "Rate limit exceeded, please try again later."}
+
+
+def error_body(*errors: dict) -> dict:
+    return {"errors": list(errors)}
+
+
+class StandInResponse:
+    def __init__(self, status: int, body: dict | None = None, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+class StandInServer:
+    """In-process stand-in for the Airport Gap API, served from a background thread."""
+
+    def __init__(
+        self,
+        *,
+        airports: list[dict] | None = None,
+        airport_count: int = 1000,
+        page_size: int = 30,
+        accounts: dict[str, str] | None = None,
+        latency: float = 0.0,
+        slow_every: int = 0,
+        slow_latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ) -> None:
+        self.airports = airports if airports is not None else generate_airports(count=airport_count)
+        self.airports_by_id = {airport["id"]: airport for airport in self.airports}
+        self.airport_numbers = {airport["id"]: number for number, airport in enumerate(self.airports, start=1)}
+        self.page_size = page_size
+        self.latency = latency
+        self.slow_every = slow_every
+        self.slow_latency = slow_latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.accounts: dict[str, str] = {}
+        self.tokens: dict[str, str] = {}
+        self.favorites: dict[str, dict[int, dict]] = {}
+        self._favorite_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        for email, password in (accounts if accounts is not None else {DEFAULT_EMAIL: DEFAULT_PASSWORD}).items():
+            self.register(email=email, password=password)
+        self._httpd = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self._thread: threading.Thread | None = None
+        self.routes = [
+            ("GET", re.compile(r"^airports$"), self.get_airports),
+            ("POST", re.compile(r"^airports/distance$"), self.post_distance),
+            ("GET", re.compile(r"^airports/(?P<airport_id>[^/]+)$"), self.get_airport),
+            ("POST", re.compile(r"^tokens$"), self.post_tokens),
+            ("GET", re.compile(r"^favorites$"), self.get_favorites),
+            ("POST", re.compile(r"^favorites$"), self.post_favorite),
+            ("DELETE", re.compile(r"^favorites/clear_all$"), self.delete_all_favorites),
+            ("GET", re.compile(r"^favorites/(?P<fav_id>[^/]+)$"), self.get_favorite),
+            ("PATCH", re.compile(r"^favorites/(?P<fav_id>[^/]+)$"), self.patch_favorite),
+            ("DELETE", re.compile(r"^favorites/(?P<fav_id>[^/]+)$"), self.delete_favorite),
+        ]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="airgap-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def token_for(*, email: str, password: str) -> str:
+        return hashlib.sha256(f"{email}:{password}".encode()).hexdigest()[:24]
+
+    def register(self, *, email: str, password: str) -> str:
+        token = self.token_for(email=email, password=password)
+        with self._lock:
+            self.accounts[email] = password
+            self.tokens[token] = email
+            self.favorites.setdefault(token, {})
+        return token
+
+    def dispatch(self, *, method: str, path: str, query: dict[str, list[str]], headers, body: dict | None) -> StandInResponse:
+        with self._lock:
+            self.request_count += 1
+            request_number = self.request_count
+        if self.latency:
+            time.sleep(self.latency)
+        if self.slow_every and request_number % self.slow_every == 0:
+            time.sleep(self.slow_latency)
+        if self.rate_limit_every and request_number % self.rate_limit_every == 0:
+            return StandInResponse(http.HTTPStatus.TOO_MANY_REQUESTS, error_body(TOO_MANY_REQUESTS), headers={"Retry-After": f"{self.retry_after:g}"})
+        endpoint = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+        for route_method, pattern, handler in self.routes:
+            if route_method == method and (match := pattern.match(endpoint.strip("/"))):
+                return handler(query=query, headers=headers, body=body, **match.groupdict())
+        return StandInResponse(http.HTTPStatus.NOT_FOUND, error_body(NOT_FOUND))
+
+    def page_url(self, *, endpoint: str, page: int | None = None) -> str:
+        return f"{self.base_url}{endpoint}" + (f"?page={page}" if page is not None else "")
+
+    def paged(self, *, endpoint: str, items: list[dict], query: dict[str, list[str]]) -> StandInResponse:
+        try:
+            page = max(int(query.get("page", ["1"])[0]), 1)
+        except ValueError:
+            page = 1
+        last_page = max(math.ceil(len(items) / self.page_size), 1)
+        data = items[(page - 1) * self.page_size:page * self.page_size]
+        links = {
+            "first": self.page_url(endpoint=endpoint, page=1),
+            "self": self.page_url(endpoint=endpoint, page=page),
+            "last": self.page_url(endpoint=endpoint, page=last_page),
+            "prev": self.page_url(endpoint=endpoint, page=page - 1) if page > 1 else None,
+            "next": self.page_url(endpoint=endpoint, page=page + 1) if page < last_page else None,
+        }
+        return StandInResponse(http.HTTPStatus.OK, {"data": data, "links": links})
+
+    def get_airports(self, *, query, **kwargs) -> StandInResponse:
+        return self.paged(endpoint="airports", items=self.airports, query=query)
+
+    def get_airport(self, *, airport_id: str, **kwargs) -> StandInResponse:
+        airport = self.airports_by_id.get(airport_id)
+        if airport is None:
+            return StandInResponse(http.HTTPStatus.NOT_FOUND, error_body(NOT_FOUND))
+        return StandInResponse(http.HTTPStatus.OK, {"data": airport})
+
+    def post_distance(self, *, body, **kwargs) -> StandInResponse:
+        body = body or {}
+        from_airport, to_airport = self.airports_by_id.get(body.get("from")), self.airports_by_id.get(body.get("to"))
+        if from_airport is None or to_airport is None:
+            return StandInResponse(http.HTTPStatus.UNPROCESSABLE_ENTITY, error_body({"status": "422", "title": "Unable to process request", "detail": "Please enter valid 'from' and 'to' airports."}))
+        attributes = distance_attributes(
+            from_airport=from_airport,
+            from_number=self.airport_numbers[from_airport["id"]],
+            to_airport=to_airport,
+            to_number=self.airport_numbers[to_airport["id"]],
+        )
+        return StandInResponse(http.HTTPStatus.OK, {"data": {"id": f"{from_airport['id']}-{to_airport['id']}", "type": "airport_distance", "attributes": attributes}})
+
+    def post_tokens(self, *, body, **kwargs) -> StandInResponse:
+        body = body or {}
+        email, password = body.get("email"), body.get("password")
+        if email not in self.accounts or self.accounts[email] != password:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        return StandInResponse(http.HTTPStatus.OK, {"token": self.token_for(email=email, password=password)})
+
+    def _authorised_favorites(self, headers) -> dict[int, dict] | None:
+        authorization = headers.get("Authorization") or ""
+        token = authorization.removeprefix("Bearer ").removeprefix("token=").strip()
+        return self.favorites.get(token) if token in self.tokens else None
+
+    def _favorite(self, *, favorite_id: int, airport_id: str, note: str) -> dict:
+        airport = self.airports_by_id[airport_id]
+        return {
+            "id": str(favorite_id),
+            "type": "favorite",
+            "attributes": {
+                "airport": dict(airport["attributes"], id=self.airport_numbers[airport_id]),
+                "note": note,
+            }
+        }
+
+    @staticmethod
+    def _favorite_id(fav_id: str) -> int | None:
+        return int(fav_id) if fav_id.isdigit() else None
+
+    def get_favorites(self, *, headers, query, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        with self._lock:
+            items = list(favorites.values())
+        return self.paged(endpoint="favorites", items=items, query=query)
+
+    def get_favorite(self, *, headers, fav_id: str, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        favorite = favorites.get(self._favorite_id(fav_id))
+        if favorite is None:
+            return StandInResponse(http.HTTPStatus.NOT_FOUND, error_body(NOT_FOUND))
+        return StandInResponse(http.HTTPStatus.OK, {"data": favorite})
+
+    def post_favorite(self, *, headers, body, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        body = body or {}
+        airport_id = body.get("airport_id")
+        if airport_id not in self.airports_by_id:
+            return StandInResponse(http.HTTPStatus.UNPROCESSABLE_ENTITY, error_body({"status": "422", "title": "Unprocessable Entity", "detail": "Airport must exist"}))
+        with self._lock:
+            if any(favorite["attributes"]["airport"]["iata"] == airport_id for favorite in favorites.values()):
+                return StandInResponse(http.HTTPStatus.UNPROCESSABLE_ENTITY, error_body({"status": "422", "title": "Unprocessable Entity", "detail": "Airport has already been taken"}))
+            favorite_id = next(self._favorite_ids)
+            favorites[favorite_id] = self._favorite(favorite_id=favorite_id, airport_id=airport_id, note=body.get("note") or "")
+        return StandInResponse(http.HTTPStatus.CREATED, {"data": favorites[favorite_id]})
+
+    def patch_favorite(self, *, headers, body, fav_id: str, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        with self._lock:
+            favorite = favorites.get(self._favorite_id(fav_id))
+            if favorite is None:
+                return StandInResponse(http.HTTPStatus.NOT_FOUND, error_body(NOT_FOUND))
+            favorite["attributes"]["note"] = (body or {}).get("note") or ""
+        return StandInResponse(http.HTTPStatus.OK, {"data": favorite})
+
+    def delete_favorite(self, *, headers, fav_id: str, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        with self._lock:
+            if favorites.pop(self._favorite_id(fav_id), None) is None:
+                return StandInResponse(http.HTTPStatus.NOT_FOUND, error_body(NOT_FOUND))
+        return StandInResponse(http.HTTPStatus.NO_CONTENT)
+
+    def delete_all_favorites(self, *, headers, **kwargs) -> StandInResponse:
+        favorites = self._authorised_favorites(headers)
+        if favorites is None:
+            return StandInResponse(http.HTTPStatus.UNAUTHORIZED, error_body(UNAUTHORISED))
+        with self._lock:
+            favorites.clear()
+        return StandInResponse(http.HTTPStatus.NO_CONTENT)
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _handle(self) -> None:
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except json.JSONDecodeError:
+            body = None
+        response = self.server.stand_in.dispatch(method=self.command, path=parsed.path, query=parse_qs(parsed.query), headers=self.headers, body=body)
+        payload = json.dumps(response.body).encode() if response.body is not None else b""
+        headers = dict(response.headers)
+        if payload:
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
+            etag = f'W/"{hashlib.sha1(payload).hexdigest()}"'
+            headers["ETag"] = etag
+            if response.status == http.HTTPStatus.OK and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+                response.status, payload = http.HTTPStatus.NOT_MODIFIED, b""
+        self.send_response(response.status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        if self.close_connection:
+            # Tell the client the connection is not reusable rather than closing it under the pool.
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
@@ -0,0 +1,7 @@
+import hashlib
+import json
+
+
+def page_digest(*, records: list[dict]) -> str:
+    """SHA-256 of a page of records in canonical JSON, so equal pages hash equally whatever their key order."""
+    return hashlib.sha256(json.dumps(records, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
@@ -0,0 +1,35 @@
+import fcntl
+import os
+from pathlib import Path
+
+
+class FileLock:
+    """Exclusive advisory lock shared between processes, e.g. pytest-xdist workers."""
+
+    def __init__(self, *, path: str | os.PathLike) -> None:
+        self._path = Path(path)
+        self._fd: int | None = None
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from airgap_api.api.instrumentation import LatencyHistogram
+from airgap_api.stand_in import StandInServer
+from benchmarks.cases import BenchmarkCase, client_cases, spatial_cases, startup_cases
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def run_case(case: BenchmarkCase, *, scale: float = 1.0) -> dict[str, float]:
+    iterations = max(int(case.iterations * scale), 1)
+    for _ in range(max(iterations // 10, 1)):
+        case.operation()
+    histogram = LatencyHistogram()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        batch_started = time.perf_counter()
+        for _ in range(case.batch):
+            case.operation()
+        histogram.record((time.perf_counter() - batch_started) / case.batch)
+    total = time.perf_counter() - started
+    summary = histogram.summary()
+    return {
+        "iterations": iterations * case.batch,
+        "ops_per_second": iterations * case.batch / total,
+        "p50": summary["p50"],
+        "p95": summary["p95"],
+        "p99": summary["p99"],
+    }
+
+
+def regressions(*, results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result["p50"] > baseline[name]["p50"] * threshold:
+            failures.append(f"{name}: p50 {result['p50'] * 1e6:.1f}us exceeds baseline {baseline[name]['p50'] * 1e6:.1f}us x {threshold}")
+        if result["ops_per_second"] < baseline[name]["ops_per_second"] / threshold:
+            failures.append(f"{name}: {result['ops_per_second']:.0f} ops/s below baseline {baseline[name]['ops_per_second']:.0f} ops/s / {threshold}")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Airport Gap API client against a local stand-in server.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Allowed slowdown factor against the baseline.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the number of iterations of every case.")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO", filter=lambda record: not record["name"].startswith("airgap_api"))
+    results = {}
+    with StandInServer() as server:
+        for case in [*client_cases(server=server), *spatial_cases(), *startup_cases()]:
+            if args.filter not in case.name:
+                continue
+            results[case.name] = run_case(case, scale=args.scale)
+            result = results[case.name]
+            logger.info(f"{case.name:<24} {result['ops_per_second']:>12.1f} ops/s  p50 {result['p50'] * 1e6:>10.1f}us  p95 {result['p95'] * 1e6:>10.1f}us  p99 {result['p99'] * 1e6:>10.1f}us")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        logger.info(f"Saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        logger.warning(f"No baseline found at {args.baseline}")
+        return 0
+    failures = regressions(results=results, baseline=json.loads(args.baseline.read_text()), threshold=args.threshold)
+    for failure in failures:
+        logger.error(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import json
+import itertools
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.api_client import BaseAPIClient
+from airgap_api.data import AirportDataPageResponse
+from airgap_api.data.models import AirportPageResponse
+from airgap_api.data.spatial import AirportSpatialIndex
+from airgap_api.stand_in import StandInServer
+from airgap_api.stand_in.data import generate_airports
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    operation: Callable[[], object]
+    iterations: int
+    batch: int = 1
+
+
+def client_cases(*, server: StandInServer) -> list[BenchmarkCase]:
+    client = AirportGapAPIClient(base_url=server.base_url)
+    page_url = f"{server.base_url}airports?page=7"
+    page_content = client.airports.get(page=1).content
+    page_data = json.loads(page_content)["data"]
+    token = server.register(email="benchmark@airportgap.test", password="benchmark")
+    favorite_ids = [airport["id"] for airport in server.airports[:100]]
+    # Successive syncs alternate between two states that differ in the notes of ten favorites.
+    desired_states = itertools.cycle([
+        {airport_id: "benchmark" for airport_id in favorite_ids},
+        {airport_id: "changed" if index < 10 else "benchmark" for index, airport_id in enumerate(favorite_ids)},
+    ])
+
+    def clear_and_add():
+        client.favorites.remove_all(token=token)
+        for airport_id in favorite_ids:
+            client.favorites.add(airport_id=airport_id, note="benchmark", token=token)
+
+    return [
+        BenchmarkCase(name="make_url", operation=lambda: client.make_url(url="airports/MAG"), iterations=200, batch=100),
+        BenchmarkCase(name="include_page_param", operation=lambda: BaseAPIClient.include_page_param(parameters=None, page=3), iterations=200, batch=100),
+        BenchmarkCase(name="extract_parameter_value", operation=lambda: BaseAPIClient.extract_parameter_value(url=page_url, parameter_name="page"), iterations=200, batch=100),
+        BenchmarkCase(name="validate_airport_page", operation=lambda: AirportDataPageResponse.validate_python(page_data), iterations=200, batch=10),
+        BenchmarkCase(name="parse_airport_page_dict", operation=lambda: AirportDataPageResponse.validate_python(json.loads(page_content)["data"]), iterations=200, batch=10),
+        BenchmarkCase(name="parse_airport_page_json", operation=lambda: AirportPageResponse.parse(page_content), iterations=200, batch=10),
+        BenchmarkCase(name="get_airport", operation=lambda: client.get(url="airports/MAG"), iterations=300),
+        BenchmarkCase(name="post_distance", operation=lambda: client.post(url="airports/distance", json={"from": "MAG", "to": "CYG"}), iterations=300),
+        BenchmarkCase(name="favorites_sync", operation=lambda: client.favorites.sync(desired=next(desired_states), token=token), iterations=10),
+        BenchmarkCase(name="favorites_clear_and_add", operation=clear_and_add, iterations=10),
+        BenchmarkCase(name="get_all_pages", operation=lambda: sum(len(page) for page in client.get_all_pages(url="airports")), iterations=10),
+    ]
+
+
+def spatial_cases() -> list[BenchmarkCase]:
+    airports = generate_airports(count=5000)
+    index = AirportSpatialIndex(
+        airport_ids=[airport["id"] for airport in airports],
+        latitude=[float(airport["attributes"]["latitude"]) for airport in airports],
+        longitude=[float(airport["attributes"]["longitude"]) for airport in airports],
+    )
+    rng = np.random.default_rng(0)
+    latitudes, longitudes = rng.uniform(-90, 90, 10_000), rng.uniform(-180, 180, 10_000)
+    # The *_loop cases answer the same 10k points one query at a time, for comparison with the bulk queries.
+    return [
+        BenchmarkCase(name="spatial_within_many_10k", operation=lambda: index.within_many(latitudes=latitudes, longitudes=longitudes, radius_km=500), iterations=5),
+        BenchmarkCase(name="spatial_within_loop_10k", operation=lambda: [index.within(latitude=latitude, longitude=longitude, radius_km=500) for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist())], iterations=5),
+        BenchmarkCase(name="spatial_nearest_many_10k", operation=lambda: index.nearest_many(latitudes=latitudes, longitudes=longitudes, k=5), iterations=5),
+        BenchmarkCase(name="spatial_nearest_loop_10k", operation=lambda: [index.nearest(latitude=latitude, longitude=longitude, k=5) for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist())], iterations=5),
+    ]
+
+
+def import_module(module: str) -> None:
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+
+
+def startup_cases() -> list[BenchmarkCase]:
+    # Each operation starts a fresh interpreter, so these measure interpreter startup plus the import.
+    return [
+        BenchmarkCase(name="startup_interpreter", operation=lambda: import_module("sys"), iterations=10),
+        BenchmarkCase(name="startup_import_data", operation=lambda: import_module("airgap_api.data"), iterations=10),
+        BenchmarkCase(name="startup_import_client", operation=lambda: import_module("airgap_api.api.airportgap_api_client"), iterations=10),
+    ]
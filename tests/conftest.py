@@ -1,18 +1,168 @@
+import contextlib
 import os
 
 import pytest
 import markdown
-from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.airportgap_api_client import AIRPORT_GAP_BASE_URL, AirportGapAPIClient
+from airgap_api.api.rate_limiter import RateLimiter
+from airgap_api.api.token_manager import Credentials, TokenManager, parse_accounts
+from airgap_api.data.catalog import AirportCatalog
+from airgap_api.stand_in import StandInServer
+from airgap_api.stand_in.server import DEFAULT_EMAIL, DEFAULT_PASSWORD
+
+
+def pytest_addoption(parser):
+    parser.addoption("--stand-in", action="store_true", default=False, help="Run the API tests against an in-process Airport Gap stand-in server.")
+    parser.addoption("--account-groups", action="store_true", default=False, help="Group the tests using an account by the account they lease, for use with --dist loadgroup.")
+
+
+def stand_in_enabled(config) -> bool:
+    return config.getoption("--stand-in") or os.environ.get("AIRGAP_STAND_IN", "").lower() in ("1", "true", "yes")
+
+
+def pytest_configure(config):
+    if stand_in_enabled(config):
+        os.environ["AIRGAP_EMAIL"] = DEFAULT_EMAIL
+        os.environ["AIRGAP_PASSWORD"] = DEFAULT_PASSWORD
+        os.environ["AIRGAP_TOKEN"] = StandInServer.token_for(email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD)
+
+
+ACCOUNT_GROUP = "airgap-account"
+ACCOUNT_FIXTURES = ("airgap_token", "ag_auth_client", "account_lease")
+
+
+def account_count() -> int:
+    # AIRGAP_EMAIL/AIRGAP_PASSWORD and the AIRGAP_TOKEN fallback are a single account.
+    return len(parse_accounts(os.environ.get("AIRGAP_ACCOUNTS"))) or 1
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Runs before xdist turns xdist_group marks into the group suffix of each node id.
+    if not config.getoption("--account-groups") or stand_in_enabled(config):
+        return
+    # One group per account, and a grouped test leases the account of its group, so no two workers change the same account.
+    accounts = account_count()
+    account_items = [item for item in items if any(name in getattr(item, "fixturenames", ()) for name in ACCOUNT_FIXTURES)]
+    for index, item in enumerate(account_items):
+        item.add_marker(pytest.mark.xdist_group(name=f"{ACCOUNT_GROUP}-{index % accounts}"))
+
+
+def account_index(item) -> int | None:
+    for marker in item.iter_markers(name="xdist_group"):
+        name = marker.kwargs.get("name", marker.args[0] if marker.args else "")
+        if name.startswith(f"{ACCOUNT_GROUP}-"):
+            return int(name.rpartition("-")[2])
+    return None
+
+
+def worker_id() -> str:
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def shared_tmp_path(tmp_path_factory):
+    # Under xdist each worker has its own basetemp below a directory common to the whole run.
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return tmp_path_factory.getbasetemp().parent
+    return tmp_path_factory.getbasetemp()
+
+
+@pytest.fixture(scope="session")
+def stand_in_server(pytestconfig):
+    if not stand_in_enabled(pytestconfig):
+        yield None
+        return
+    # Every xdist worker runs its own server, so favorites state is never shared between workers.
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def airgap_base_url(stand_in_server):
+    yield stand_in_server.base_url if stand_in_server is not None else AIRPORT_GAP_BASE_URL
+
+
+@pytest.fixture(scope="session")
+def rate_limiter(tmp_path_factory, stand_in_server):
+    if stand_in_server is not None:
+        yield None
+        return
+    # A single budget shared by every xdist worker in the run.
+    requests_per_minute = float(os.environ.get("AIRGAP_RATE_LIMIT_PER_MINUTE", 100))
+    yield RateLimiter.per_minute(requests_per_minute, burst=10, state_path=shared_tmp_path(tmp_path_factory) / "rate_limit.state")
+
+
+def account_credentials_configured() -> bool:
+    return bool(parse_accounts(os.environ.get("AIRGAP_ACCOUNTS"))) or ("AIRGAP_EMAIL" in os.environ and "AIRGAP_PASSWORD" in os.environ)
+
+
+@pytest.fixture(scope="session")
+def token_manager(tmp_path_factory, stand_in_server, airgap_base_url, rate_limiter):
+    if stand_in_server is None and not account_credentials_configured():
+        # Without credentials the favorites tests fall back to the single AIRGAP_TOKEN.
+        yield None
+        return
+    tokens = AirportGapAPIClient(base_url=airgap_base_url, rate_limiter=rate_limiter).tokens
+
+    def authenticate(credentials: Credentials) -> str:
+        return tokens.get_token(email=credentials.email, password=credentials.password)
+
+    if stand_in_server is not None:
+        # Every worker mints its own account on its stand-in server.
+        credentials = Credentials(email=f"{worker_id()}@airportgap.test", password=f"{worker_id()}-password")
+        stand_in_server.register(email=credentials.email, password=credentials.password)
+        yield TokenManager(accounts=[credentials], authenticate=authenticate)
+        return
+    manager = TokenManager.from_env(cache_path=shared_tmp_path(tmp_path_factory) / "tokens.json", authenticate=authenticate)
+    if os.environ.get("AIRGAP_TOKEN") and "AIRGAP_EMAIL" in os.environ and "AIRGAP_PASSWORD" in os.environ:
+        manager.remember(Credentials(email=os.environ["AIRGAP_EMAIL"], password=os.environ["AIRGAP_PASSWORD"]), token=os.environ["AIRGAP_TOKEN"])
+    yield manager
+
+
+@pytest.fixture(scope="module")
+def account_leases(token_manager):
+    if token_manager is None:
+        yield None
+        return
+    # Held per module rather than per session, so a worker hands its accounts back to the others between modules.
+    with contextlib.ExitStack() as stack:
+        leases = {}
+
+        def lease(index: int | None):
+            if index not in leases:
+                leases[index] = stack.enter_context(token_manager.lease(account=index))
+            return leases[index]
+
+        yield lease
+
+
+@pytest.fixture()
+def account_lease(request, account_leases):
+    yield account_leases(account_index(request.node)) if account_leases is not None else None
 
 
 @pytest.fixture()
-def ag_api_client():
-    yield AirportGapAPIClient()
+def ag_api_client(airgap_base_url, rate_limiter):
+    yield AirportGapAPIClient(base_url=airgap_base_url, rate_limiter=rate_limiter)
 
 
 @pytest.fixture()
-def airgap_token():
-    yield os.environ["AIRGAP_TOKEN"]
+def ag_auth_client(airgap_base_url, rate_limiter, token_manager):
+    # Favorites calls re-authenticate through the token manager when a token is rejected.
+    yield AirportGapAPIClient(base_url=airgap_base_url, rate_limiter=rate_limiter, token_manager=token_manager)
+
+
+@pytest.fixture()
+def airgap_token(account_lease):
+    yield account_lease.token if account_lease is not None else os.environ["AIRGAP_TOKEN"]
+
+
+@pytest.fixture(scope="session")
+def airport_catalog(tmp_path_factory, airgap_base_url, rate_limiter):
+    path = os.environ.get("AIRGAP_CATALOG_PATH") or shared_tmp_path(tmp_path_factory) / "airport_catalog.bin"
+    catalog = AirportCatalog.open_or_build(client=AirportGapAPIClient(base_url=airgap_base_url, rate_limiter=rate_limiter), path=path, max_workers=4)
+    yield catalog
+    catalog.close()
 
 
 @pytest.hookimpl(optionalhook=True)
@@ -2,6 +2,9 @@ import pytest
 from loguru import logger
 import pytest_check as checks
 import http
+import requests
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.cache import ResponseCache
 from airgap_api.data import AirportDataModel, ErrorListResponseModel, Airports, AirportDistanceResultModel, AirportDataPageResponse
 
 pytestmark = [pytest.mark.api, pytest.mark.airports]
@@ -89,6 +92,47 @@ def test__airports__valid_airport_id(ag_api_client):
     assert resp_data == Airports.MAG
 
 
+def test__airports__valid_airport_id_typed(ag_api_client):
+    """
+    Tests the airports GET by ID endpoint parsed straight into models from the response bytes.
+    Steps:
+
+    1. Perform typed call to airports GET by ID API endpoint specifying valid id.
+    2. Verify data content matches expected.
+    3. Verify typed call specifying invalid id raises an error.
+    """
+    logger.info("1. Perform typed call to airports GET by ID API endpoint specifying valid id.")
+    airport = ag_api_client.airports.get_by_id_typed(airport_id=Airports.MAG.id)
+    logger.info("2. Verify data content matches expected.")
+    checks.equal(airport, Airports.MAG)
+    logger.info("3. Verify typed call specifying invalid id raises an error.")
+    with pytest.raises(requests.HTTPError):
+        ag_api_client.airports.get_by_id_typed(airport_id="INVALID")
+
+
+def test__airports__cached_airport_id(airgap_base_url):
+    """
+    Tests the airports GET by ID endpoint served through the response cache.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint twice with a cache enabled client.
+    2. Verify response status codes.
+    3. Verify second call was served from the cache.
+    4. Verify cached data content matches expected.
+    """
+    cache = ResponseCache()
+    client = AirportGapAPIClient(base_url=airgap_base_url, cache=cache)
+    logger.info("1. Perform call to airports GET by ID API endpoint twice with a cache enabled client.")
+    responses = [client.airports.get_by_id(airport_id=Airports.MAG.id) for _ in range(2)]
+    logger.info("2. Verify response status codes.")
+    assert all(response.status_code == http.HTTPStatus.OK for response in responses)
+    logger.info("3. Verify second call was served from the cache.")
+    checks.equal(cache.stats.misses, 1)
+    checks.equal(cache.stats.hits, 1)
+    logger.info("4. Verify cached data content matches expected.")
+    checks.equal(AirportDataModel(**responses[1].json()["data"]), Airports.MAG)
+
+
 def test__airports__invalid_airport_id(ag_api_client):
     """
     Tests the airports GET by ID endpoint when invalid id is supplied.
@@ -127,6 +171,65 @@ def test__airports__all_pages(ag_api_client):
             assert AirportDataModel(**airport)
 
 
+@pytest.mark.slow
+def test__airports__all_pages_concurrent(ag_api_client):
+    """
+    Tests the airports data returned by every page when pages are fetched concurrently.
+    Steps:
+
+    1. Get all pages of airport data using a worker pool.
+    2. Verify data format of each airport.
+    3. Verify no airport is returned more than once.
+    """
+    logger.info("1. Get all pages of airport data using a worker pool.")
+    airport_ids = []
+    for page_data in ag_api_client.airports.get_all(max_workers=4):
+        logger.info("2. Verify data format of each airport.")
+        airport_ids.extend(airport.id for airport in AirportDataPageResponse.validate_python(page_data))
+    logger.info("3. Verify no airport is returned more than once.")
+    assert len(airport_ids) == len(set(airport_ids))
+
+
+@pytest.mark.slow
+def test__airports__all_pages_concurrent_with_params(ag_api_client):
+    """
+    Tests fetching pages concurrently with query parameters passed by the caller.
+    Steps:
+
+    1. Get all pages of airport data using a worker pool and a params dict.
+    2. Verify every airport is returned exactly once, in order.
+    3. Verify the caller's params were not changed.
+    """
+    params = {"sort": "id"}
+    logger.info("1. Get all pages of airport data using a worker pool and a params dict.")
+    concurrent = [airport["id"] for page_data in ag_api_client.airports.get_all(max_workers=4, params=params) for airport in page_data]
+    logger.info("2. Verify every airport is returned exactly once, in order.")
+    checks.equal(concurrent, [airport["id"] for page_data in ag_api_client.airports.get_all() for airport in page_data])
+    logger.info("3. Verify the caller's params were not changed.")
+    checks.equal(params, {"sort": "id"})
+
+
+@pytest.mark.slow
+def test__airports__iter_all_models(ag_api_client):
+    """
+    Tests iterating every airport model parsed straight from the response bytes of each page.
+    Steps:
+
+    1. Get the first page of airport data as models.
+    2. Iterate all airport models using a worker pool.
+    3. Verify the first page matches the start of the iterated models.
+    4. Verify no airport is returned more than once.
+    """
+    logger.info("1. Get the first page of airport data as models.")
+    first_page = ag_api_client.airports.get_typed()
+    logger.info("2. Iterate all airport models using a worker pool.")
+    airports = list(ag_api_client.airports.iter_all_models(max_workers=4))
+    logger.info("3. Verify the first page matches the start of the iterated models.")
+    checks.equal(airports[:len(first_page.data)], first_page.data)
+    logger.info("4. Verify no airport is returned more than once.")
+    assert len(airports) == len({airport.id for airport in airports})
+
+
 @pytest.mark.wip
 def test__airports__distance_calc(ag_api_client):
     """
@@ -150,3 +253,18 @@ def test__airports__distance_calc(ag_api_client):
     checks.almost_equal(distance_data.attributes.kilometers, 3451.0132605573453, msg="Kilometers")
     checks.almost_equal(distance_data.attributes.miles, 2142.86743976846, msg="Miles")
     checks.almost_equal(distance_data.attributes.nautical_miles, 1862.1000015367488, msg="Nautical Miles")
+
+
+def test__airports__distance_calc_typed(ag_api_client):
+    """
+    Tests the airports distance endpoint parsed straight into a model from the response bytes.
+    Steps:
+
+    1. Perform typed call to airports distance API endpoint.
+    2. Verify data content matches expected.
+    """
+    logger.info("1. Perform typed call to airports distance API endpoint.")
+    distance_data = ag_api_client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+    logger.info("2. Verify data content matches expected.")
+    checks.equal(distance_data.attributes.from_airport.iata, Airports.MAG.attributes.iata)
+    checks.almost_equal(distance_data.attributes.kilometers, 3451.0132605573453, msg="Kilometers")
@@ -0,0 +1,109 @@
+import asyncio
+import http
+import time
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AsyncAirportGapAPIClient
+from airgap_api.data import AirportDataModel, Airports, AirportDataPageResponse
+from airgap_api.stand_in import StandInServer
+from airgap_api.stand_in.data import generate_airports
+
+pytestmark = [pytest.mark.api, pytest.mark.airports]
+
+
+def test__async_client__concurrent_airport_ids(airgap_base_url):
+    """
+    Tests the async client performing concurrent airports GET by ID calls from a single event loop.
+    Steps:
+
+    1. Perform concurrent calls to airports GET by ID API endpoint.
+    2. Verify response status codes.
+    3. Verify data content matches expected.
+    """
+    async def get_airports():
+        async with AsyncAirportGapAPIClient(base_url=airgap_base_url, max_concurrency=5) as client:
+            return await asyncio.gather(*(client.airports.get_by_id(airport_id=airport.id) for airport in (Airports.MAG, Airports.CYG)))
+
+    logger.info("1. Perform concurrent calls to airports GET by ID API endpoint.")
+    responses = asyncio.run(get_airports())
+    logger.info("2. Verify response status codes.")
+    assert all(response.status_code == http.HTTPStatus.OK for response in responses)
+    logger.info("3. Verify data content matches expected.")
+    checks.equal(AirportDataModel(**responses[0].json()["data"]), Airports.MAG)
+    checks.equal(AirportDataModel(**responses[1].json()["data"]), Airports.CYG)
+
+
+@pytest.mark.slow
+def test__async_client__all_pages(airgap_base_url):
+    """
+    Tests the async client returning every page of airport data through the async page generator.
+    Steps:
+
+    1. Get all pages of airport data concurrently.
+    2. Verify data format of each page.
+    """
+    async def get_all_pages():
+        async with AsyncAirportGapAPIClient(base_url=airgap_base_url, max_concurrency=4) as client:
+            return [page_data async for page_data in client.airports.get_all(concurrent=True)]
+
+    logger.info("1. Get all pages of airport data concurrently.")
+    pages = asyncio.run(get_all_pages())
+    logger.info("2. Verify data format of each page.")
+    for page_data in pages:
+        AirportDataPageResponse.validate_python(page_data)
+
+
+def test__async_client__typed_airports(airgap_base_url):
+    """
+    Tests the async client typed calls parsing models straight from the response bytes.
+    Steps:
+
+    1. Perform typed calls to airports GET by ID API endpoint and airports GET API endpoint.
+    2. Verify data content matches expected.
+    3. Verify the iterated models start with the first page.
+    """
+    async def get_typed():
+        async with AsyncAirportGapAPIClient(base_url=airgap_base_url) as client:
+            airport, page = await asyncio.gather(client.airports.get_by_id_typed(airport_id=Airports.MAG.id), client.airports.get_typed())
+            first_models = []
+            async for model in client.airports.iter_all_models():
+                first_models.append(model)
+                if len(first_models) == len(page.data):
+                    break
+            return airport, page, first_models
+
+    logger.info("1. Perform typed calls to airports GET by ID API endpoint and airports GET API endpoint.")
+    airport, page, first_models = asyncio.run(get_typed())
+    logger.info("2. Verify data content matches expected.")
+    checks.equal(airport, Airports.MAG)
+    logger.info("3. Verify the iterated models start with the first page.")
+    checks.equal(first_models, page.data)
+
+
+def test__async_client__favorites_sync_max_workers():
+    """
+    Tests the async favorites sync honouring max_workers.
+    Steps:
+
+    1. Sync four new favorites one at a time and all at once on a slow server.
+    2. Verify every favorite was added.
+    3. Verify the sync limited to one worker took about four calls longer.
+    """
+    desired = {airport["id"]: "note" for airport in generate_airports(count=4)}
+    with StandInServer(airport_count=4, latency=0.1) as server:
+        tokens = [server.register(email=f"{name}@airportgap.test", password=name) for name in ("serial", "parallel")]
+
+        async def sync(token, max_workers):
+            async with AsyncAirportGapAPIClient(base_url=server.base_url) as client:
+                started = time.perf_counter()
+                report = await client.favorites.sync(desired=desired, token=token, max_workers=max_workers)
+                return report, time.perf_counter() - started
+
+        logger.info("1. Sync four new favorites one at a time and all at once on a slow server.")
+        (serial, serial_elapsed), (parallel, parallel_elapsed) = asyncio.run(sync(tokens[0], 1)), asyncio.run(sync(tokens[1], 4))
+    logger.info("2. Verify every favorite was added.")
+    checks.equal([result.status_code for result in serial.results], [http.HTTPStatus.CREATED] * 4)
+    checks.equal([result.status_code for result in parallel.results], [http.HTTPStatus.CREATED] * 4)
+    logger.info("3. Verify the sync limited to one worker took about four calls longer.")
+    checks.greater(serial_elapsed - parallel_elapsed, 0.2)
@@ -0,0 +1,148 @@
+import http
+import pytest
+import requests
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.cache import ResponseCache
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+from airgap_api.stand_in.server import DEFAULT_EMAIL, DEFAULT_PASSWORD
+
+pytestmark = [pytest.mark.cache]
+
+
+def test__cache__revalidation():
+    """
+    Tests an expired entry being revalidated and served from the cache on 304 Not Modified.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint twice with entries that expire immediately.
+    2. Verify the second call was revalidated rather than downloaded again.
+    3. Verify the cached body was served and the original response was left unchanged.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = ResponseCache(ttls={"airports/*": 0.0})
+        client = AirportGapAPIClient(base_url=server.base_url, cache=cache)
+        logger.info("1. Perform call to airports GET by ID API endpoint twice with entries that expire immediately.")
+        first = client.airports.get_by_id(airport_id=Airports.MAG.id)
+        second = client.airports.get_by_id(airport_id=Airports.MAG.id)
+    logger.info("2. Verify the second call was revalidated rather than downloaded again.")
+    checks.equal((cache.stats.misses, cache.stats.revalidations, cache.stats.hits), (1, 1, 0))
+    logger.info("3. Verify the cached body was served and the original response was left unchanged.")
+    checks.equal(second.status_code, http.HTTPStatus.OK)
+    checks.equal(second.json(), first.json())
+    checks.is_not(second.headers, first.headers)
+
+
+def test__cache__miss_stores_copy():
+    """
+    Tests a response fetched on a cache miss being stored separately from the one returned.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint and change the returned headers.
+    2. Perform the same call again.
+    3. Verify the hit was served from an entry the first caller could not change.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = ResponseCache()
+        client = AirportGapAPIClient(base_url=server.base_url, cache=cache)
+        logger.info("1. Perform call to airports GET by ID API endpoint and change the returned headers.")
+        first = client.airports.get_by_id(airport_id=Airports.MAG.id)
+        etag = first.headers["ETag"]
+        first.headers["ETag"] = "changed"
+        logger.info("2. Perform the same call again.")
+        second = client.airports.get_by_id(airport_id=Airports.MAG.id)
+    logger.info("3. Verify the hit was served from an entry the first caller could not change.")
+    checks.equal((cache.stats.misses, cache.stats.hits), (1, 1))
+    checks.is_not(second, first)
+    checks.equal(second.headers["ETag"], etag)
+    checks.equal(second.json(), first.json())
+
+
+def test__cache__hit_returns_copy():
+    """
+    Tests a response served from the cache being a copy the caller can change.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint twice and change the headers of the hit.
+    2. Perform the same call again.
+    3. Verify the next hit was served with the original headers.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = ResponseCache()
+        client = AirportGapAPIClient(base_url=server.base_url, cache=cache)
+        logger.info("1. Perform call to airports GET by ID API endpoint twice and change the headers of the hit.")
+        etag = client.airports.get_by_id(airport_id=Airports.MAG.id).headers["ETag"]
+        hit = client.airports.get_by_id(airport_id=Airports.MAG.id)
+        hit.headers["ETag"] = "changed"
+        logger.info("2. Perform the same call again.")
+        second_hit = client.airports.get_by_id(airport_id=Airports.MAG.id)
+    logger.info("3. Verify the next hit was served with the original headers.")
+    checks.equal((cache.stats.misses, cache.stats.hits), (1, 2))
+    checks.is_not(second_hit.headers, hit.headers)
+    checks.equal(second_hit.headers["ETag"], etag)
+
+
+def test__cache__authorization_bypass():
+    """
+    Tests authenticated requests never being cached.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint with an Authorization header, in either case.
+    2. Verify every call bypassed the cache and reached the server.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = ResponseCache()
+        client = AirportGapAPIClient(base_url=server.base_url, cache=cache)
+        token = f"Bearer token={StandInServer.token_for(email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD)}"
+        logger.info("1. Perform call to airports GET by ID API endpoint with an Authorization header, in either case.")
+        for name in ("Authorization", "Authorization", "authorization"):
+            client.airports.get_by_id(airport_id=Airports.MAG.id, headers={name: token})
+        logger.info("2. Verify every call bypassed the cache and reached the server.")
+        checks.equal(cache.stats.bypasses, 3)
+        checks.equal(len(cache), 0)
+        checks.equal(server.request_count, 3)
+
+
+def test__cache__invalidation():
+    """
+    Tests only successful writes to cached resources invalidating entries.
+    Steps:
+
+    1. Cache an airports page and an airport.
+    2. Perform call to airports distance API endpoint.
+    3. Verify the read-only POST left the cache untouched.
+    4. Perform a write to an airport that fails.
+    5. Verify the failed write left the cache untouched.
+    6. Perform a successful write to an airport.
+    7. Verify the airport and its parent page were invalidated.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = ResponseCache()
+        client = AirportGapAPIClient(base_url=server.base_url, cache=cache)
+        logger.info("1. Cache an airports page and an airport.")
+        client.airports.get()
+        client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("2. Perform call to airports distance API endpoint.")
+        client.airports.distance(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+        logger.info("3. Verify the read-only POST left the cache untouched.")
+        checks.equal(len(cache), 2)
+        logger.info("4. Perform a write to an airport that fails.")
+        checks.equal(client.patch(url=f"airports/{Airports.MAG.id}", json={}).status_code, http.HTTPStatus.NOT_FOUND)
+        logger.info("5. Verify the failed write left the cache untouched.")
+        checks.equal(len(cache), 2)
+        checks.equal(cache.stats.invalidations, 0)
+
+        logger.info("6. Perform a successful write to an airport.")
+
+        def send_no_content(method, *, url, **kwargs):
+            # The stand-in has no writable airports, so the write is answered here.
+            response = requests.Response()
+            response.status_code, response.url = http.HTTPStatus.NO_CONTENT, url
+            return response
+
+        cache.request(send=send_no_content, method="PATCH", endpoint=f"airports/{Airports.MAG.id}", url=client.make_url(url=f"airports/{Airports.MAG.id}"), session_headers={})
+    logger.info("7. Verify the airport and its parent page were invalidated.")
+    checks.equal(len(cache), 0)
+    checks.equal(cache.stats.invalidations, 2)
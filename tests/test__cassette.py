@@ -0,0 +1,112 @@
+import http
+import time
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.cassette import Cassette, CassetteMissError, CassetteMode
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.cassette]
+
+
+def test__cassette__record_and_replay_all_pages(tmp_path):
+    """
+    Tests recording a crawl of every airports page to a cassette and replaying it without the server.
+    Steps:
+
+    1. Record a crawl of every airports page from a stand-in server.
+    2. Stop the stand-in server.
+    3. Replay the crawl from the cassette.
+    4. Verify the replayed pages match the recorded pages.
+    5. Verify an unrecorded request is not replayed.
+    """
+    path = tmp_path / "airports.cassette"
+    logger.info("1. Record a crawl of every airports page from a stand-in server.")
+    with StandInServer(airport_count=95) as server, Cassette(path=path, mode=CassetteMode.RECORD) as cassette:
+        base_url = server.base_url
+        client = AirportGapAPIClient(base_url=base_url, cassette=cassette)
+        recorded = list(client.get_all_pages(url="airports"))
+        checks.equal(len(cassette), 4)
+    logger.info("2. Stop the stand-in server.")
+    logger.info("3. Replay the crawl from the cassette.")
+    with Cassette(path=path) as cassette:
+        client = AirportGapAPIClient(base_url=base_url, cassette=cassette)
+        replayed = list(client.get_all_pages(url="airports"))
+        logger.info("4. Verify the replayed pages match the recorded pages.")
+        checks.equal(replayed, recorded)
+        logger.info("5. Verify an unrecorded request is not replayed.")
+        with pytest.raises(CassetteMissError):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+
+
+def test__cassette__repeated_requests_and_truncated_record(tmp_path):
+    """
+    Tests replaying repeated requests in recorded order and recovering from a partially written record.
+    Steps:
+
+    1. Record a favorite being added and then listed twice.
+    2. Truncate the last record of the cassette.
+    3. Verify the cassette only indexes the complete records.
+    4. Append a new record to the cassette.
+    5. Verify the responses are replayed in recorded order.
+    """
+    path = tmp_path / "favorites.cassette"
+    logger.info("1. Record a favorite being added and then listed twice.")
+    with StandInServer(airport_count=10) as server:
+        token = server.register(email="cassette@airportgap.test", password="cassette")
+        with Cassette(path=path, mode=CassetteMode.RECORD) as cassette:
+            client = AirportGapAPIClient(base_url=server.base_url, cassette=cassette)
+            client.favorites.get(token=token)
+            client.favorites.add(airport_id=Airports.MAG.id, note="Home", token=token)
+            client.favorites.get(token=token)
+        logger.info("2. Truncate the last record of the cassette.")
+        with open(path, "r+b") as file:
+            file.truncate(path.stat().st_size - 5)
+        logger.info("3. Verify the cassette only indexes the complete records.")
+        with Cassette(path=path, mode=CassetteMode.RECORD) as cassette:
+            checks.equal(len(cassette), 2)
+            logger.info("4. Append a new record to the cassette.")
+            AirportGapAPIClient(base_url=server.base_url, cassette=cassette).favorites.get(token=token)
+
+    logger.info("5. Verify the responses are replayed in recorded order.")
+    with Cassette(path=path) as cassette:
+        checks.equal(len(cassette), 3)
+        client = AirportGapAPIClient(base_url=server.base_url, cassette=cassette)
+        checks.equal(client.favorites.get(token=token).json()["data"], [])
+        checks.equal(client.favorites.add(airport_id=Airports.MAG.id, note="Home", token=token).status_code, http.HTTPStatus.CREATED)
+        checks.equal(len(client.favorites.get(token=token).json()["data"]), 1)
+
+
+def test__cassette__replay_elapsed(tmp_path):
+    """
+    Tests replaying the recorded response timings.
+    Steps:
+
+    1. Record a request to a stand-in server with added latency.
+    2. Replay the request without recorded timings.
+    3. Verify the replay does not wait.
+    4. Replay the request with recorded timings.
+    5. Verify the replay waits for the recorded time.
+    """
+    path = tmp_path / "distance.cassette"
+    logger.info("1. Record a request to a stand-in server with added latency.")
+    with StandInServer(airport_count=10, latency=0.2) as server, Cassette(path=path, mode=CassetteMode.RECORD) as cassette:
+        base_url = server.base_url
+        AirportGapAPIClient(base_url=base_url, cassette=cassette).airports.get_by_id(airport_id=Airports.MAG.id)
+
+    logger.info("2. Replay the request without recorded timings.")
+    with Cassette(path=path) as cassette:
+        started = time.perf_counter()
+        response = AirportGapAPIClient(base_url=base_url, cassette=cassette).airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("3. Verify the replay does not wait.")
+        checks.less(time.perf_counter() - started, 0.2)
+        checks.greater_equal(response.elapsed.total_seconds(), 0.2)
+
+    logger.info("4. Replay the request with recorded timings.")
+    with Cassette(path=path, replay_elapsed=True) as cassette:
+        started = time.perf_counter()
+        AirportGapAPIClient(base_url=base_url, cassette=cassette).airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("5. Verify the replay waits for the recorded time.")
+        checks.greater_equal(time.perf_counter() - started, 0.2)
@@ -0,0 +1,95 @@
+import threading
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.data import AirportDataModel, Airports
+from airgap_api.data.catalog import AirportCatalog, CatalogPage
+from airgap_api.stand_in import StandInServer
+from airgap_api.utils.file_lock import FileLock
+
+pytestmark = [pytest.mark.catalog]
+
+
+def test__catalog__write_and_lookup(tmp_path):
+    """
+    Tests writing an airport catalog snapshot and looking airports up by id from the memory-mapped file.
+    Steps:
+
+    1. Write a snapshot containing two pages of airport data.
+    2. Open the snapshot.
+    3. Verify the number of airports in the snapshot.
+    4. Verify airports looked up by id match expected.
+    5. Verify an unknown id is not found.
+    """
+    logger.info("1. Write a snapshot containing two pages of airport data.")
+    path = tmp_path / "airport_catalog.bin"
+    pages = [
+        CatalogPage(page=1, records=[Airports.MAG.model_dump()], next_page=2),
+        CatalogPage(page=2, records=[Airports.CYG.model_dump()]),
+    ]
+    AirportCatalog.write(path=path, pages=pages)
+    logger.info("2. Open the snapshot.")
+    with AirportCatalog(path=path) as catalog:
+        logger.info("3. Verify the number of airports in the snapshot.")
+        assert len(catalog) == 2
+        logger.info("4. Verify airports looked up by id match expected.")
+        checks.equal(catalog.get_by_id(airport_id=Airports.MAG.id), Airports.MAG)
+        checks.equal(catalog.get_by_id(airport_id=Airports.CYG.id), Airports.CYG)
+        checks.almost_equal(catalog.latitude[catalog.row_index(airport_id=Airports.MAG.id)], float(Airports.MAG.attributes.latitude))
+        logger.info("5. Verify an unknown id is not found.")
+        checks.is_none(catalog.get_by_id(airport_id="INVALID"))
+        checks.is_false("ZZZ" in catalog)
+
+
+@pytest.mark.api
+@pytest.mark.slow
+def test__catalog__matches_airports_endpoint(ag_api_client, airport_catalog):
+    """
+    Tests the shared airport catalog snapshot against the airports GET by ID endpoint.
+    Steps:
+
+    1. Perform call to airports GET by ID API endpoint.
+    2. Verify snapshot lookup matches the endpoint data.
+    3. Refresh the snapshot and verify no pages changed.
+    """
+    logger.info("1. Perform call to airports GET by ID API endpoint.")
+    response = ag_api_client.airports.get_by_id(airport_id=Airports.MAG.id)
+    logger.info("2. Verify snapshot lookup matches the endpoint data.")
+    checks.equal(airport_catalog.get_by_id(airport_id=Airports.MAG.id), AirportDataModel(**response.json()["data"]))
+    logger.info("3. Refresh the snapshot and verify no pages changed.")
+    checks.equal(airport_catalog.refresh(client=ag_api_client), [])
+
+
+@pytest.mark.stand_in
+def test__catalog__refresh_shares_snapshot_lock(tmp_path):
+    """
+    Tests refreshing a shared airport catalog snapshot from two handles.
+    Steps:
+
+    1. Build a snapshot and open a second handle to it.
+    2. Change an airport on the server.
+    3. Refresh through the first handle while the snapshot lock is held.
+    4. Verify the refresh waits for the lock and picks up the changed page.
+    5. Verify refreshing through the second handle finds the snapshot already current.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        path = tmp_path / "airport_catalog.bin"
+        logger.info("1. Build a snapshot and open a second handle to it.")
+        with AirportCatalog.build(client=client, path=path) as first, AirportCatalog(path=path) as second:
+            logger.info("2. Change an airport on the server.")
+            server.airports_by_id[Airports.CYG.id]["attributes"]["altitude"] += 1
+            logger.info("3. Refresh through the first handle while the snapshot lock is held.")
+            changed_pages = []
+            with FileLock(path=path.with_name(f"{path.name}.lock")):
+                refresh = threading.Thread(target=lambda: changed_pages.extend(first.refresh(client=client)))
+                refresh.start()
+                refresh.join(timeout=0.2)
+                logger.info("4. Verify the refresh waits for the lock and picks up the changed page.")
+                checks.is_true(refresh.is_alive())
+            refresh.join()
+            checks.equal(changed_pages, [1])
+            logger.info("5. Verify refreshing through the second handle finds the snapshot already current.")
+            checks.equal(second.refresh(client=client), [])
+            checks.equal(second.get_by_id(airport_id=Airports.CYG.id).attributes.altitude, Airports.CYG.attributes.altitude + 1)
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.data import AirportIATACodes, AirportICAOCodes, Airports
+from airgap_api.data.catalog import AirportCatalog, CatalogPage
+from airgap_api.data.codes import CodeRegistry, Codes
+from airgap_api.stand_in.data import generate_airports
+
+pytestmark = [pytest.mark.codes]
+
+# Budget for the codes module's own import time, excluding the airgap_api.data package it lives in.
+IMPORT_BUDGET_SECONDS = 0.05
+
+
+def import_time(*, codes_path) -> float:
+    script = "import airgap_api.data.codes as codes; assert not codes.Codes.loaded"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], env={**os.environ, "AIRGAP_CODES_PATH": str(codes_path)}, capture_output=True, text=True, check=True)
+    line = next(line for line in result.stderr.splitlines() if line.rstrip().endswith("| airgap_api.data.codes"))
+    return int(line.split("|")[0].split(":")[1]) / 1e6
+
+
+def test__codes__known_codes():
+    """
+    Tests looking up the shipped airport codes.
+    Steps:
+
+    1. Access codes as attributes of the registry.
+    2. Verify codes match the code enumerations.
+    3. Verify IATA and ICAO codes map to each other.
+    4. Verify unknown codes are rejected.
+    """
+    logger.info("1. Access codes as attributes of the registry.")
+    logger.info("2. Verify codes match the code enumerations.")
+    checks.equal(Codes.MAG, AirportIATACodes.MAG)
+    checks.equal(Codes.AYMD, AirportICAOCodes.AYMD)
+    logger.info("3. Verify IATA and ICAO codes map to each other.")
+    checks.equal(Codes.icao_for(Airports.CYG.attributes.iata), Airports.CYG.attributes.icao)
+    checks.equal(Codes.iata_for(Airports.CYG.attributes.icao), Airports.CYG.attributes.iata)
+    checks.equal(Codes.validate_iata("mag"), "MAG")
+    checks.is_in("YCRG", Codes)
+    logger.info("4. Verify unknown codes are rejected.")
+    with pytest.raises(AttributeError):
+        Codes.XXXX
+    with pytest.raises(ValueError):
+        Codes.validate_icao("XXXX")
+    checks.is_none(Codes.icao_for("XXX"))
+
+
+def test__codes__generated_from_catalog(tmp_path):
+    """
+    Tests generating the code registry from an airport catalog snapshot.
+    Steps:
+
+    1. Write a catalog snapshot of 10000 airports.
+    2. Generate a code registry from the snapshot.
+    3. Verify the registry is only loaded on first use.
+    4. Verify every airport code can be looked up.
+    """
+    logger.info("1. Write a catalog snapshot of 10000 airports.")
+    airports = generate_airports(count=10000)
+    AirportCatalog.write(path=tmp_path / "catalog.bin", pages=[CatalogPage(page=1, records=airports)])
+    logger.info("2. Generate a code registry from the snapshot.")
+    with AirportCatalog(path=tmp_path / "catalog.bin") as catalog:
+        checks.equal(CodeRegistry.generate(catalog=catalog, path=tmp_path / "codes.txt"), 10000)
+    registry = CodeRegistry(path=tmp_path / "codes.txt")
+    logger.info("3. Verify the registry is only loaded on first use.")
+    checks.is_false(registry.loaded)
+    started = time.perf_counter()
+    checks.equal(len(registry), 10000)
+    logger.debug(f"Loaded 10000 codes in {time.perf_counter() - started:.6f}s")
+    logger.info("4. Verify every airport code can be looked up.")
+    for airport in airports:
+        attributes = airport["attributes"]
+        assert registry.icao_for(attributes["iata"]) == attributes["icao"]
+        assert registry.iata_for(attributes["icao"]) == attributes["iata"]
+    checks.equal(registry.AAA, "AAA")
+
+
+def test__codes__import_cost_is_flat(tmp_path):
+    """
+    Tests that importing the code registry does not depend on the number of codes.
+    Steps:
+
+    1. Generate a code registry of 10000 airports.
+    2. Measure the import time with the shipped and the generated registry.
+    3. Verify neither import loads the registry.
+    4. Verify both imports stay within budget.
+    """
+    logger.info("1. Generate a code registry of 10000 airports.")
+    airports = generate_airports(count=10000)
+    CodeRegistry.write(path=tmp_path / "codes.txt", pairs=((airport["attributes"]["iata"], airport["attributes"]["icao"]) for airport in airports))
+    logger.info("2. Measure the import time with the shipped and the generated registry.")
+    logger.info("3. Verify neither import loads the registry.")
+    shipped = min(import_time(codes_path=Codes.path) for _ in range(3))
+    generated = min(import_time(codes_path=tmp_path / "codes.txt") for _ in range(3))
+    logger.debug(f"Import time shipped={shipped:.6f}s generated={generated:.6f}s")
+    logger.info("4. Verify both imports stay within budget.")
+    checks.less(shipped, IMPORT_BUDGET_SECONDS)
+    checks.less(generated, IMPORT_BUDGET_SECONDS)
@@ -0,0 +1,90 @@
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.data import Airports
+from airgap_api.data.collection import StringColumn, deep_sizeof
+from airgap_api.data.spatial import AirportSpatialIndex
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.collection]
+
+
+@pytest.fixture(scope="module")
+def crawled_airports():
+    with StandInServer(airport_count=500, page_size=100) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        yield client.airports.get_collection(), list(client.airports.iter_all_models())
+
+
+def test__collection__matches_models(crawled_airports):
+    """
+    Tests an airport collection filled from the airports GET API endpoint against the parsed models.
+    Steps:
+
+    1. Verify the collection holds every airport with numeric coordinates.
+    2. Verify airports looked up by id and by row match the models.
+    3. Verify an unknown id is not found.
+    """
+    collection, models = crawled_airports
+    logger.info("1. Verify the collection holds every airport with numeric coordinates.")
+    checks.equal(len(collection), len(models))
+    checks.equal(collection.latitude.dtype.kind, "f")
+    checks.almost_equal(collection.latitude[collection.row_index(airport_id=Airports.MAG.id)], float(Airports.MAG.attributes.latitude))
+    logger.info("2. Verify airports looked up by id and by row match the models.")
+    checks.equal(collection.get_by_id(airport_id=Airports.MAG.id), Airports.MAG)
+    checks.equal(collection.get_by_id(airport_id=Airports.CYG.id), Airports.CYG)
+    checks.equal(list(collection), models)
+    logger.info("3. Verify an unknown id is not found.")
+    checks.is_none(collection.get_by_id(airport_id="INVALID"))
+    checks.is_false("INVALID" in collection)
+
+
+def test__collection__filters(crawled_airports):
+    """
+    Tests filtering an airport collection by country and timezone.
+    Steps:
+
+    1. Filter the collection by country.
+    2. Verify the filtered airports match the models of that country.
+    3. Filter the collection by country and timezone.
+    4. Verify the filtered airports match both values and an unknown value matches nothing.
+    """
+    collection, models = crawled_airports
+    logger.info("1. Filter the collection by country.")
+    australia = collection.filter(country="Australia")
+    logger.info("2. Verify the filtered airports match the models of that country.")
+    checks.equal(list(australia), [model for model in models if model.attributes.country == "Australia"])
+    logger.info("3. Filter the collection by country and timezone.")
+    sydney = collection.filter(country="Australia", timezone="Australia/Sydney")
+    logger.info("4. Verify the filtered airports match both values and an unknown value matches nothing.")
+    checks.equal(sydney.ids, [model.id for model in models if (model.attributes.country, model.attributes.timezone) == ("Australia", "Australia/Sydney")])
+    checks.equal(len(collection.filter(country="Atlantis")), 0)
+
+
+def test__collection__memory_and_spatial(crawled_airports):
+    """
+    Tests the memory footprint of an airport collection and building a spatial index from it.
+    Steps:
+
+    1. Verify the collection is smaller than the list of models.
+    2. Verify a text column holds a single copy of each distinct value.
+    3. Build a spatial index from the collection.
+    4. Verify nearest airports match an index built from the models.
+    """
+    collection, models = crawled_airports
+    logger.info("1. Verify the collection is smaller than the list of models.")
+    footprint = collection.memory_footprint()
+    logger.info(f"Collection {footprint['total']} bytes, models {deep_sizeof(models)} bytes")
+    checks.less(footprint["total"] * 3, deep_sizeof(models))
+    logger.info("2. Verify a text column holds a single copy of each distinct value.")
+    column = StringColumn.from_values("".join(letters) for letters in ["ab", "ab", "cd"])
+    checks.equal(len(column.categories), 2)
+    checks.is_true(all(key is category for key, category in zip(column.index, column.categories)))
+    checks.equal(sum(footprint[name] for name in ("arrays", "strings", "coordinate_text", "index")), footprint["total"])
+    logger.info("3. Build a spatial index from the collection.")
+    spatial_index = AirportSpatialIndex.from_collection(collection=collection)
+    logger.info("4. Verify nearest airports match an index built from the models.")
+    matches = spatial_index.nearest(latitude=-5.0, longitude=145.5, k=3)
+    checks.equal(matches.airport_ids, AirportSpatialIndex.from_models(airports=models).nearest(latitude=-5.0, longitude=145.5, k=3).airport_ids)
+    checks.equal(spatial_index.to_models(matches)[0], Airports.MAG)
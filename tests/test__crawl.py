@@ -0,0 +1,113 @@
+import http
+import pytest
+import requests
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.stand_in import StandInServer
+from airgap_api.stand_in.server import StandInResponse
+
+pytestmark = [pytest.mark.crawl]
+
+
+def crawl(client, checkpoint, pages=None, progress=None):
+    crawled = []
+    for data in client.airports.get_all(checkpoint=checkpoint, progress=progress):
+        crawled.append(data)
+        if len(crawled) == pages:
+            break
+    return crawled
+
+
+def test__crawl__resume(tmp_path):
+    """
+    Tests an interrupted airports crawl continuing from its checkpoint.
+    Steps:
+
+    1. Crawl the first four pages of the airports GET API endpoint with a checkpoint and stop.
+    2. Simulate an incomplete record and a record cut short at the end of the checkpoint.
+    3. Resume the crawl from the checkpoint.
+    4. Verify every saved page was revalidated and the remaining pages were requested.
+    5. Verify the crawl matches an uninterrupted one and progress reached the last page.
+    6. Rerun the completed crawl and verify it is served from the checkpoint.
+    """
+    with StandInServer(airport_count=100, page_size=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        checkpoint = tmp_path / "airports.crawl"
+        logger.info("1. Crawl the first four pages of the airports GET API endpoint with a checkpoint and stop.")
+        first = crawl(client, checkpoint, pages=4)
+        checks.equal(server.request_count, 4)
+        logger.info("2. Simulate an incomplete record and a record cut short at the end of the checkpoint.")
+        with open(checkpoint, "ab") as file:
+            file.write(b'{"page":5}\n{"page":6,"data":[{"id"')
+        logger.info("3. Resume the crawl from the checkpoint.")
+        reported = []
+        resumed = crawl(client, checkpoint, progress=reported.append)
+        logger.info("4. Verify every saved page was revalidated and the remaining pages were requested.")
+        checks.equal(server.request_count, 4 + 4 + 6)
+        logger.info("5. Verify the crawl matches an uninterrupted one and progress reached the last page.")
+        checks.equal(resumed[:4], first)
+        checks.equal([airport for data in resumed for airport in data], server.airports)
+        checks.equal([progress.page for progress in reported], list(range(5, 11)))
+        checks.equal((reported[-1].pages_done, reported[-1].last_page, reported[-1].eta), (10, 10, 0))
+        logger.info("6. Rerun the completed crawl and verify it is served from the checkpoint.")
+        checks.equal(crawl(client, checkpoint), resumed)
+        checks.equal(server.request_count, 4 + 4 + 6 + 10)
+
+
+def test__crawl__changed_pages_restart(tmp_path):
+    """
+    Tests a crawl restarting from page 1 when a checkpointed page changed on the server.
+    Steps:
+
+    1. Crawl the first four pages of the airports GET API endpoint with a checkpoint and stop.
+    2. Change an airport on the second checkpointed page.
+    3. Resume the crawl from the checkpoint.
+    4. Verify revalidation stopped at the changed page and the crawl restarted with the current data.
+    """
+    with StandInServer(airport_count=100, page_size=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        checkpoint = tmp_path / "airports.crawl"
+        logger.info("1. Crawl the first four pages of the airports GET API endpoint with a checkpoint and stop.")
+        crawl(client, checkpoint, pages=4)
+        logger.info("2. Change an airport on the second checkpointed page.")
+        server.airports[15]["attributes"]["altitude"] += 1
+        logger.info("3. Resume the crawl from the checkpoint.")
+        resumed = crawl(client, checkpoint)
+        logger.info("4. Verify revalidation stopped at the changed page and the crawl restarted with the current data.")
+        checks.equal(server.request_count, 4 + 2 + 10)
+        checks.equal([airport for data in resumed for airport in data], server.airports)
+
+
+def test__crawl__failed_page_not_saved(tmp_path):
+    """
+    Tests a page answered with an error stopping the crawl without completing its checkpoint.
+    Steps:
+
+    1. Crawl the airports GET API endpoint while page 5 answers with a server error.
+    2. Verify the error is raised.
+    3. Resume the crawl once the page is answered again.
+    4. Verify the resumed crawl returned every airport.
+    """
+    with StandInServer(airport_count=100, page_size=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        checkpoint = tmp_path / "airports.crawl"
+        routes = list(server.routes)
+        airports_route = next(index for index, (method, pattern, _) in enumerate(routes) if method == "GET" and pattern.match("airports"))
+        method, pattern, get_airports = routes[airports_route]
+
+        def failing_page(*, query, **kwargs):
+            if query.get("page") == ["5"]:
+                return StandInResponse(http.HTTPStatus.INTERNAL_SERVER_ERROR, {"errors": []})
+            return get_airports(query=query, **kwargs)
+
+        server.routes[airports_route] = (method, pattern, failing_page)
+        logger.info("1. Crawl the airports GET API endpoint while page 5 answers with a server error.")
+        logger.info("2. Verify the error is raised.")
+        with pytest.raises(requests.exceptions.HTTPError):
+            crawl(client, checkpoint)
+        logger.info("3. Resume the crawl once the page is answered again.")
+        server.routes[airports_route] = routes[airports_route]
+        resumed = crawl(client, checkpoint)
+        logger.info("4. Verify the resumed crawl returned every airport.")
+        checks.equal([airport for data in resumed for airport in data], server.airports)
@@ -0,0 +1,82 @@
+import http
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.data import AirportDistanceResultModel, Airports
+from airgap_api.data.catalog import AirportCatalog, CatalogPage
+from airgap_api.data.distance import DistanceEngine
+
+pytestmark = [pytest.mark.catalog]
+
+
+@pytest.fixture()
+def distance_engine(tmp_path):
+    path = tmp_path / "airport_catalog.bin"
+    AirportCatalog.write(path=path, pages=[CatalogPage(page=1, records=[Airports.MAG.model_dump(), Airports.CYG.model_dump()])])
+    with AirportCatalog(path=path) as catalog:
+        yield DistanceEngine(catalog=catalog)
+
+
+def test__distance__pair(distance_engine):
+    """
+    Tests the offline distance engine for a single pair of airports.
+    Steps:
+
+    1. Calculate the distance between two airports.
+    2. Verify distances match the values returned by the airports distance endpoint.
+    """
+    logger.info("1. Calculate the distance between two airports.")
+    distance = distance_engine.distance(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+    logger.info("2. Verify distances match the values returned by the airports distance endpoint.")
+    checks.almost_equal(distance.kilometers, 3451.0132605573453, msg="Kilometers")
+    checks.almost_equal(distance.miles, 2142.86743976846, msg="Miles")
+    checks.almost_equal(distance.nautical_miles, 1862.1000015367488, msg="Nautical Miles")
+
+
+def test__distance__matrix(distance_engine):
+    """
+    Tests the offline distance engine matrix mode.
+    Steps:
+
+    1. Calculate the distance matrix for a set of airports.
+    2. Verify the matrix is symmetric with a zero diagonal.
+    3. Verify the matrix agrees with the pairs calculation.
+    """
+    airport_ids = [Airports.MAG.id, Airports.CYG.id]
+    logger.info("1. Calculate the distance matrix for a set of airports.")
+    matrix = distance_engine.matrix(airport_ids=airport_ids)
+    logger.info("2. Verify the matrix is symmetric with a zero diagonal.")
+    assert matrix.kilometers.shape == (2, 2)
+    checks.equal(matrix.kilometers[0, 0], 0.0)
+    checks.almost_equal(matrix.kilometers[0, 1], matrix.kilometers[1, 0])
+    logger.info("3. Verify the matrix agrees with the pairs calculation.")
+    pairs = distance_engine.pairs(from_ids=airport_ids, to_ids=airport_ids[::-1])
+    checks.almost_equal(matrix.miles[0, 1], pairs.miles[0])
+    checks.almost_equal(matrix.nautical_miles[1, 0], pairs.nautical_miles[1])
+
+
+@pytest.mark.api
+@pytest.mark.slow
+def test__distance__conforms_to_endpoint(ag_api_client, airport_catalog):
+    """
+    Tests the offline distance engine against the airports distance endpoint for a sample of airport pairs.
+    Steps:
+
+    1. Select a sample of airport pairs from the catalog.
+    2. Perform call to airports distance API endpoint for each pair.
+    3. Verify the offline distances agree with the endpoint.
+    """
+    logger.info("1. Select a sample of airport pairs from the catalog.")
+    airport_ids = [airport_id.decode() for airport_id in airport_catalog.rows["id"][::max(1, len(airport_catalog) // 10)]]
+    pairs = list(zip(airport_ids, airport_ids[1:] + airport_ids[:1]))
+    engine = DistanceEngine(catalog=airport_catalog)
+    offline = engine.pairs(from_ids=[pair[0] for pair in pairs], to_ids=[pair[1] for pair in pairs])
+    for index, (from_id, to_id) in enumerate(pairs):
+        logger.info("2. Perform call to airports distance API endpoint for each pair.")
+        response = ag_api_client.airports.distance(from_id=from_id, to_id=to_id)
+        assert response.status_code == http.HTTPStatus.OK
+        distance_data = AirportDistanceResultModel(**response.json()["data"])
+        logger.info("3. Verify the offline distances agree with the endpoint.")
+        checks.almost_equal(offline.kilometers[index], distance_data.attributes.kilometers, msg=f"Kilometers {from_id}-{to_id}")
+        checks.almost_equal(offline.miles[index], distance_data.attributes.miles, msg=f"Miles {from_id}-{to_id}")
+        checks.almost_equal(offline.nautical_miles[index], distance_data.attributes.nautical_miles, msg=f"Nautical Miles {from_id}-{to_id}")
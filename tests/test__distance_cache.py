@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient, AsyncAirportGapAPIClient
+from airgap_api.api.distance_cache import DistanceCache
+from airgap_api.data import Airports
+from airgap_api.data.catalog import AirportCatalog
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.distance_cache]
+
+
+def test__distance_cache__symmetric_and_persistent(tmp_path):
+    """
+    Tests distance results being served from the cache in either direction and from the SQLite file.
+    Steps:
+
+    1. Perform call to airports distance API endpoint through the cache.
+    2. Perform the same call with the airports swapped.
+    3. Verify the reversed result was served from the cache with the airports swapped.
+    4. Open a second cache on the same file.
+    5. Verify the result is served from the file without a request.
+    6. Verify a client of another API origin does not get the stored result.
+    """
+    with StandInServer(airport_count=10) as server:
+        with DistanceCache(path=tmp_path / "distances.sqlite") as cache:
+            client = AirportGapAPIClient(base_url=server.base_url, distance_cache=cache)
+            logger.info("1. Perform call to airports distance API endpoint through the cache.")
+            forward = client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+            logger.info("2. Perform the same call with the airports swapped.")
+            backward = client.airports.distance_typed(from_id=Airports.CYG.id, to_id=Airports.MAG.id)
+            logger.info("3. Verify the reversed result was served from the cache with the airports swapped.")
+            checks.equal(server.request_count, 1)
+            checks.equal((cache.stats.hits, cache.stats.misses, cache.stats.stores), (1, 1, 1))
+            checks.equal(backward.attributes.from_airport, forward.attributes.to_airport)
+            checks.equal(backward.attributes.to_airport, forward.attributes.from_airport)
+            checks.equal(backward.attributes.kilometers, forward.attributes.kilometers)
+            checks.equal(backward.id, f"{Airports.CYG.id}-{Airports.MAG.id}")
+
+        logger.info("4. Open a second cache on the same file.")
+        with DistanceCache(path=tmp_path / "distances.sqlite") as cache:
+            client = AirportGapAPIClient(base_url=server.base_url, distance_cache=cache)
+            logger.info("5. Verify the result is served from the file without a request.")
+            checks.equal(client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id), forward)
+            checks.equal(server.request_count, 1)
+            checks.equal(cache.stats.hits, 1)
+            logger.info("6. Verify a client of another API origin does not get the stored result.")
+            with StandInServer(airport_count=10) as other_server:
+                other_client = AirportGapAPIClient(base_url=other_server.base_url, distance_cache=cache)
+                other_client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+                checks.equal(other_server.request_count, 1)
+                checks.equal(cache.stats.misses, 1)
+
+
+def test__distance_cache__catalog_invalidation(tmp_path):
+    """
+    Tests cached distance results being invalidated when the catalog snapshot of an airport changes.
+    Steps:
+
+    1. Build a catalog snapshot and a cache checked against it.
+    2. Perform call to airports distance API endpoint through the cache twice.
+    3. Verify the second call was served from the cache.
+    4. Change an airport on the server and refresh the snapshot.
+    5. Verify the next call misses the cache and reaches the server.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        logger.info("1. Build a catalog snapshot and a cache checked against it.")
+        with AirportCatalog.build(client=client, path=tmp_path / "airport_catalog.bin") as catalog, DistanceCache(path=tmp_path / "distances.sqlite", catalog=catalog) as cache:
+            client.distance_cache = cache
+            logger.info("2. Perform call to airports distance API endpoint through the cache twice.")
+            client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+            requests_before = server.request_count
+            client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+            logger.info("3. Verify the second call was served from the cache.")
+            checks.equal(server.request_count, requests_before)
+            logger.info("4. Change an airport on the server and refresh the snapshot.")
+            server.airports_by_id[Airports.CYG.id]["attributes"]["altitude"] += 1
+            checks.equal(catalog.refresh(client=client), [1])
+            requests_before = server.request_count
+            logger.info("5. Verify the next call misses the cache and reaches the server.")
+            result = client.airports.distance_typed(from_id=Airports.CYG.id, to_id=Airports.MAG.id)
+            checks.equal(server.request_count, requests_before + 1)
+            checks.equal(cache.stats.invalidations, 1)
+            checks.equal(result.attributes.from_airport.altitude, Airports.CYG.attributes.altitude + 1)
+
+
+def test__distance_cache__bounded_and_async():
+    """
+    Tests the in-memory cache staying within its bound and serving the async client.
+    Steps:
+
+    1. Perform calls to airports distance API endpoint for two pairs with a one entry cache.
+    2. Verify the older pair was evicted.
+    3. Perform the same call twice with the async client.
+    4. Verify the second call was served from the cache.
+    """
+    with StandInServer(airport_count=10) as server:
+        cache = DistanceCache(max_entries=1)
+        client = AirportGapAPIClient(base_url=server.base_url, distance_cache=cache)
+        logger.info("1. Perform calls to airports distance API endpoint for two pairs with a one entry cache.")
+        client.airports.distance_typed(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+        client.airports.distance_typed(from_id=Airports.MAG.id, to_id="AAA")
+        logger.info("2. Verify the older pair was evicted.")
+        checks.equal(len(cache), 1)
+        checks.equal(cache.stats.evictions, 1)
+
+        async def distances():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, distance_cache=cache) as async_client:
+                return [await async_client.airports.distance_typed(from_id="AAA", to_id=Airports.MAG.id) for _ in range(2)]
+
+        logger.info("3. Perform the same call twice with the async client.")
+        requests_before = server.request_count
+        first, second = asyncio.run(distances())
+        logger.info("4. Verify the second call was served from the cache.")
+        checks.equal(server.request_count, requests_before)
+        checks.equal(first, second)
+        checks.equal(first.attributes.from_airport.iata, "AAA")
@@ -0,0 +1,142 @@
+import asyncio
+import httpx
+import pytest
+import requests
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient, AsyncAirportGapAPIClient
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.distance_matrix]
+
+AIRPORT_IDS = [Airports.MAG.id, Airports.CYG.id, "AAA", "AAB"]
+
+
+def test__distance_matrix__pairs():
+    """
+    Tests distances for a list of pairs being fetched once per unordered pair.
+    Steps:
+
+    1. Perform bulk distance call for pairs including a reversed duplicate.
+    2. Verify one request was sent per unordered pair.
+    3. Verify a result is returned per pair in the requested direction.
+    4. Verify progress was reported for every pair.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        reported = []
+        pairs = [(Airports.MAG.id, Airports.CYG.id), (Airports.CYG.id, Airports.MAG.id), (Airports.MAG.id, "AAA")]
+        logger.info("1. Perform bulk distance call for pairs including a reversed duplicate.")
+        results = client.airports.distances_for_pairs(pairs=pairs, max_workers=4, progress=reported.append)
+        logger.info("2. Verify one request was sent per unordered pair.")
+        checks.equal(server.request_count, 2)
+        logger.info("3. Verify a result is returned per pair in the requested direction.")
+        checks.equal([(result.attributes.from_airport.iata, result.attributes.to_airport.iata) for result in results], pairs)
+        checks.equal(results[0].attributes.kilometers, results[1].attributes.kilometers)
+        logger.info("4. Verify progress was reported for every pair.")
+        checks.equal([progress.completed for progress in reported], [1, 2])
+        checks.equal(reported[-1].fraction, 1.0)
+
+
+def test__distance_matrix__dense_and_resumable(tmp_path):
+    """
+    Tests a dense distance matrix being resumed from the checkpoint of an earlier partial run.
+    Steps:
+
+    1. Perform bulk distance call for a pair that fails and a pair that succeeds with a checkpoint.
+    2. Verify the failure was raised and the successful pair was kept.
+    3. Perform distance matrix call for four airports with the same checkpoint.
+    4. Verify only the pairs missing from the checkpoint were requested.
+    5. Verify the matrix is symmetric with a zero diagonal and matches the distance endpoint.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        checkpoint = tmp_path / "distances.sqlite"
+        logger.info("1. Perform bulk distance call for a pair that fails and a pair that succeeds with a checkpoint.")
+        with pytest.raises(requests.HTTPError):
+            client.airports.distances_for_pairs(pairs=[(Airports.MAG.id, Airports.CYG.id), (Airports.MAG.id, "INVALID")], max_workers=1, checkpoint=checkpoint)
+        logger.info("2. Verify the failure was raised and the successful pair was kept.")
+        checks.equal(server.request_count, 2)
+        reported = []
+        logger.info("3. Perform distance matrix call for four airports with the same checkpoint.")
+        kilometers, miles, nautical_miles = client.airports.distance_matrix(airport_ids=AIRPORT_IDS, checkpoint=checkpoint, progress=reported.append)
+        logger.info("4. Verify only the pairs missing from the checkpoint were requested.")
+        checks.equal(server.request_count, 2 + 5)
+        checks.equal((reported[-1].completed, reported[-1].total, reported[-1].cached), (6, 6, 1))
+        logger.info("5. Verify the matrix is symmetric with a zero diagonal and matches the distance endpoint.")
+        checks.equal(kilometers.shape, (4, 4))
+        checks.is_true((kilometers == kilometers.T).all())
+        checks.is_true((kilometers.diagonal() == 0).all())
+        expected = client.airports.distance_typed(from_id=Airports.CYG.id, to_id="AAB").attributes
+        checks.equal((kilometers[1, 3], miles[3, 1], nautical_miles[1, 3]), (expected.kilometers, expected.miles, expected.nautical_miles))
+
+
+def test__distance_matrix__async():
+    """
+    Tests a dense distance matrix fetched with the async client.
+    Steps:
+
+    1. Perform distance matrix call for four airports with the async client.
+    2. Verify one request was sent per pair and the matrix is symmetric.
+    """
+    with StandInServer(airport_count=10) as server:
+        async def matrix():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, max_concurrency=3) as client:
+                return await client.airports.distance_matrix(airport_ids=AIRPORT_IDS)
+
+        logger.info("1. Perform distance matrix call for four airports with the async client.")
+        kilometers = asyncio.run(matrix()).kilometers
+        logger.info("2. Verify one request was sent per pair and the matrix is symmetric.")
+        checks.equal(server.request_count, 6)
+        checks.is_true((kilometers == kilometers.T).all())
+        checks.equal(int((kilometers > 0).sum()), 12)
+
+
+def test__distance_matrix__async_bounded_and_resumable(tmp_path):
+    """
+    Tests the async distance matrix honouring max_workers and being resumed from the checkpoint of an earlier partial run.
+    Steps:
+
+    1. Perform async bulk distance call for a pair that succeeds, a pair that fails and further pairs with a checkpoint.
+    2. Verify the failure was raised, the remaining pairs were cancelled and the successful pair was kept.
+    3. Perform async distance matrix call for four airports with the same checkpoint and two workers.
+    4. Verify only the pairs missing from the checkpoint were requested, at most two at a time.
+    """
+    with StandInServer(airport_count=10, latency=0.05) as server:
+        checkpoint = tmp_path / "distances.sqlite"
+        in_flight, peaks = 0, []
+
+        async def run(call, **kwargs):
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, max_concurrency=8) as client:
+                airports = client.airports
+                fetch = airports._fetch_distance
+
+                async def counted(pair):
+                    nonlocal in_flight
+                    in_flight += 1
+                    peaks.append(in_flight)
+                    try:
+                        return await fetch(pair)
+                    finally:
+                        in_flight -= 1
+
+                airports._fetch_distance = counted
+                return await getattr(airports, call)(checkpoint=checkpoint, **kwargs)
+
+        pairs = [(Airports.MAG.id, Airports.CYG.id), (Airports.MAG.id, "INVALID"), (Airports.MAG.id, "AAA"), (Airports.MAG.id, "AAB")]
+        logger.info("1. Perform async bulk distance call for a pair that succeeds, a pair that fails and further pairs with a checkpoint.")
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run("distances_for_pairs", pairs=pairs, max_workers=1))
+        logger.info("2. Verify the failure was raised, the remaining pairs were cancelled and the successful pair was kept.")
+        # The pair queued behind the failure may already be on its way when it is cancelled.
+        first_run_requests = server.request_count
+        checks.less_equal(first_run_requests, 3)
+        checks.equal(max(peaks), 1)
+        peaks.clear()
+        logger.info("3. Perform async distance matrix call for four airports with the same checkpoint and two workers.")
+        kilometers = asyncio.run(run("distance_matrix", airport_ids=AIRPORT_IDS, max_workers=2)).kilometers
+        logger.info("4. Verify only the pairs missing from the checkpoint were requested, at most two at a time.")
+        checks.equal(server.request_count - first_run_requests, 5)
+        checks.equal(max(peaks), 2)
+        checks.is_true((kilometers == kilometers.T).all())
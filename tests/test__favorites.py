@@ -2,13 +2,14 @@ import http
 import pytest
 from loguru import logger
 import pytest_check as checks
+from airgap_api.api.favorites_sync import SyncAction
 from airgap_api.data import FavoriteAirportDataPageResponse, FavoriteModel, Airports, ErrorListResponseModel
 
 
 pytestmark = [pytest.mark.api, pytest.mark.favorites]
 
 
-def test__favorites__get_initial_page(ag_api_client, airgap_token):
+def test__favorites__get_initial_page(ag_auth_client, airgap_token):
     """
     Tests the favorites endpoint to get first page of favorites.
     Steps:
@@ -17,12 +18,26 @@ def test__favorites__get_initial_page(ag_api_client, airgap_token):
     2. Verify response status code.
     """
     logger.info("1. Perform call to favorites API endpoint.")
-    response = ag_api_client.favorites.get(token=airgap_token)
+    response = ag_auth_client.favorites.get(token=airgap_token)
     logger.info("2. Verify response status code.")
     assert response.status_code == http.HTTPStatus.OK
 
 
-def test__favorites__remove_all(ag_api_client, airgap_token):
+def test__favorites__get_all_pages(ag_auth_client, airgap_token):
+    """
+    Tests the favorites endpoint to get every page of favorites concurrently.
+    Steps:
+
+    1. Get all pages of favorites using a worker pool.
+    2. Verify format of each page of favorites against model.
+    """
+    logger.info("1. Get all pages of favorites using a worker pool.")
+    for page_data in ag_auth_client.favorites.get_all(token=airgap_token, max_workers=4):
+        logger.info("2. Verify format of each page of favorites against model.")
+        FavoriteAirportDataPageResponse.validate_python(page_data)
+
+
+def test__favorites__remove_all(ag_auth_client, airgap_token):
     """
     Tests the favorites endpoint to remove all Airports from favorites.
     Steps:
@@ -36,7 +51,7 @@ def test__favorites__remove_all(ag_api_client, airgap_token):
     6. Verify format of error data against model.
     """
     logger.info("1. Get all current favorites.")
-    response = ag_api_client.favorites.get(token=airgap_token)
+    response = ag_auth_client.favorites.get(token=airgap_token)
     favorites = response.json()["data"]
     logger.info("2. Ensure favorites contain an Airport.")
     if favorites:
@@ -44,22 +59,22 @@ def test__favorites__remove_all(ag_api_client, airgap_token):
         favorite = f_m[0]
     else:
         logger.info("2.1. Adding an Airport to favorites.")
-        response = ag_api_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
+        response = ag_auth_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
         assert response.status_code == http.HTTPStatus.CREATED
         favorite = FavoriteModel(**response.json()["data"])
 
     logger.debug(f"Working with favorite id: {favorite.id}")
     logger.info("3. Verify specific Airport is contained within the favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.OK
     FavoriteModel(**response.json()["data"])
 
     logger.info("4. Perform call to remove all favorites API endpoint.")
-    response = ag_api_client.favorites.remove_all(token=airgap_token)
+    response = ag_auth_client.favorites.remove_all(token=airgap_token)
     assert response.status_code == http.HTTPStatus.NO_CONTENT
 
     logger.info("5. Expect specific Airport to not be in favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.NOT_FOUND
 
     logger.info("6. Verify format of error data against model.")
@@ -69,7 +84,7 @@ def test__favorites__remove_all(ag_api_client, airgap_token):
     checks.equal(errors.errors[0].detail, "The page you requested could not be found")
 
 
-def test__favorites__remove_single(ag_api_client, airgap_token):
+def test__favorites__remove_single(ag_auth_client, airgap_token):
     """
     Tests the favorites endpoint to remove a specific Airport from favorites.
     Steps:
@@ -83,7 +98,7 @@ def test__favorites__remove_single(ag_api_client, airgap_token):
     6. Verify format of error data against model.
     """
     logger.info("1. Get all current favorites.")
-    response = ag_api_client.favorites.get(token=airgap_token)
+    response = ag_auth_client.favorites.get(token=airgap_token)
     favorites = response.json()["data"]
     logger.info("2. Ensure favorites contain an Airport.")
     if favorites:
@@ -91,22 +106,22 @@ def test__favorites__remove_single(ag_api_client, airgap_token):
         favorite = f_m[0]
     else:
         logger.info("2.1. Adding an Airport to favorites.")
-        response = ag_api_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
+        response = ag_auth_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
         assert response.status_code == http.HTTPStatus.CREATED
         favorite = FavoriteModel(**response.json()["data"])
 
     logger.debug(f"Working with favorite id: {favorite.id}")
     logger.info("3. Verify specific Airport is contained within the favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.OK
     FavoriteModel(**response.json()["data"])
 
     logger.info("4. Perform call to remove specific favorite API endpoint.")
-    response = ag_api_client.favorites.remove(token=airgap_token, fav_id=favorite.id)
+    response = ag_auth_client.favorites.remove(token=airgap_token, fav_id=favorite.id)
     assert response.status_code == http.HTTPStatus.NO_CONTENT
 
     logger.info("5. Expect specific Airport to not be in favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.NOT_FOUND
 
     logger.info("6. Verify format of error data against model.")
@@ -116,7 +131,7 @@ def test__favorites__remove_single(ag_api_client, airgap_token):
     checks.equal(errors.errors[0].detail, "The page you requested could not be found")
 
 
-def test__favorites__update_note(ag_api_client, airgap_token):
+def test__favorites__update_note(ag_auth_client, airgap_token):
     """
     Tests the favorites endpoint to update the note on a specific Airport from favorites.
     Steps:
@@ -129,7 +144,7 @@ def test__favorites__update_note(ag_api_client, airgap_token):
     5. Get note from favorites.
     """
     logger.info("1. Get all current favorites.")
-    response = ag_api_client.favorites.get(token=airgap_token)
+    response = ag_auth_client.favorites.get(token=airgap_token)
     favorites = response.json()["data"]
     logger.info("2. Ensure favorites contain an Airport.")
     if favorites:
@@ -137,25 +152,84 @@ def test__favorites__update_note(ag_api_client, airgap_token):
         favorite = f_m[0]
     else:
         logger.info("2.1. Adding an Airport to favorites.")
-        response = ag_api_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
+        response = ag_auth_client.favorites.add(airport_id=Airports.MAG.id, token=airgap_token)
         assert response.status_code == http.HTTPStatus.CREATED
         favorite = FavoriteModel(**response.json()["data"])
 
     logger.debug(f"Working with favorite id: {favorite.id}")
     logger.info("3. Verify specific Airport is contained within the favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.OK
     FavoriteModel(**response.json()["data"])
     current_note = favorite.attributes.note
     logger.debug(f"Note on favorite {favorite.id} is {current_note}")
 
     logger.info("4. Perform call to update the note.")
-    response = ag_api_client.favorites.update_note(token=airgap_token, fav_id=favorite.id, note="One of the best")
+    response = ag_auth_client.favorites.update_note(token=airgap_token, fav_id=favorite.id, note="One of the best")
     assert response.status_code == http.HTTPStatus.OK
 
     logger.info("5. Get note from favorites.")
-    response = ag_api_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
+    response = ag_auth_client.favorites.get_by_id(fav_id=favorite.id, token=airgap_token)
     assert response.status_code == http.HTTPStatus.OK
     updated_note = FavoriteModel(**response.json()["data"]).attributes.note
     checks.not_equal(updated_note, current_note)
     checks.equal(updated_note, "One of the best")
+
+
+def test__favorites__get_by_id_typed(ag_auth_client, airgap_token):
+    """
+    Tests the favorites endpoints parsed straight into models from the response bytes.
+    Steps:
+
+    1. Add an Airport to favorites.
+    2. Perform typed call to favorites GET by ID API endpoint.
+    3. Verify data content matches expected.
+    4. Verify favorite is contained within the typed favorites page.
+    """
+    logger.info("1. Add an Airport to favorites.")
+    response = ag_auth_client.favorites.add(airport_id=Airports.CYG.id, note="Typed", token=airgap_token)
+    assert response.status_code == http.HTTPStatus.CREATED
+    favorite_id = response.json()["data"]["id"]
+    logger.info("2. Perform typed call to favorites GET by ID API endpoint.")
+    favorite = ag_auth_client.favorites.get_by_id_typed(fav_id=favorite_id, token=airgap_token)
+    logger.info("3. Verify data content matches expected.")
+    checks.equal(favorite.attributes.airport.iata, Airports.CYG.attributes.iata)
+    checks.equal(favorite.attributes.note, "Typed")
+    logger.info("4. Verify favorite is contained within the typed favorites page.")
+    page = ag_auth_client.favorites.get_typed(token=airgap_token)
+    checks.is_in(favorite_id, [item.id for item in page.data])
+    ag_auth_client.favorites.remove(fav_id=favorite_id, token=airgap_token)
+
+
+def test__favorites__sync(ag_auth_client, airgap_token):
+    """
+    Tests syncing the favorites to a desired state with the minimal set of calls.
+    Steps:
+
+    1. Sync the favorites to contain two Airports.
+    2. Verify the favorites match the desired state.
+    3. Sync the favorites to contain one Airport with a different note.
+    4. Verify only a note update and a removal were performed.
+    5. Sync the favorites to the same state again.
+    6. Verify no calls were performed.
+    """
+    logger.info("1. Sync the favorites to contain two Airports.")
+    report = ag_auth_client.favorites.sync(desired={Airports.MAG.id: "Home", Airports.CYG.id: "Work"}, token=airgap_token)
+    assert report.ok, report.failed
+    logger.info("2. Verify the favorites match the desired state.")
+    favorites = FavoriteAirportDataPageResponse.validate_python(ag_auth_client.favorites.get(token=airgap_token).json()["data"])
+    checks.equal({favorite.attributes.airport.iata: favorite.attributes.note for favorite in favorites}, {Airports.MAG.id: "Home", Airports.CYG.id: "Work"})
+
+    logger.info("3. Sync the favorites to contain one Airport with a different note.")
+    report = ag_auth_client.favorites.sync(desired={Airports.MAG.id: "Updated"}, token=airgap_token)
+    assert report.ok, report.failed
+    logger.info("4. Verify only a note update and a removal were performed.")
+    checks.equal(report.count(SyncAction.UPDATE_NOTE), 1)
+    checks.equal(report.count(SyncAction.REMOVE), 1)
+    checks.equal(report.calls, 2)
+
+    logger.info("5. Sync the favorites to the same state again.")
+    report = ag_auth_client.favorites.sync(desired={Airports.MAG.id: "Updated"}, token=airgap_token)
+    logger.info("6. Verify no calls were performed.")
+    checks.equal(report.calls, 0)
+    checks.equal(report.count(SyncAction.UNCHANGED), 1)
@@ -0,0 +1,265 @@
+import asyncio
+import threading
+import time
+import pytest
+import requests
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient, AsyncAirportGapAPIClient
+from airgap_api.api.hedging import HedgePolicy
+from airgap_api.api.instrumentation import EventSink
+from airgap_api.api.rate_limiter import RateLimiter
+from airgap_api.api.transport import TransportConfig
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.hedging]
+
+
+def test__hedging__timeout_policy():
+    """
+    Tests choosing a timeout by verb and endpoint.
+    Steps:
+
+    1. Build a transport with verb, endpoint and verb plus endpoint timeouts.
+    2. Verify the most specific matching timeout is chosen.
+    3. Verify requests matching nothing use the default timeouts.
+    """
+    logger.info("1. Build a transport with verb, endpoint and verb plus endpoint timeouts.")
+    transport = TransportConfig(timeouts={"POST": (2.0, 30.0), "airports/*": (1.0, 5.0), "GET airports/*": (1.0, 2.0), "favorites*": (3.0, 10.0)})
+    logger.info("2. Verify the most specific matching timeout is chosen.")
+    checks.equal(transport.timeout_for(method="get", endpoint="/airports/MAG"), (1.0, 2.0))
+    checks.equal(transport.timeout_for(method="POST", endpoint="airports/distance"), (1.0, 5.0))
+    checks.equal(transport.timeout_for(method="POST", endpoint="tokens"), (2.0, 30.0))
+    checks.equal(transport.timeout_for(method="DELETE", endpoint="favorites/12"), (3.0, 10.0))
+    logger.info("3. Verify requests matching nothing use the default timeouts.")
+    checks.equal(transport.timeout_for(method="GET", endpoint="airports"), (10.0, 60.0))
+
+
+def test__hedging__endpoint_timeout():
+    """
+    Tests a per endpoint read timeout cutting off a stalled request.
+    Steps:
+
+    1. Request an airport from a slow server with a short airport read timeout.
+    2. Verify the request times out.
+    3. Verify the airports page, which has no timeout of its own, succeeds.
+    """
+    with StandInServer(airport_count=10, latency=0.3) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, transport=TransportConfig(timeouts={"GET airports/*": (1.0, 0.1)}))
+        logger.info("1. Request an airport from a slow server with a short airport read timeout.")
+        logger.info("2. Verify the request times out.")
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("3. Verify the airports page, which has no timeout of its own, succeeds.")
+        checks.equal(client.airports.get().status_code, 200)
+
+
+def test__hedging__hedge_wins_over_slow_request():
+    """
+    Tests hedged airport requests answering before slow outliers.
+    Steps:
+
+    1. Request airports from a server where every other request stalls.
+    2. Verify a hedge fired and won for every stalled request.
+    3. Verify no request waited for a stalled answer.
+    """
+    with StandInServer(airport_count=10, slow_every=2, slow_latency=1.0) as server:
+        hedging = HedgePolicy(initial_delay=0.05)
+        client = AirportGapAPIClient(base_url=server.base_url, hedging=hedging)
+        logger.info("1. Request airports from a server where every other request stalls.")
+        started = time.perf_counter()
+        responses = [client.airports.get_by_id(airport_id=Airports.MAG.id) for _ in range(5)]
+        elapsed = time.perf_counter() - started
+    logger.info("2. Verify a hedge fired and won for every stalled request.")
+    checks.equal([response.status_code for response in responses], [200] * 5)
+    checks.equal(hedging.stats.requests, 5)
+    checks.equal(hedging.stats.fired, 4)
+    checks.equal(hedging.stats.won, 4)
+    checks.equal(hedging.stats.win_rate, 1.0)
+    logger.info("3. Verify no request waited for a stalled answer.")
+    checks.less(elapsed, 1.0)
+
+
+def test__hedging__no_hedge_for_fast_or_unsafe_requests():
+    """
+    Tests hedges not firing for fast responses or requests that are not hedged.
+    Steps:
+
+    1. Request airports from a fast server.
+    2. Verify no hedge fired.
+    3. Request a distance from a server where every request stalls.
+    4. Verify the POST was not hedged.
+    """
+    with StandInServer(airport_count=10) as server:
+        hedging = HedgePolicy(initial_delay=0.5)
+        client = AirportGapAPIClient(base_url=server.base_url, hedging=hedging)
+        logger.info("1. Request airports from a fast server.")
+        for _ in range(3):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("2. Verify no hedge fired.")
+        checks.equal(hedging.stats.requests, 3)
+        checks.equal(hedging.stats.fired, 0)
+    with StandInServer(airport_count=10, latency=0.1) as server:
+        hedging = HedgePolicy(initial_delay=0.01)
+        client = AirportGapAPIClient(base_url=server.base_url, hedging=hedging)
+        logger.info("3. Request a distance from a server where every request stalls.")
+        client.airports.distance(from_id=Airports.MAG.id, to_id=Airports.CYG.id)
+        logger.info("4. Verify the POST was not hedged.")
+        checks.equal(hedging.stats.requests, 0)
+        checks.equal(server.request_count, 1)
+
+
+def test__hedging__rate_budget():
+    """
+    Tests hedges drawing on the rate limiter and being skipped once it is spent.
+    Steps:
+
+    1. Request airports with a rate budget of three requests where the second stalls.
+    2. Verify the hedge fired and took the last token.
+    3. Request airports with a rate budget of two requests where the second stalls.
+    4. Verify the hedge was skipped and the stalled request answered.
+    """
+    with StandInServer(airport_count=10, slow_every=2, slow_latency=0.3) as server:
+        rate_limiter = RateLimiter(rate=0.001, capacity=3)
+        hedging = HedgePolicy(initial_delay=0.05)
+        client = AirportGapAPIClient(base_url=server.base_url, rate_limiter=rate_limiter, hedging=hedging)
+        logger.info("1. Request airports with a rate budget of three requests where the second stalls.")
+        for _ in range(2):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("2. Verify the hedge fired and took the last token.")
+        checks.equal(hedging.stats.fired, 1)
+        checks.greater(rate_limiter.try_acquire(), 0)
+    with StandInServer(airport_count=10, slow_every=2, slow_latency=0.3) as server:
+        hedging = HedgePolicy(initial_delay=0.05)
+        client = AirportGapAPIClient(base_url=server.base_url, rate_limiter=RateLimiter(rate=0.001, capacity=2), hedging=hedging)
+        logger.info("3. Request airports with a rate budget of two requests where the second stalls.")
+        responses = [client.airports.get_by_id(airport_id=Airports.MAG.id) for _ in range(2)]
+        logger.info("4. Verify the hedge was skipped and the stalled request answered.")
+        checks.equal([response.status_code for response in responses], [200, 200])
+        checks.equal(hedging.stats.fired, 0)
+        checks.equal(hedging.stats.skipped, 1)
+        checks.equal(server.request_count, 2)
+
+
+def test__hedging__delay_follows_latency_percentile():
+    """
+    Tests the hedge delay following the observed latency of the endpoint.
+    Steps:
+
+    1. Verify the initial delay is used before enough requests were observed.
+    2. Request airports until enough latencies were observed.
+    3. Verify the delay is the latency percentile, bounded by the minimum delay.
+    """
+    with StandInServer(airport_count=10, latency=0.02) as server:
+        hedging = HedgePolicy(percentile=50, min_samples=5, initial_delay=1.0, min_delay=0.001)
+        client = AirportGapAPIClient(base_url=server.base_url, hedging=hedging)
+        logger.info("1. Verify the initial delay is used before enough requests were observed.")
+        checks.equal(hedging.delay(endpoint=f"airports/{Airports.MAG.id}"), 1.0)
+        logger.info("2. Request airports until enough latencies were observed.")
+        for _ in range(5):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+    logger.info("3. Verify the delay is the latency percentile, bounded by the minimum delay.")
+    delay = hedging.delay(endpoint=f"airports/{Airports.CYG.id}")
+    checks.between(delay, 0.015, 0.5)
+    hedging.min_delay = 0.8
+    checks.equal(hedging.delay(endpoint=f"airports/{Airports.CYG.id}"), 0.8)
+
+
+def test__hedging__async_hedge_wins():
+    """
+    Tests hedged airport requests in the async client.
+    Steps:
+
+    1. Warm up the client and its connection with one fast request.
+    2. Request airports from a server where every other request stalls.
+    3. Verify a hedge fired and won for every stalled request.
+    """
+    with StandInServer(airport_count=10, slow_every=2, slow_latency=2.0) as server:
+        # Well above a request on a cold client, so only the stalled requests are hedged.
+        hedging = HedgePolicy(initial_delay=0.25)
+
+        async def get_airports():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, hedging=hedging) as client:
+                logger.info("1. Warm up the client and its connection with one fast request.")
+                await client.airports.get_by_id(airport_id=Airports.MAG.id)
+                warm = hedging.stats.snapshot()
+                logger.info("2. Request airports from a server where every other request stalls.")
+                started = time.perf_counter()
+                responses = [await client.airports.get_by_id(airport_id=Airports.MAG.id) for _ in range(2)]
+                return warm, responses, time.perf_counter() - started
+
+        warm, responses, elapsed = asyncio.run(get_airports())
+    logger.info("3. Verify a hedge fired and won for every stalled request.")
+    checks.equal([response.status_code for response in responses], [200] * 2)
+    checks.equal(hedging.stats.fired - warm["fired"], 2)
+    checks.equal(hedging.stats.won - warm["won"], 2)
+    checks.less(elapsed, 1.5)
+
+
+class ThreadSink(EventSink):
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads = []
+
+    def emit(self, event) -> None:
+        self.threads.append(threading.current_thread().name)
+
+
+def test__hedging__request_on_calling_thread_and_close():
+    """
+    Tests hedged requests running on the calling thread and closing the client.
+    Steps:
+
+    1. Request airports from a server where every other request stalls.
+    2. Verify only the hedges ran on the hedge pool.
+    3. Close the client.
+    4. Verify the hedge timer thread stopped.
+    """
+    with StandInServer(airport_count=10, slow_every=2, slow_latency=1.0) as server:
+        hedging = HedgePolicy(initial_delay=0.05)
+        sink = ThreadSink()
+        timers = [thread for thread in threading.enumerate() if thread.name == "airgap-hedge-timer"]
+        logger.info("1. Request airports from a server where every other request stalls.")
+        with AirportGapAPIClient(base_url=server.base_url, hedging=hedging) as client:
+            client.instrumentation.add_sink(sink)
+            for _ in range(2):
+                client.airports.get_by_id(airport_id=Airports.MAG.id)
+            logger.info("2. Verify only the hedges ran on the hedge pool.")
+            checks.equal(hedging.stats.won, 1)
+            checks.equal(sink.threads[0], threading.current_thread().name)
+            checks.equal(len(sink.threads), 2)
+            checks.is_true(sink.threads[1].startswith("airgap-hedge"))
+            logger.info("3. Close the client.")
+        logger.info("4. Verify the hedge timer thread stopped.")
+        checks.equal([thread for thread in threading.enumerate() if thread.name == "airgap-hedge-timer"], timers)
+
+
+def test__hedging__async_caller_cancelled():
+    """
+    Tests a cancelled caller cancelling the hedged request it was waiting for.
+    Steps:
+
+    1. Start a hedged airport request against a slow server.
+    2. Cancel it before the hedge delay passed.
+    3. Verify no request task is left running.
+    """
+    with StandInServer(airport_count=10, latency=1.0) as server:
+        hedging = HedgePolicy(initial_delay=0.5)
+
+        async def cancel_request():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, hedging=hedging) as client:
+                logger.info("1. Start a hedged airport request against a slow server.")
+                request = asyncio.ensure_future(client.airports.get_by_id(airport_id=Airports.MAG.id))
+                await asyncio.sleep(0.1)
+                logger.info("2. Cancel it before the hedge delay passed.")
+                request.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await request
+                await asyncio.sleep(0.05)
+                return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        remaining = asyncio.run(cancel_request())
+    logger.info("3. Verify no request task is left running.")
+    checks.equal(remaining, [])
+    checks.equal(hedging.stats.fired, 0)
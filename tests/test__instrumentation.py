@@ -0,0 +1,108 @@
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.api_client import RateLimitReachedError, rate_limit_retry
+from airgap_api.api.instrumentation import EventSink, HistogramAggregator, Instrumentation, LatencyHistogram, LoguruSink, attempt_number, endpoint_template
+
+pytestmark = [pytest.mark.instrumentation]
+
+
+class CountingResponse:
+    def __init__(self, content: bytes):
+        self._content = content
+        self.content_reads = 0
+
+    @property
+    def content(self):
+        self.content_reads += 1
+        return self._content
+
+
+def test__instrumentation__endpoint_template():
+    """
+    Tests request paths are reduced to endpoint templates.
+    Steps:
+
+    1. Verify airport and favorite ids are replaced.
+    2. Verify named endpoints are kept.
+    """
+    logger.info("1. Verify airport and favorite ids are replaced.")
+    checks.equal(endpoint_template("airports/MAG"), "airports/{id}")
+    checks.equal(endpoint_template("favorites/1234"), "favorites/{id}")
+    logger.info("2. Verify named endpoints are kept.")
+    checks.equal(endpoint_template("airports?page=2"), "airports")
+    checks.equal(endpoint_template("airports/distance"), "airports/distance")
+    checks.equal(endpoint_template("favorites/clear_all"), "favorites/clear_all")
+
+
+def test__instrumentation__histogram_percentiles():
+    """
+    Tests the latency histogram percentiles.
+    Steps:
+
+    1. Record latencies of 1 to 1000 milliseconds.
+    2. Verify percentiles are within the histogram precision.
+    """
+    histogram = LatencyHistogram()
+    logger.info("1. Record latencies of 1 to 1000 milliseconds.")
+    for milliseconds in range(1, 1001):
+        histogram.record(milliseconds / 1000)
+    logger.info("2. Verify percentiles are within the histogram precision.")
+    checks.equal(histogram.count, 1000)
+    checks.almost_equal(histogram.percentile(50), 0.5, rel=0.02)
+    checks.almost_equal(histogram.percentile(95), 0.95, rel=0.02)
+    checks.almost_equal(histogram.percentile(99), 0.99, rel=0.02)
+
+
+def test__instrumentation__aggregates_events_without_reading_bodies():
+    """
+    Tests request events are aggregated per endpoint and bodies are only read when a sink needs them.
+    Steps:
+
+    1. Record requests to two airports with body logging disabled.
+    2. Verify the response bodies were only measured.
+    3. Verify events are aggregated per endpoint template.
+    """
+    aggregator = HistogramAggregator()
+    instrumentation = Instrumentation(sinks=[LoguruSink(body_level="TRACE"), aggregator])
+    responses = [CountingResponse(b'{"data": []}') for _ in range(2)]
+    logger.info("1. Record requests to two airports with body logging disabled.")
+    for airport_id, response in zip(["MAG", "CYG"], responses):
+        instrumentation.record(method="get", path=f"airports/{airport_id}", url=f"https://airportgap.com/api/airports/{airport_id}", status_code=200, elapsed=0.01, response=response)
+    logger.info("2. Verify the response bodies were only measured.")
+    checks.equal([response.content_reads for response in responses], [1, 1])
+    logger.info("3. Verify events are aggregated per endpoint template.")
+    summary = aggregator.percentiles()
+    checks.equal(list(summary), ["GET airports/{id}"])
+    checks.equal(summary["GET airports/{id}"]["count"], 2)
+    checks.equal(aggregator.status_codes["GET airports/{id}"], {200: 2})
+
+
+def test__instrumentation__attempt_number_reset():
+    """
+    Tests the retry attempt number being scoped to the retried call.
+    Steps:
+
+    1. Call a function that is rate limited once.
+    2. Verify the retry saw the second attempt number.
+    3. Verify the attempt number was restored after the call.
+    4. Verify a sink must implement emit.
+    """
+    seen = []
+
+    @rate_limit_retry
+    def rate_limited_once():
+        seen.append(attempt_number.get())
+        if len(seen) == 1:
+            raise RateLimitReachedError(retry_after=0)
+        return "response"
+
+    logger.info("1. Call a function that is rate limited once.")
+    checks.equal(rate_limited_once(), "response")
+    logger.info("2. Verify the retry saw the second attempt number.")
+    checks.equal(seen, [1, 2])
+    logger.info("3. Verify the attempt number was restored after the call.")
+    checks.equal(attempt_number.get(), 1)
+    logger.info("4. Verify a sink must implement emit.")
+    with pytest.raises(TypeError):
+        EventSink()
@@ -0,0 +1,94 @@
+import json
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.instrumentation import Instrumentation
+from airgap_api.api.token_manager import Credentials, TokenManager
+from airgap_api.loadgen import main, parse_mix, run_load
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.loadgen]
+
+
+def test__loadgen__parse_mix():
+    """
+    Tests parsing a workload mix.
+    Steps:
+
+    1. Parse a valid workload mix.
+    2. Verify an unknown operation and a malformed entry are rejected.
+    """
+    logger.info("1. Parse a valid workload mix.")
+    checks.equal(parse_mix("get_by_id=70,get_page=20,favorites=10"), {"get_by_id": 70.0, "get_page": 20.0, "favorites": 10.0})
+    logger.info("2. Verify an unknown operation and a malformed entry are rejected.")
+    with pytest.raises(ValueError):
+        parse_mix("unknown=10")
+    with pytest.raises(ValueError):
+        parse_mix("get_by_id")
+
+
+def test__loadgen__closed_workload():
+    """
+    Tests a closed workload mix with back-to-back workers against the stand-in server.
+    Steps:
+
+    1. Run the workload mix with four workers for one second.
+    2. Verify every operation in the mix ran without errors.
+    3. Verify per endpoint statistics include the favorites CRUD requests.
+    """
+    with StandInServer(airport_count=100) as server:
+        server.register(email="load@airportgap.test", password="load")
+        token_manager = TokenManager(accounts=[Credentials(email="load@airportgap.test", password="load")])
+        client = AirportGapAPIClient(base_url=server.base_url, instrumentation=Instrumentation(sinks=[]), token_manager=token_manager)
+        token_manager.bind(client)
+        logger.info("1. Run the workload mix with four workers for one second.")
+        results = run_load(client=client, mix={"get_by_id": 70, "get_page": 20, "favorites": 10}, duration=1.0, concurrency=4, seed=1)
+    logger.info("2. Verify every operation in the mix ran without errors.")
+    for name, operation in results["operations"].items():
+        checks.greater(operation["count"], 0, msg=name)
+        checks.equal(operation["error_rate"], 0.0, msg=name)
+        checks.equal(operation["corrected_latency"]["p99"], operation["latency"]["p99"], msg=name)
+    logger.info("3. Verify per endpoint statistics include the favorites CRUD requests.")
+    checks.is_true({"GET airports/{id}", "GET airports", "POST favorites", "PATCH favorites/{id}", "GET favorites/{id}", "DELETE favorites/{id}"} <= set(results["endpoints"]))
+    checks.equal(results["endpoints"]["POST favorites"]["count"], results["endpoints"]["DELETE favorites/{id}"]["count"])
+
+
+def test__loadgen__open_workload_corrects_coordinated_omission():
+    """
+    Tests a fixed arrival rate workload that the server cannot keep up with.
+    Steps:
+
+    1. Run the workload at a rate above what two workers can serve, with every third request rate limited.
+    2. Verify the corrected latency includes the time operations waited to start.
+    3. Verify the rate limited responses are reported per endpoint.
+    """
+    with StandInServer(airport_count=100, latency=0.05, rate_limit_every=3) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, instrumentation=Instrumentation(sinks=[]))
+        logger.info("1. Run the workload at a rate above what two workers can serve, with every third request rate limited.")
+        results = run_load(client=client, mix={"get_by_id": 1}, duration=0.5, rps=100, concurrency=2, seed=1)
+    operation = results["operations"]["get_by_id"]
+    logger.info("2. Verify the corrected latency includes the time operations waited to start.")
+    checks.equal(operation["count"], 50)
+    checks.greater(operation["corrected_latency"]["p99"], operation["latency"]["p99"] * 2)
+    logger.info("3. Verify the rate limited responses are reported per endpoint.")
+    endpoint = results["endpoints"]["GET airports/{id}"]
+    checks.greater(endpoint["rate_limited_rate"], 0.2)
+    checks.equal(operation["error_rate"], 0.0)
+
+
+def test__loadgen__cli(tmp_path):
+    """
+    Tests the load generation command line against a local stand-in server.
+    Steps:
+
+    1. Run the command line with the stand-in server and an output file.
+    2. Verify the results were written as JSON.
+    """
+    output = tmp_path / "load.json"
+    logger.info("1. Run the command line with the stand-in server and an output file.")
+    checks.equal(main(["--stand-in", "--duration", "0.5", "--concurrency", "2", "--mix", "get_by_id=50,favorites=50", "--output", str(output)]), 0)
+    logger.info("2. Verify the results were written as JSON.")
+    results = json.loads(output.read_text())
+    checks.equal(set(results["operations"]), {"get_by_id", "favorites"})
+    checks.equal(results["config"]["concurrency"], 2)
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+import pytest
+from loguru import logger
+import pytest_check as checks
+from tenacity import RetryCallState
+from airgap_api.api.api_client import RateLimitReachedError, wait_rate_limit
+from airgap_api.api.rate_limiter import RateLimiter
+
+pytestmark = [pytest.mark.rate_limit]
+
+
+def test__rate_limiter__shared_budget(tmp_path):
+    """
+    Tests two rate limiters sharing one budget through a state file.
+    Steps:
+
+    1. Create two rate limiters using the same state file.
+    2. Take the whole burst from the first rate limiter.
+    3. Verify the second rate limiter has to wait for a token.
+    """
+    logger.info("1. Create two rate limiters using the same state file.")
+    first = RateLimiter(rate=10, capacity=2, state_path=tmp_path / "rate_limit.state")
+    second = RateLimiter(rate=10, capacity=2, state_path=tmp_path / "rate_limit.state")
+    logger.info("2. Take the whole burst from the first rate limiter.")
+    checks.equal(first.acquire(), 0.0)
+    checks.equal(first.acquire(), 0.0)
+    logger.info("3. Verify the second rate limiter has to wait for a token.")
+    checks.greater(second.try_acquire(), 0.0)
+
+
+def test__rate_limiter__honours_server_headers():
+    """
+    Tests the rate limiter pacing requests from rate limit response headers.
+    Steps:
+
+    1. Observe a response stating no requests remain until reset.
+    2. Verify the rate limiter waits until the reset.
+    3. Observe a Retry-After header.
+    4. Verify the rate limiter waits for the Retry-After period.
+    """
+    rate_limiter = RateLimiter(rate=100, capacity=100)
+    logger.info("1. Observe a response stating no requests remain until reset.")
+    rate_limiter.observe(headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "0.2"})
+    logger.info("2. Verify the rate limiter waits until the reset.")
+    started = time.monotonic()
+    rate_limiter.acquire()
+    checks.greater_equal(time.monotonic() - started, 0.15)
+    logger.info("3. Observe a Retry-After header.")
+    rate_limiter.observe(headers={"Retry-After": "0.2"})
+    logger.info("4. Verify the rate limiter waits for the Retry-After period.")
+    checks.almost_equal(rate_limiter.try_acquire(), 0.2, abs=0.05)
+
+
+def test__rate_limiter__retry_waits_for_retry_after():
+    """
+    Tests the retry wait uses the server Retry-After period instead of the exponential backoff.
+    Steps:
+
+    1. Calculate the retry wait for a rate limit error with a Retry-After period.
+    2. Calculate the retry wait for a rate limit error without a Retry-After period.
+    """
+    retry_state = RetryCallState(retry_object=None, fn=None, args=(), kwargs={})
+    logger.info("1. Calculate the retry wait for a rate limit error with a Retry-After period.")
+    retry_state.set_exception((RateLimitReachedError, RateLimitReachedError(retry_after=1.5), None))
+    checks.equal(wait_rate_limit(retry_state), 1.5)
+    logger.info("2. Calculate the retry wait for a rate limit error without a Retry-After period.")
+    retry_state.set_exception((RateLimitReachedError, RateLimitReachedError(), None))
+    checks.equal(wait_rate_limit(retry_state), 5)
+
+
+def test__rate_limiter__async_shared_state_off_event_loop(tmp_path):
+    """
+    Tests the async path of a file-backed limiter touching its state file off the event loop.
+    Steps:
+
+    1. Acquire tokens and observe a response through the async API of a limiter with a state file.
+    2. Verify every state file update ran on a thread other than the event loop's.
+    3. Verify the tokens were taken from the shared state.
+    """
+    threads = []
+
+    class RecordingRateLimiter(RateLimiter):
+        def _update(self, update):
+            threads.append(threading.get_ident())
+            return super()._update(update)
+
+    limiter = RecordingRateLimiter(rate=1, capacity=2, state_path=tmp_path / "rate_limit.state")
+
+    async def acquire():
+        await limiter.acquire_async()
+        await limiter.acquire_async()
+        await limiter.observe_async(headers={"RateLimit-Remaining": "0"})
+        return threading.get_ident()
+
+    logger.info("1. Acquire tokens and observe a response through the async API of a limiter with a state file.")
+    loop_thread = asyncio.run(acquire())
+    logger.info("2. Verify every state file update ran on a thread other than the event loop's.")
+    checks.equal(len(threads), 3)
+    checks.is_not_in(loop_thread, threads)
+    logger.info("3. Verify the tokens were taken from the shared state.")
+    checks.greater(RateLimiter(rate=1, capacity=2, state_path=tmp_path / "rate_limit.state").try_acquire(), 0)
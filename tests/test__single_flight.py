@@ -0,0 +1,164 @@
+import asyncio
+import http
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient, AsyncAirportGapAPIClient
+from airgap_api.api.single_flight import SingleFlight
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.single_flight]
+
+
+def test__single_flight__threads():
+    """
+    Tests concurrent identical GET calls from threads sharing one request.
+    Steps:
+
+    1. Perform concurrent calls to airports GET by ID API endpoint for the same airport.
+    2. Verify every call received the airport.
+    3. Verify only one request reached the server.
+    4. Perform concurrent calls to favorites API endpoint with different tokens.
+    5. Verify calls with different tokens were not shared.
+    """
+    single_flight = SingleFlight()
+    with StandInServer(airport_count=10, latency=0.2) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, single_flight=single_flight)
+        logger.info("1. Perform concurrent calls to airports GET by ID API endpoint for the same airport.")
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(lambda _: client.airports.get_by_id(airport_id=Airports.MAG.id), range(5)))
+        logger.info("2. Verify every call received the airport.")
+        assert all(response.status_code == http.HTTPStatus.OK for response in responses)
+        checks.equal(len({id(response) for response in responses}), 5)
+        logger.info("3. Verify only one request reached the server.")
+        checks.equal(server.request_count, 1)
+        checks.equal(single_flight.coalesced, 4)
+
+        logger.info("4. Perform concurrent calls to favorites API endpoint with different tokens.")
+        tokens = [server.register(email=f"{name}@airportgap.test", password=name) for name in ("first", "second")]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            responses = list(executor.map(lambda token: client.favorites.get(token=token), tokens))
+        logger.info("5. Verify calls with different tokens were not shared.")
+        assert all(response.status_code == http.HTTPStatus.OK for response in responses)
+        checks.equal(server.request_count, 3)
+        checks.equal(single_flight.coalesced, 4)
+
+
+def test__single_flight__async():
+    """
+    Tests concurrent identical GET calls from asyncio tasks sharing one request.
+    Steps:
+
+    1. Perform concurrent calls to airports GET API endpoint for the same and for different pages.
+    2. Verify every call received its page.
+    3. Verify only one request per page reached the server.
+    """
+    single_flight = SingleFlight()
+
+    async def get_pages(base_url):
+        async with AsyncAirportGapAPIClient(base_url=base_url, single_flight=single_flight) as client:
+            return await asyncio.gather(*(client.airports.get(page=page) for page in (1, 1, 1, 2, 2)))
+
+    with StandInServer(airport_count=100, latency=0.2) as server:
+        logger.info("1. Perform concurrent calls to airports GET API endpoint for the same and for different pages.")
+        responses = asyncio.run(get_pages(server.base_url))
+        logger.info("2. Verify every call received its page.")
+        checks.equal([response.json()["data"][0]["id"] for response in responses], [responses[0].json()["data"][0]["id"]] * 3 + [responses[3].json()["data"][0]["id"]] * 2)
+        logger.info("3. Verify only one request per page reached the server.")
+        checks.equal(server.request_count, 2)
+        checks.equal(single_flight.coalesced, 3)
+
+
+def test__single_flight__async_leader_cancelled():
+    """
+    Tests a cancelled first caller not cancelling the shared call of the others.
+    Steps:
+
+    1. Start three identical calls and cancel the first one.
+    2. Verify the other calls received the shared result.
+    3. Start a call and cancel it while it is the only caller.
+    4. Verify the shared call was cancelled.
+    """
+    single_flight = SingleFlight()
+    key = SingleFlight.key(method="GET", url="airports")
+    calls = []
+
+    async def call():
+        calls.append(asyncio.current_task())
+        await asyncio.sleep(0.1)
+        return "response"
+
+    async def cancel_leader():
+        tasks = [asyncio.ensure_future(single_flight.do_async(key, call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def cancel_only_caller():
+        task = asyncio.ensure_future(single_flight.do_async(key, call))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        return calls[-1]
+
+    logger.info("1. Start three identical calls and cancel the first one.")
+    results = asyncio.run(cancel_leader())
+    logger.info("2. Verify the other calls received the shared result.")
+    checks.is_instance(results[0], asyncio.CancelledError)
+    checks.equal(results[1:], ["response", "response"])
+    checks.equal(len(calls), 1)
+    logger.info("3. Start a call and cancel it while it is the only caller.")
+    shared_call = asyncio.run(cancel_only_caller())
+    logger.info("4. Verify the shared call was cancelled.")
+    checks.is_true(shared_call.cancelled())
+
+
+def test__single_flight__conditional_requests_not_shared():
+    """
+    Tests conditional requests being keyed apart from unconditional ones.
+    Steps:
+
+    1. Build keys for the same page with and without If-None-Match.
+    2. Verify the keys differ.
+    3. Verify headers that do not change the response are ignored.
+    """
+    logger.info("1. Build keys for the same page with and without If-None-Match.")
+    plain = SingleFlight.key(method="GET", url="airports", params={"page": 2})
+    conditional = SingleFlight.key(method="GET", url="airports", params={"page": 2}, headers={"If-None-Match": 'W/"etag"'})
+    logger.info("2. Verify the keys differ.")
+    checks.not_equal(plain, conditional)
+    logger.info("3. Verify headers that do not change the response are ignored.")
+    checks.equal(SingleFlight.key(method="GET", url="airports", params={"page": 2}, headers={"User-Agent": "tests"}), plain)
+
+
+def test__single_flight__own_headers():
+    """
+    Tests every caller sharing a call receiving headers of its own.
+    Steps:
+
+    1. Perform concurrent identical calls to airports GET API endpoint from threads and from asyncio tasks.
+    2. Change the headers of one response of each.
+    3. Verify the headers of the other responses are unchanged.
+    """
+    single_flight = SingleFlight()
+
+    async def get_pages(base_url):
+        async with AsyncAirportGapAPIClient(base_url=base_url, single_flight=single_flight) as client:
+            return await asyncio.gather(*(client.airports.get(page=1) for _ in range(3)))
+
+    with StandInServer(airport_count=10, latency=0.2) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, single_flight=single_flight)
+        logger.info("1. Perform concurrent identical calls to airports GET API endpoint from threads and from asyncio tasks.")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            responses = list(executor.map(lambda _: client.airports.get(page=1), range(3)))
+        async_responses = asyncio.run(get_pages(server.base_url))
+    checks.equal(single_flight.coalesced, 4)
+    logger.info("2. Change the headers of one response of each.")
+    for shared in (responses, async_responses):
+        shared[1].headers["X-Changed"] = "yes"
+    logger.info("3. Verify the headers of the other responses are unchanged.")
+    for shared in (responses, async_responses):
+        checks.equal(["x-changed" in response.headers for response in shared], [False, True, False])
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.data import Airports
+from airgap_api.data.spatial import AirportSpatialIndex
+from airgap_api.stand_in.data import generate_airports
+
+pytestmark = [pytest.mark.catalog]
+
+
+@pytest.fixture()
+def spatial_index():
+    yield AirportSpatialIndex.from_models(airports=[Airports.MAG, Airports.CYG])
+
+
+def test__spatial__nearest(spatial_index):
+    """
+    Tests the spatial index k-nearest query.
+    Steps:
+
+    1. Query the nearest airports to a point close to Madang.
+    2. Verify airports are returned in order of distance.
+    3. Verify matches can be returned as airport models.
+    """
+    logger.info("1. Query the nearest airports to a point close to Madang.")
+    matches = spatial_index.nearest(latitude=-5.0, longitude=145.5, k=2)
+    logger.info("2. Verify airports are returned in order of distance.")
+    checks.equal(matches.airport_ids, [Airports.MAG.id, Airports.CYG.id])
+    checks.less(matches.kilometers[0], matches.kilometers[1])
+    logger.info("3. Verify matches can be returned as airport models.")
+    checks.equal(spatial_index.to_models(matches), [Airports.MAG, Airports.CYG])
+
+
+def test__spatial__within_radius(spatial_index):
+    """
+    Tests the spatial index radius query for one and many points.
+    Steps:
+
+    1. Query airports within a radius that only covers Madang.
+    2. Query airports within a radius that covers both airports.
+    3. Verify bulk radius queries match single queries.
+    """
+    logger.info("1. Query airports within a radius that only covers Madang.")
+    checks.equal(spatial_index.within(latitude=-5.0, longitude=145.5, radius_km=100).airport_ids, [Airports.MAG.id])
+    logger.info("2. Query airports within a radius that covers both airports.")
+    checks.equal(spatial_index.within(latitude=-5.20708, longitude=145.789001, radius_km=3500).airport_ids, [Airports.MAG.id, Airports.CYG.id])
+    logger.info("3. Verify bulk radius queries match single queries.")
+    bulk = spatial_index.within_many(latitudes=[-5.0, -36.0], longitudes=[145.5, 148.0], radius_km=100)
+    checks.equal([matches.airport_ids for matches in bulk], [[Airports.MAG.id], [Airports.CYG.id]])
+
+
+def test__spatial__many_matches_single():
+    """
+    Tests the bulk spatial queries against single queries over a generated set of airports.
+    Steps:
+
+    1. Build a spatial index over generated airports and pick random points, including both poles.
+    2. Verify bulk radius queries match single queries.
+    3. Verify bulk k-nearest queries match single queries.
+    """
+    logger.info("1. Build a spatial index over generated airports and pick random points, including both poles.")
+    airports = generate_airports(count=500)
+    spatial_index = AirportSpatialIndex(
+        airport_ids=[airport["id"] for airport in airports],
+        latitude=[float(airport["attributes"]["latitude"]) for airport in airports],
+        longitude=[float(airport["attributes"]["longitude"]) for airport in airports],
+    )
+    rng = np.random.default_rng(0)
+    latitudes, longitudes = np.append(rng.uniform(-90, 90, 600), [90.0, -90.0]), np.append(rng.uniform(-180, 180, 600), [0.0, 0.0])
+    logger.info("2. Verify bulk radius queries match single queries.")
+    for radius_km in (10, 1000, 25000):
+        bulk = spatial_index.within_many(latitudes=latitudes, longitudes=longitudes, radius_km=radius_km)
+        single = [spatial_index.within(latitude=latitude, longitude=longitude, radius_km=radius_km) for latitude, longitude in zip(latitudes, longitudes)]
+        checks.equal([matches.airport_ids for matches in bulk], [matches.airport_ids for matches in single], msg=f"Radius {radius_km} km")
+    logger.info("3. Verify bulk k-nearest queries match single queries.")
+    for k in (1, 10, 600):
+        bulk = spatial_index.nearest_many(latitudes=latitudes, longitudes=longitudes, k=k)
+        single = [spatial_index.nearest(latitude=latitude, longitude=longitude, k=k) for latitude, longitude in zip(latitudes, longitudes)]
+        checks.equal([matches.airport_ids for matches in bulk], [matches.airport_ids for matches in single], msg=f"Nearest {k}")
+        checks.is_true(all(np.allclose(bulk_matches.kilometers, single_matches.kilometers) for bulk_matches, single_matches in zip(bulk, single)))
@@ -0,0 +1,74 @@
+import http
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.data import AirportDistanceResultModel, Airports, FavoriteModel
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.stand_in]
+
+
+def test__stand_in__rate_limit_injection():
+    """
+    Tests the stand-in server injecting rate limit responses and the client retrying them.
+    Steps:
+
+    1. Start a stand-in server rate limiting every second request.
+    2. Perform calls to airports GET by ID API endpoint.
+    3. Verify every call eventually succeeds.
+    4. Verify rate limited requests were retried.
+    """
+    logger.info("1. Start a stand-in server rate limiting every second request.")
+    with StandInServer(rate_limit_every=2, retry_after=0) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        logger.info("2. Perform calls to airports GET by ID API endpoint.")
+        responses = [client.airports.get_by_id(airport_id=Airports.MAG.id) for _ in range(3)]
+        logger.info("3. Verify every call eventually succeeds.")
+        assert all(response.status_code == http.HTTPStatus.OK for response in responses)
+        logger.info("4. Verify rate limited requests were retried.")
+        checks.equal(server.request_count, 5)
+
+
+def test__stand_in__favorites_isolated_per_token():
+    """
+    Tests the stand-in server keeping favorites state per token.
+    Steps:
+
+    1. Register two accounts with the stand-in server.
+    2. Add a favorite using the first account.
+    3. Verify the favorite is only visible to the first account.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        logger.info("1. Register two accounts with the stand-in server.")
+        first_token = server.register(email="first@airportgap.test", password="first")
+        second_token = server.register(email="second@airportgap.test", password="second")
+        logger.info("2. Add a favorite using the first account.")
+        response = client.favorites.add(airport_id=Airports.MAG.id, note="Home", token=first_token)
+        assert response.status_code == http.HTTPStatus.CREATED
+        favorite = FavoriteModel(**response.json()["data"])
+        logger.info("3. Verify the favorite is only visible to the first account.")
+        checks.equal(client.favorites.get_by_id(fav_id=favorite.id, token=first_token).status_code, http.HTTPStatus.OK)
+        checks.equal(client.favorites.get_by_id(fav_id=favorite.id, token=second_token).status_code, http.HTTPStatus.NOT_FOUND)
+        checks.equal(client.favorites.get(token=second_token).json()["data"], [])
+
+
+def test__stand_in__distance_reference_values():
+    """
+    Tests the stand-in server serving the recorded airports distance endpoint values for the fixture airports.
+    Steps:
+
+    1. Perform call to airports distance API endpoint for the fixture airports.
+    2. Verify distances match the values recorded from the live endpoint.
+    """
+    with StandInServer(airport_count=10) as server:
+        client = AirportGapAPIClient(base_url=server.base_url)
+        logger.info("1. Perform call to airports distance API endpoint for the fixture airports.")
+        response = client.airports.distance(from_id=Airports.CYG.id, to_id=Airports.MAG.id)
+        assert response.status_code == http.HTTPStatus.OK
+        distance_data = AirportDistanceResultModel(**response.json()["data"])
+        logger.info("2. Verify distances match the values recorded from the live endpoint.")
+        checks.equal(distance_data.attributes.kilometers, 3451.0132605573453)
+        checks.equal(distance_data.attributes.miles, 2142.86743976846)
+        checks.equal(distance_data.attributes.nautical_miles, 1862.1000015367488)
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import pytest
+from loguru import logger
+import pytest_check as checks
+import airgap_api.data
+
+pytestmark = [pytest.mark.startup]
+
+# Budgets for the cumulative import time of each module.
+DATA_IMPORT_BUDGET_SECONDS = 0.05
+# CPU time of the import alone, so xdist workers sharing a core do not push the client over it; about 1.5x the measured cost.
+CLIENT_IMPORT_BUDGET_SECONDS = 0.3
+
+
+def import_time(*, module: str, check: str = "") -> float:
+    script = f"import sys; import {module}; {check}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], env=os.environ, capture_output=True, text=True, check=True)
+    line = next(line for line in result.stderr.splitlines() if line.rstrip().endswith(f"| {module}"))
+    return int(line.split("|")[1]) / 1e6
+
+
+def import_cpu_time(*, module: str, check: str = "") -> float:
+    script = f"import sys, time; started = time.process_time(); import {module}; print(time.process_time() - started); {check}"
+    result = subprocess.run([sys.executable, "-c", script], env=os.environ, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1])
+
+
+def test__startup__data_package():
+    """
+    Tests that importing the data package defers its models, adapters and fixtures.
+    Steps:
+
+    1. Import the data package in a fresh interpreter.
+    2. Verify pydantic was not imported.
+    3. Verify the import stays within budget.
+    4. Verify the package attributes are loaded on access.
+    """
+    logger.info("1. Import the data package in a fresh interpreter.")
+    logger.info("2. Verify pydantic was not imported.")
+    elapsed = min(import_time(module="airgap_api.data", check="assert 'pydantic' not in sys.modules") for _ in range(3))
+    logger.debug(f"Import time airgap_api.data={elapsed:.6f}s")
+    logger.info("3. Verify the import stays within budget.")
+    checks.less(elapsed, DATA_IMPORT_BUDGET_SECONDS)
+    logger.info("4. Verify the package attributes are loaded on access.")
+    checks.equal(airgap_api.data.Airports.MAG.id, "MAG")
+    checks.is_in("Codes", dir(airgap_api.data))
+    with pytest.raises(AttributeError):
+        airgap_api.data.Unknown
+
+
+def test__startup__api_client():
+    """
+    Tests that importing the API client defers the dependencies only some calls need.
+    Steps:
+
+    1. Import the API client in a fresh interpreter.
+    2. Verify numpy, httpx, pydantic and the data models were not loaded.
+    3. Verify the import stays within budget.
+    """
+    logger.info("1. Import the API client in a fresh interpreter.")
+    logger.info("2. Verify numpy, httpx, pydantic and the data models were not loaded.")
+    check = "assert not {'numpy', 'httpx', 'pydantic', 'airgap_api.data.models'} & set(sys.modules)"
+    elapsed = min(import_cpu_time(module="airgap_api.api.airportgap_api_client", check=check) for _ in range(3))
+    logger.debug(f"Import time airgap_api.api.airportgap_api_client={elapsed:.6f}s")
+    logger.info("3. Verify the import stays within budget.")
+    checks.less(elapsed, CLIENT_IMPORT_BUDGET_SECONDS)
@@ -0,0 +1,226 @@
+import asyncio
+import http
+import json
+import stat
+import threading
+import pytest
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient, AsyncAirportGapAPIClient
+from airgap_api.api.instrumentation import EventSink
+from airgap_api.api.token_manager import Credentials, TokenManager
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.tokens]
+
+FIRST = Credentials(email="first@airportgap.test", password="first-password")
+SECOND = Credentials(email="second@airportgap.test", password="second-password")
+
+
+def test__token_manager__shared_disk_cache(tmp_path):
+    """
+    Tests two token managers, as used by two pytest-xdist workers, sharing one on-disk token cache.
+    Steps:
+
+    1. Get a token through the first token manager.
+    2. Get a token through the second token manager using the same cache file.
+    3. Verify the account was only authenticated once.
+    4. Verify the cache file is only accessible by its owner and does not contain the password.
+    """
+    cache_path = tmp_path / "tokens.json"
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password}) as server:
+        logger.info("1. Get a token through the first token manager.")
+        first = TokenManager(accounts=[FIRST], cache_path=cache_path)
+        first_token = first.bind(AirportGapAPIClient(base_url=server.base_url)).token()
+        logger.info("2. Get a token through the second token manager using the same cache file.")
+        second = TokenManager(accounts=[FIRST], cache_path=cache_path)
+        second_token = second.bind(AirportGapAPIClient(base_url=server.base_url)).token()
+    logger.info("3. Verify the account was only authenticated once.")
+    checks.equal(first_token, second_token)
+    checks.equal(first.authentications + second.authentications, 1)
+    logger.info("4. Verify the cache file is only accessible by its owner and does not contain the password.")
+    checks.equal(stat.S_IMODE(cache_path.stat().st_mode), 0o600)
+    checks.is_not_in(FIRST.password, cache_path.read_text())
+
+
+def test__token_manager__reauthenticates_on_unauthorised(tmp_path):
+    """
+    Tests the token manager replacing a rejected token.
+    Steps:
+
+    1. Seed the token cache with a token the server rejects.
+    2. Perform call to favorites API endpoint without passing a token.
+    3. Verify the call succeeds after re-authenticating once.
+    4. Verify the cache holds the new token.
+    """
+    cache_path = tmp_path / "tokens.json"
+    logger.info("1. Seed the token cache with a token the server rejects.")
+    cache_path.write_text(json.dumps({FIRST.key: "expired"}))
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password}) as server:
+        manager = TokenManager(accounts=[FIRST], cache_path=cache_path)
+        client = AirportGapAPIClient(base_url=server.base_url, token_manager=manager)
+        manager.bind(client)
+        logger.info("2. Perform call to favorites API endpoint without passing a token.")
+        response = client.favorites.get()
+    logger.info("3. Verify the call succeeds after re-authenticating once.")
+    assert response.status_code == http.HTTPStatus.OK
+    checks.equal(manager.authentications, 1)
+    logger.info("4. Verify the cache holds the new token.")
+    checks.equal(json.loads(cache_path.read_text())[FIRST.key], StandInServer.token_for(email=FIRST.email, password=FIRST.password))
+
+
+def test__token_manager__get_all_reauthenticates(tmp_path):
+    """
+    Tests every favorites page being fetched after a rejected token is replaced.
+    Steps:
+
+    1. Add a favorite and seed the token cache with a token the server rejects.
+    2. Get all favorites pages without passing a token.
+    3. Verify the favorite is returned after re-authenticating once.
+    4. Get all favorites pages again, sequentially and concurrently.
+    5. Verify each crawl requested its single page once.
+    """
+    cache_path = tmp_path / "tokens.json"
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password}) as server:
+        logger.info("1. Add a favorite and seed the token cache with a token the server rejects.")
+        client = AirportGapAPIClient(base_url=server.base_url)
+        client.favorites.add(airport_id="MAG", token=StandInServer.token_for(email=FIRST.email, password=FIRST.password))
+        cache_path.write_text(json.dumps({FIRST.key: "expired"}))
+        manager = TokenManager(accounts=[FIRST], cache_path=cache_path)
+        client = AirportGapAPIClient(base_url=server.base_url, token_manager=manager)
+        manager.bind(client)
+        logger.info("2. Get all favorites pages without passing a token.")
+        favorites = [favorite for page_data in client.favorites.get_all() for favorite in page_data]
+        logger.info("3. Verify the favorite is returned after re-authenticating once.")
+        checks.equal([favorite["attributes"]["airport"]["iata"] for favorite in favorites], ["MAG"])
+        checks.equal(manager.authentications, 1)
+        logger.info("4. Get all favorites pages again, sequentially and concurrently.")
+        request_count = server.request_count
+        pages = [list(client.favorites.get_all()), list(client.favorites.get_all(max_workers=4))]
+        logger.info("5. Verify each crawl requested its single page once.")
+        checks.equal(pages[0], pages[1])
+        checks.equal(server.request_count - request_count, 2)
+
+
+class UrlSink(EventSink):
+    def __init__(self) -> None:
+        super().__init__()
+        self.urls = []
+
+    def emit(self, event) -> None:
+        self.urls.append(str(event.response.url))
+
+
+def test__token_manager__get_all_passes_params(tmp_path):
+    """
+    Tests the token-checked first favorites page being fetched with the caller's params.
+    Steps:
+
+    1. Seed the token cache with a token the server rejects.
+    2. Get all favorites pages with params through the sync and the async client.
+    3. Verify every favorites request, including both tries of page 1, carried the params.
+    """
+    cache_path = tmp_path / "tokens.json"
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password}) as server:
+        sinks = []
+        logger.info("1. Seed the token cache with a token the server rejects.")
+        cache_path.write_text(json.dumps({FIRST.key: "expired"}))
+        manager = TokenManager(accounts=[FIRST], cache_path=cache_path)
+        client = AirportGapAPIClient(base_url=server.base_url, token_manager=manager)
+        manager.bind(client)
+        sinks.append(UrlSink())
+        client.instrumentation.add_sink(sinks[-1])
+        logger.info("2. Get all favorites pages with params through the sync and the async client.")
+        list(client.favorites.get_all(params={"sort": "id"}))
+        cache_path.write_text(json.dumps({FIRST.key: "expired"}))
+        manager = TokenManager(accounts=[FIRST], cache_path=cache_path)
+
+        async def get_all_async():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, token_manager=manager) as client:
+                manager.bind(client)
+                sinks.append(UrlSink())
+                client.instrumentation.add_sink(sinks[-1])
+                return [page_data async for page_data in client.favorites.get_all(params={"sort": "id"})]
+
+        asyncio.run(get_all_async())
+    logger.info("3. Verify every favorites request, including both tries of page 1, carried the params.")
+    for sink in sinks:
+        favorites_urls = [url for url in sink.urls if "/favorites" in url]
+        checks.equal(len(favorites_urls), 2)
+        checks.is_true(all("sort=id" in url for url in favorites_urls), favorites_urls)
+
+
+def test__token_manager__async_client(tmp_path):
+    """
+    Tests the token manager authenticating through an async client.
+    Steps:
+
+    1. Seed the token cache with a token the server rejects.
+    2. Perform calls to favorites API endpoints through the async client without passing a token.
+    3. Verify the calls succeed after re-authenticating once.
+    """
+    cache_path = tmp_path / "tokens.json"
+    logger.info("1. Seed the token cache with a token the server rejects.")
+    cache_path.write_text(json.dumps({FIRST.key: "expired"}))
+    manager = TokenManager(accounts=[FIRST], cache_path=cache_path)
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password}) as server:
+
+        async def get_favorites():
+            async with AsyncAirportGapAPIClient(base_url=server.base_url, token_manager=manager) as client:
+                manager.bind(client)
+                response = await client.favorites.get()
+                pages = [page_data async for page_data in client.favorites.get_all()]
+                return response, pages
+
+        logger.info("2. Perform calls to favorites API endpoints through the async client without passing a token.")
+        response, pages = asyncio.run(get_favorites())
+    logger.info("3. Verify the calls succeed after re-authenticating once.")
+    checks.equal(response.status_code, http.HTTPStatus.OK)
+    checks.equal(pages, [[]])
+    checks.equal(manager.authentications, 1)
+    checks.equal(json.loads(cache_path.read_text())[FIRST.key], StandInServer.token_for(email=FIRST.email, password=FIRST.password))
+
+
+def test__token_manager__account_pool(tmp_path):
+    """
+    Tests handing out tokens from a pool of accounts round-robin and by exclusive lease.
+    Steps:
+
+    1. Get tokens round-robin from a pool of two accounts.
+    2. Verify the tokens alternate between the accounts.
+    3. Lease both accounts.
+    4. Verify the leases hold different accounts.
+    5. Verify a third lease waits until an account is released.
+    6. Verify a lease of an account by index holds that account.
+    """
+    with StandInServer(airport_count=10, accounts={FIRST.email: FIRST.password, SECOND.email: SECOND.password}) as server:
+        manager = TokenManager(accounts=[FIRST, SECOND], cache_path=tmp_path / "tokens.json")
+        manager.bind(AirportGapAPIClient(base_url=server.base_url))
+        logger.info("1. Get tokens round-robin from a pool of two accounts.")
+        tokens = [manager.token() for _ in range(4)]
+        logger.info("2. Verify the tokens alternate between the accounts.")
+        checks.equal(tokens[0], tokens[2])
+        checks.equal(tokens[1], tokens[3])
+        checks.not_equal(tokens[0], tokens[1])
+
+        logger.info("3. Lease both accounts.")
+        leased = []
+        with manager.lease() as first_lease, manager.lease() as second_lease:
+            logger.info("4. Verify the leases hold different accounts.")
+            checks.not_equal(first_lease.credentials, second_lease.credentials)
+            checks.equal(first_lease.headers, TokenManager.auth_headers(token=first_lease.token))
+            logger.info("5. Verify a third lease waits until an account is released.")
+
+            def lease_third():
+                with manager.lease(poll_interval=0.01) as third_lease:
+                    leased.append(third_lease.credentials)
+
+            thread = threading.Thread(target=lease_third)
+            thread.start()
+            thread.join(timeout=0.2)
+            checks.equal(leased, [])
+        thread.join(timeout=5)
+        checks.equal(len(leased), 1)
+        logger.info("6. Verify a lease of an account by index holds that account.")
+        with manager.lease(account=1) as second_lease, manager.lease(account=2) as first_lease:
+            checks.equal((first_lease.credentials, second_lease.credentials), (FIRST, SECOND))
@@ -0,0 +1,81 @@
+import threading
+import pytest
+import requests
+from loguru import logger
+import pytest_check as checks
+from airgap_api.api.airportgap_api_client import AirportGapAPIClient
+from airgap_api.api.transport import TransportConfig
+from airgap_api.data import Airports
+from airgap_api.stand_in import StandInServer
+
+pytestmark = [pytest.mark.transport]
+
+
+def test__transport__connection_reuse():
+    """
+    Tests connections being reused across requests and opened per request when keep-alive is disabled.
+    Steps:
+
+    1. Perform several calls with the default transport.
+    2. Verify a single connection was created and then reused.
+    3. Perform several calls with keep-alive disabled.
+    4. Verify a connection was created for every call.
+    """
+    with StandInServer(airport_count=10) as server:
+        logger.info("1. Perform several calls with the default transport.")
+        client = AirportGapAPIClient(base_url=server.base_url)
+        for _ in range(5):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("2. Verify a single connection was created and then reused.")
+        checks.equal(client.transport_stats.requests, 5)
+        checks.equal(client.transport_stats.connections_created, 1)
+        checks.equal(client.transport_stats.connections_reused, 4)
+        checks.equal(client.transport_stats.tls_handshakes, 0)
+
+        logger.info("3. Perform several calls with keep-alive disabled.")
+        client = AirportGapAPIClient(base_url=server.base_url, transport=TransportConfig(keep_alive=False))
+        for _ in range(5):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)
+        logger.info("4. Verify a connection was created for every call.")
+        checks.equal(client.transport_stats.connections_created, 5)
+        checks.equal(client.transport_stats.connections_reused, 0)
+
+
+def test__transport__blocking_pool_wait():
+    """
+    Tests concurrent calls waiting for a connection from a blocking pool of one connection.
+    Steps:
+
+    1. Perform concurrent calls with a blocking pool of one connection.
+    2. Verify only one connection was created.
+    3. Verify time was spent waiting for the pool.
+    """
+    with StandInServer(airport_count=10, latency=0.05) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, transport=TransportConfig(pool_maxsize=1, pool_block=True))
+        logger.info("1. Perform concurrent calls with a blocking pool of one connection.")
+        threads = [threading.Thread(target=client.airports.get_by_id, kwargs={"airport_id": Airports.MAG.id}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.info("2. Verify only one connection was created.")
+        checks.equal(client.transport_stats.requests, 4)
+        checks.equal(client.transport_stats.connections_created, 1)
+        logger.info("3. Verify time was spent waiting for the pool.")
+        checks.greater(client.transport_stats.pool_wait_time, 0.05)
+
+
+def test__transport__read_timeout():
+    """
+    Tests the configured read timeout being applied to every request.
+    Steps:
+
+    1. Perform a call to a slow server with a short read timeout.
+    2. Verify the call times out.
+    """
+    with StandInServer(airport_count=10, latency=0.5) as server:
+        client = AirportGapAPIClient(base_url=server.base_url, transport=TransportConfig(read_timeout=0.05))
+        logger.info("1. Perform a call to a slow server with a short read timeout.")
+        logger.info("2. Verify the call times out.")
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.airports.get_by_id(airport_id=Airports.MAG.id)